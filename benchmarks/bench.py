@@ -0,0 +1,316 @@
+#Benchmarks dos caminhos mais usados do jogo, com comparação contra uma linha de base.
+
+# benchmarks/bench.py
+#
+# Uso (da raiz do projeto):
+#   python benchmarks/bench.py                    -> roda tudo e compara com benchmarks/baseline.json
+#   python benchmarks/bench.py --save-baseline    -> grava os resultados atuais como nova linha de base
+#   python benchmarks/bench.py -o resultado.json  -> também grava o relatório completo em JSON
+#   python benchmarks/bench.py find_path level    -> roda só os benchmarks cujo nome contém esses textos
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Sem janela: o driver "dummy" do SDL permite criar a tela e desenhar nela
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+BENCH_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_FOLDER, '..', 'src'))
+
+import pygame
+from settings import *
+from level import Level
+from game import Game
+from tournament import greedy_player
+import replay
+
+BASELINE_FILE = os.path.join(BENCH_FOLDER, 'baseline.json')
+MAP_PATH = os.path.join(MAPS_FOLDER, 'level_1.txt')
+
+
+# =========================================================================================
+# MEDIÇÃO
+# =========================================================================================
+
+def measure(func, number, repeat=7, setup=None):
+    """
+    Chama 'func' 'number' vezes seguidas, 'repeat' vezes, e mede o tempo de cada chamada.
+
+    Parametros:
+        setup (callable): Chamado antes de cada repetição (fora da medição).
+
+    Retorna:
+        dict: Mediana e mínimo do tempo por chamada, em microssegundos.
+    """
+    func()  # Aquecimento: caches e campos de distância já prontos antes de medir
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {'median_us': statistics.median(samples), 'min_us': min(samples), 'number': number, 'repeat': repeat}
+
+
+@contextlib.contextmanager
+def quiet():
+    """ Silencia os prints do jogo (mapa carregado, vidas perdidas...) durante a medição. """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def new_game():
+    """ Jogo com janela (dummy) em andamento, com todos os fantasmas já fora da fila. """
+    game = Game()
+    game.reset_game()
+    game.state = 'jogando'
+    while game.ghost_queue:
+        game.release_enemy()
+    return game
+
+
+def keep_playing(game):
+    """ Recomeça a partida se o benchmark a levou até o game over (ou à vitória). """
+    if game.state != 'jogando':
+        game.reset_game()
+        game.state = 'jogando'
+        while game.ghost_queue:
+            game.release_enemy()
+
+
+# =========================================================================================
+# BENCHMARKS
+# =========================================================================================
+
+def path_queries(game):
+    """ Consultas curta (vizinhos) e longa (par mais distante do mapa). """
+    navigation = game.level.navigation
+    start = navigation.cells[0]
+    short = navigation.cells[navigation.neighbours[0][0][0]]
+    # Par mais distante do mapa
+    far = max(navigation.cells, key=lambda cell: navigation.distance(start, cell) or 0)
+    long_start = max(navigation.cells, key=lambda cell: navigation.distance(far, cell) or 0)
+    return {'short': (start, short), 'long': (long_start, far)}
+
+
+def pocket_level(folder):
+    """
+    O mapa da fase com o primeiro power-up emparedado: uma célula caminhável sem
+    caminho até o resto do mapa (a fase original é toda conectada).
+
+    Parametros:
+        folder (str): Pasta onde o mapa modificado é gravado.
+
+    Retorna:
+        tuple(Level, tuple, tuple): O mapa, a célula isolada e a posição inicial do jogador (x, y).
+    """
+    with open(MAP_PATH) as file:
+        grid = [list(line) for line in file.read().splitlines()]
+    y = next(line for line, row in enumerate(grid) if 'o' in row)
+    x = grid[y].index('o')
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        if grid[y + dy][x + dx] in '. ':
+            grid[y + dy][x + dx] = '#'
+    path = os.path.join(folder, 'pocket.txt')
+    with open(path, 'w') as file:
+        file.write('\n'.join(''.join(row) for row in grid) + '\n')
+    level = Level(path, use_cache=False)
+    player_line, player_column = level.find_symbol('P')[0]
+    return level, (x, y), (player_column, player_line)
+
+
+# Cada grupo devolve {nome: medição}, com as medições ainda por fazer: run() só chama
+# as que foram pedidas na linha de comando.
+
+def bench_find_path(game):
+    results = {}
+    for name, (start, target) in path_queries(game).items():
+        results[f'find_path_{name}'] = (
+            lambda start=start, target=target: measure(lambda: game.find_path(start, target), number=20000))
+
+    def unreachable():
+        # Duas células caminháveis sem caminho entre elas (um alvo em parede nem chegaria à busca)
+        with tempfile.TemporaryDirectory() as folder:
+            level, pocket, target = pocket_level(folder)
+        navigation = level.navigation
+        assert navigation.path(pocket, target) is None
+        return measure(lambda: navigation.path(pocket, target), number=20000)
+    results['find_path_unreachable'] = unreachable
+    return results
+
+
+def bench_level(game):
+    surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+    level = game.level
+
+    def rebuild():
+        level.invalidate_background()
+        level.draw(surface)
+    return {
+        'level_draw': lambda: measure(lambda: level.draw(surface), number=2000),
+        'level_draw_rebuild': lambda: measure(rebuild, number=50),
+        'level_load': lambda: measure(lambda: Level(MAP_PATH), number=5),
+    }
+
+
+# Entradas do jogador em player_update: uma virada a cada ~10 ticks, sempre a mesma sequência
+_inputs = random.Random(0)
+PLAYER_INPUTS = [pygame.Vector2(_inputs.choice(((1, 0), (-1, 0), (0, 1), (0, -1))))
+                 if _inputs.random() < 0.1 else None for _ in range(1000)]
+
+
+def bench_entities(game):
+    tick = 0
+
+    def player_update():
+        nonlocal tick
+        direction = PLAYER_INPUTS[tick % len(PLAYER_INPUTS)]
+        tick += 1
+        if direction is not None:
+            game.player.move(direction)
+        game.player.update()
+        keep_playing(game)
+
+    def enemies_update():
+        for enemy in game.enemies:
+            enemy.update()
+
+    return {
+        'player_update': lambda: measure(player_update, number=5000),
+        'enemy_update': lambda: measure(enemies_update, number=5000, setup=lambda: keep_playing(game)),
+        'check_collisions': lambda: measure(game.check_collisions, number=5000, setup=lambda: keep_playing(game)),
+    }
+
+
+def bench_frame(game):
+    def frame():
+        game.playing_update()
+        game.playing_draw()
+        keep_playing(game)
+    return {'frame': lambda: measure(frame, number=300)}
+
+
+def bench_replay(game):
+    """ Uma partida inteira (o jogador guloso do torneio, até vencer) reproduzida de um replay. """
+    def replay_game():
+        # Gravar a partida é o passo mais caro: só acontece se este benchmark for pedido
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'bench.rpl')
+            Game(headless=True, record_path=path).run_headless(controller=greedy_player(seed=0))
+            recorded = replay.load(path)
+        headless = recorded.new_game()
+        return measure(lambda: recorded.play(headless), number=1, repeat=5)
+    return {'replay_game': replay_game}
+
+
+BENCHMARKS = [bench_find_path, bench_level, bench_entities, bench_frame, bench_replay]
+
+
+def run(filters=()):
+    """
+    Roda os benchmarks cujo nome contém algum dos textos de 'filters' (todos, se vazio)
+    e retorna os resultados por nome. Os outros nem são medidos.
+    """
+    results = {}
+    with quiet():
+        game = new_game()
+        for bench in BENCHMARKS:
+            for name, run_bench in bench(game).items():
+                if not filters or any(f in name for f in filters):
+                    results[name] = run_bench()
+    return results
+
+
+# =========================================================================================
+# RELATÓRIO
+# =========================================================================================
+
+def compare(results, baseline, threshold):
+    """
+    Compara as medianas com a linha de base.
+
+    Retorna:
+        list[str]: Nomes dos benchmarks que ficaram mais lentos que 'threshold' vezes a base.
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            result['ratio'] = None
+            continue
+        result['baseline_us'] = base['median_us']
+        result['ratio'] = result['median_us'] / base['median_us'] if base['median_us'] else None
+        if result['ratio'] is not None and result['ratio'] > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_table(results, regressions):
+    print(f"{'benchmark':<26}{'mediana (us)':>14}{'base (us)':>14}{'razão':>9}")
+    for name, result in results.items():
+        base = result.get('baseline_us')
+        ratio = result.get('ratio')
+        mark = '  <-- REGRESSÃO' if name in regressions else ''
+        print(f"{name:<26}{result['median_us']:>14.2f}"
+              f"{(f'{base:.2f}' if base is not None else '-'):>14}"
+              f"{(f'{ratio:.2f}' if ratio is not None else '-'):>9}{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Pac-Man.")
+    parser.add_argument('filters', nargs='*', help="Roda só os benchmarks cujo nome contém algum desses textos")
+    parser.add_argument('-o', '--output', help="Grava o relatório completo em JSON")
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Grava os resultados como nova linha de base")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Razão (atual / base) a partir da qual o resultado conta como regressão")
+    args = parser.parse_args()
+
+    results = run(args.filters)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+    regressions = compare(results, baseline, args.threshold)
+    print_table(results, regressions)
+
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+        'regressions': regressions,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.save_baseline:
+        # A linha de base guarda só os tempos (a comparação é sempre pela mediana)
+        stored = dict(report, results={name: {'median_us': r['median_us'], 'min_us': r['min_us']}
+                                       for name, r in results.items()})
+        stored.pop('regressions')
+        with open(args.baseline, 'w') as file:
+            json.dump(stored, file, indent=2)
+        print(f"Linha de base salva em {args.baseline}")
+    elif not baseline:
+        print("Sem linha de base para comparar (use --save-baseline).")
+
+    # Código de saída 1 quando há regressão, para uso em scripts de integração
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
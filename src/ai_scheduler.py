@@ -0,0 +1,94 @@
+#Agendador da IA: distribui os replanejamentos dos fantasmas entre os ticks.
+
+# src/ai_scheduler.py
+
+from settings import *
+
+
+class AIScheduler:
+    """
+    Fila de replanejamentos dos fantasmas com um orçamento por tick.
+
+    O custo é medido em nós expandidos pelas buscas de caminho feitas na thread do
+    jogo (NavigationTable.nodes_expanded; as buscas do PathService, em outra thread,
+    não entram), e o orçamento do tick também paga o campo do jogador.
+    Enquanto houver orçamento, o pedido é atendido na hora, como sempre foi; o que
+    não couber fica para os próximos ticks, atendendo primeiro quem está mais perto
+    do jogador e há mais tempo sem replanejar. Assim, vários fantasmas que pedem rota
+    no mesmo tick não fazem todas as buscas juntos.
+
+    O orçamento é em nós, e não em milissegundos, para a simulação continuar
+    determinística (replays e modo headless dão sempre o mesmo resultado).
+    """
+
+    def __init__(self, game, budget=AI_NODE_BUDGET):
+        """
+        Parametros:
+            game (Game): Jogo dono dos fantasmas.
+            budget (int): Nós expandidos permitidos por tick (pelo menos um pedido é
+                atendido por tick, mesmo que sozinho ele passe do orçamento).
+        """
+        self.game = game
+        self.budget = budget
+        self.pending = {}  # Fantasmas esperando replanejamento (dicionário: mantém a ordem dos pedidos)
+        self.used = 0  # Nós gastos no último tick completo (para o profiler e o HUD)
+        self._start = 0  # NavigationTable.nodes_expanded no início do tick
+        self._served = 0  # Pedidos atendidos no tick atual
+        # Contadores (lidos e zerados pelo FrameProfiler a cada quadro)
+        self.counters = {'ai_replans': 0, 'ai_deferred': 0, 'ai_budget_used': 0}
+
+    def spent(self):
+        """ Nós expandidos desde o início do tick atual. """
+        return self.game.level.navigation.nodes_expanded - self._start
+
+    def priority(self, ghost):
+        """ Menor = atendido antes: distância até o jogador, descontado o tempo sem replanejar. """
+        player = self.game.player
+        distance = abs(ghost.grid_x - player.grid_x) + abs(ghost.grid_y - player.grid_y)
+        waited = (self.game.ticks - ghost.last_plan_tick) / FPS
+        return distance - AI_PRIORITY_AGE_WEIGHT * waited
+
+    def begin_tick(self):
+        """ Abre o orçamento do tick (chamado antes do campo do jogador, que também entra na conta). """
+        self._start = self.game.level.navigation.nodes_expanded
+        self._served = 0
+
+    def run(self):
+        """ Atende os pedidos que ficaram de ticks anteriores, por prioridade, até o orçamento acabar. """
+        if not self.pending:
+            return
+        order = sorted(self.pending, key=self.priority)  # Empate: quem pediu primeiro
+        self.pending.clear()
+        for index, ghost in enumerate(order):
+            if self._served and self.spent() >= self.budget:
+                self.pending = dict.fromkeys(order[index:])
+                break
+            self._serve(ghost)
+
+    def end_tick(self):
+        self.used = self.spent()
+        self.counters['ai_budget_used'] += self.used
+
+    def request(self, ghost):
+        """ Pede um replanejamento: feito na hora se couber no orçamento, senão vai para a fila. """
+        if ghost in self.pending:
+            return
+        if not self.pending and (not self._served or self.spent() < self.budget):
+            self._serve(ghost)
+        else:
+            self.pending[ghost] = None
+            self.counters['ai_deferred'] += 1
+
+    def _serve(self, ghost):
+        ghost.recalculate_path()
+        ghost.pathfinding_cooldown = int(ghost.pathfinding_cooldown_duration_sec * FPS)
+        ghost.last_plan_tick = self.game.ticks
+        self._served += 1
+        self.counters['ai_replans'] += 1
+
+    def restore(self):
+        """
+        Refaz a fila depois de um reset ou de um snapshot: quem espera replanejamento
+        é quem está com o cooldown zerado (o cooldown só recomeça quando o pedido é atendido).
+        """
+        self.pending = dict.fromkeys(ghost for ghost in self.game.enemies if ghost.pathfinding_cooldown == 0)
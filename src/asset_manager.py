@@ -0,0 +1,79 @@
+#Gerenciador de imagens: carrega cada arquivo uma vez e compartilha as superfícies.
+
+# src/asset_manager.py
+
+import pygame
+import os
+from settings import *
+
+
+class AssetManager:
+    """
+    Cache central de sprites.
+
+    Cada imagem é lida do disco uma única vez e redimensionada uma única vez
+    para cada tamanho pedido. Todas as entidades recebem a mesma Surface, então
+    criar mais fantasmas (ou reiniciar a partida) não lê nem copia imagens de novo.
+    As imagens são carregadas sob demanda, ou todas de uma vez com preload().
+    """
+
+    def __init__(self):
+        self.images = {}  # (caminho, tamanho) -> Surface já convertida e redimensionada
+        self.folders = {}  # (pasta, extensão) -> lista ordenada de arquivos
+
+    def list_files(self, folder_path, extension=None):
+        """
+        Retorna os caminhos dos arquivos de uma pasta, em ordem alfabética.
+
+        A listagem é feita só na primeira chamada e não precisa de janela aberta.
+        """
+        key = (folder_path, extension)
+        files = self.folders.get(key)
+        if files is None:
+            files = [os.path.join(folder_path, f) for f in sorted(os.listdir(folder_path))
+                     if os.path.isfile(os.path.join(folder_path, f))
+                     and (extension is None or f.endswith(extension))]
+            self.folders[key] = files
+        return files
+
+    def load_image(self, path, size=(GRID_SIZE, GRID_SIZE)):
+        """
+        Retorna a imagem já convertida e redimensionada, carregando-a só na primeira vez.
+
+        Parametros:
+            path (str): Caminho do arquivo de imagem.
+            size (tuple(int, int)): Tamanho final em pixels.
+
+        Retorna:
+            pygame.Surface: Superfície compartilhada (não deve ser alterada).
+        """
+        key = (path, size)
+        image = self.images.get(key)
+        if image is None:
+            image = pygame.transform.scale(pygame.image.load(path).convert_alpha(), size)
+            self.images[key] = image
+        return image
+
+    def load_folder(self, folder_path, size=(GRID_SIZE, GRID_SIZE), extension=None):
+        """
+        Retorna as imagens de uma pasta (ex: quadros de uma animação), em ordem.
+        """
+        return [self.load_image(path, size) for path in self.list_files(folder_path, extension)]
+
+    def preload(self):
+        """
+        Carrega de uma vez todos os sprites do jogo (precisa da janela já criada).
+        """
+        for folder in (PACMAN_RIGHT_FOLDER, PACMAN_LEFT_FOLDER, PACMAN_UP_FOLDER, PACMAN_DOWN_FOLDER):
+            self.load_folder(folder)
+        self.load_folder(GHOSTS_FOLDER, extension='.png')
+        self.load_image(BLUE_GHOST_SPRITE_PATH)
+
+    def clear(self):
+        """ Esvazia o cache (ex: depois de trocar o GRID_SIZE ou a janela). """
+        self.images.clear()
+        self.folders.clear()
+
+
+# Instância única, compartilhada por todos os módulos do jogo
+asset_manager = AssetManager()
@@ -0,0 +1,406 @@
+#Simulador em lote: roda N partidas independentes ao mesmo tempo com NumPy.
+
+# src/batch_sim.py
+
+import os
+from settings import *
+from level import Level, GRID_DIRECTIONS
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("O simulador em lote precisa do NumPy (pip install numpy).") from error
+
+
+# Códigos de direção: 0 = parado/sem comando, 1..4 = GRID_DIRECTIONS na mesma ordem
+DIRECTION_X = np.array([0] + [dx for dx, dy in GRID_DIRECTIONS], dtype=np.float64)
+DIRECTION_Y = np.array([0] + [dy for dx, dy in GRID_DIRECTIONS], dtype=np.float64)
+DIRECTION_BIT = np.array([0] + [1 << bit for bit in range(len(GRID_DIRECTIONS))], dtype=np.uint8)
+
+# Estados de cada partida
+PLAYING = 0
+GAME_OVER = 1
+VICTORY = 2
+
+# Conteúdo de cada célula no mapa de itens de cada partida
+NO_ITEM = 0
+PELLET = 1
+POWER_UP = 2
+
+
+def direction_code(direction):
+    """ Converte uma direção (dx, dy) no código usado pelo simulador (0 se não for válida). """
+    direction = (int(direction[0]), int(direction[1]))
+    return GRID_DIRECTIONS.index(direction) + 1 if direction in GRID_DIRECTIONS else 0
+
+
+class BatchSimulator:
+    """
+    Guarda o estado de N partidas em arrays NumPy e avança todas de uma vez.
+
+    As regras são as mesmas de Player.update, Enemy.update/move_towards_target
+    e Game.check_collisions (com o campo de distâncias compartilhado do
+    jogador), então uma partida do lote termina com o mesmo placar que o Game
+    headless recebendo os mesmos comandos. Cada partida pode ter seus próprios
+    cooldowns de fantasma, velocidade, tempo de spawn e tempo assustado,
+    o que permite varrer parâmetros em um único lote.
+
+    O mapa precisa ter a tabela de navegação completa (NAV_TABLE_MAX_CELLS).
+    """
+
+    def __init__(self, num_games, level=None, cooldowns=None, ghost_speed=GHOST_SPEED,
+                 spawn_time=GHOST_SPAWN_TIME, scared_time=SCARED_TIME, num_ghosts=MAX_GHOSTS):
+        """
+        Parametros:
+            num_games (int): Quantidade de partidas simuladas em paralelo.
+            level (Level): Mapa usado (por padrão, o level_1.txt).
+            cooldowns: Cooldowns de recálculo em segundos, um por fantasma; pode ser
+                uma lista (igual para todas as partidas) ou um array (num_games, fantasmas).
+            ghost_speed, spawn_time, scared_time: Valor único ou um array com um valor por partida.
+            num_ghosts (int): Máximo de fantasmas (os primeiros 'G' do mapa).
+        """
+        if level is None:
+            level = Level(os.path.join(MAPS_FOLDER, 'level_1.txt'))
+        navigation = level.navigation
+        if not navigation.precomputed:
+            raise ValueError("O simulador em lote precisa da tabela de navegação completa do mapa.")
+
+        self.level = level
+        self.num_games = num_games
+        self.width = level.width
+        cells = level.width * level.height
+
+        # --- Dados fixos do mapa (compartilhados por todas as partidas) ---
+        self.exits = np.frombuffer(bytes(level.exits), dtype=np.uint8)
+        self.partner = np.full(cells, -1, dtype=np.int64)  # Outro lado do túnel de cada célula
+        for (line, column), (dest_line, dest_column) in level.tunnels.items():
+            self.partner[level.cell_id(line, column)] = level.cell_id(dest_line, dest_column)
+
+        # Centro em pixels de cada célula
+        all_cells = np.arange(cells)
+        self.center_x = ((all_cells % self.width) * GRID_SIZE + GRID_SIZE // 2).astype(np.float64)
+        self.center_y = ((all_cells // self.width) * GRID_SIZE + GRID_SIZE // 2).astype(np.float64)
+
+        # Conversão célula do mapa <-> índice da tabela de navegação
+        self.nav_of_cell = np.full(cells, -1, dtype=np.int64)
+        self.cell_of_nav = np.array([level.cell_id(y, x) for x, y in navigation.cells], dtype=np.int64)
+        self.nav_of_cell[self.cell_of_nav] = np.arange(len(navigation.cells))
+        # next_hop[raiz, célula]: próximo passo (índice de navegação) rumo à raiz, -1 se não houver
+        self.next_hop = np.array([field.next_hops for field in navigation.fields], dtype=np.int64)
+
+        initial_items = np.zeros(cells, dtype=np.uint8)
+        initial_items[list(level.pellets)] = PELLET
+        initial_items[list(level.power_ups)] = POWER_UP
+        self.initial_items = initial_items
+
+        start = level.find_symbol('P')
+        self.player_start = level.cell_id(*start[0]) if start else level.cell_id(1, 1)
+        self.ghost_starts = np.array([level.cell_id(line, column)
+                                      for line, column in level.find_symbol('G')[:num_ghosts]], dtype=np.int64)
+        self.num_ghosts = len(self.ghost_starts)
+
+        # --- Parâmetros de cada partida (convertidos para ticks) ---
+        if cooldowns is None:
+            cooldowns = [GHOST_COOLDOWNS[i % len(GHOST_COOLDOWNS)] for i in range(self.num_ghosts)]
+        cooldowns = np.broadcast_to(np.asarray(cooldowns, dtype=np.float64), (num_games, self.num_ghosts))
+        self.cooldown_ticks = (cooldowns * FPS).astype(np.int64)
+        self.ghost_speed = np.broadcast_to(np.asarray(ghost_speed, dtype=np.float64), (num_games,))[:, None].copy()
+        self.spawn_ticks = np.broadcast_to(np.asarray(spawn_time, dtype=np.float64) * FPS, (num_games,)).copy()
+        self.scared_ticks = (np.broadcast_to(np.asarray(scared_time, dtype=np.float64), (num_games,)) * FPS).astype(np.int64)
+        self.tunnel_ticks = int(TUNNEL_COOLDOWN_SEC * FPS)
+
+        self.reset()
+
+    # =========================================================================
+    # ESTADO
+    # =========================================================================
+
+    def reset(self):
+        """ Coloca todas as partidas no estado de uma partida nova (Game.reset_game). """
+        n, g = self.num_games, self.num_ghosts
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.state = np.full(n, PLAYING, dtype=np.int8)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.full(n, PLAYER_START_LIVES, dtype=np.int64)
+        self.deaths = np.zeros(n, dtype=np.int64)
+        self.items = np.tile(self.initial_items, (n, 1))
+        self.pellets_left = np.full(n, int(np.count_nonzero(self.initial_items)), dtype=np.int64)
+        self.tunnel_cooldown = np.zeros(n, dtype=np.int64)
+        self.spawn_timer = np.zeros(n, dtype=np.int64)
+        self.released = np.zeros(n, dtype=np.int64)  # Quantos fantasmas já saíram da fila
+
+        # Jogador
+        self.player_x = np.empty(n)
+        self.player_y = np.empty(n)
+        self.player_cell = np.empty(n, dtype=np.int64)
+        self.player_dir = np.zeros(n, dtype=np.int64)
+        self.player_stored = np.zeros(n, dtype=np.int64)
+        self.invincibility = np.zeros(n, dtype=np.int64)
+        self._reset_player(np.ones(n, dtype=bool))
+        self.field_root = np.full(n, -1, dtype=np.int64)  # Raiz do campo de distâncias do jogador
+        self.field_cell = np.full(n, -1, dtype=np.int64)
+
+        # Fantasmas (n partidas x g fantasmas)
+        self.ghost_x = np.empty((n, g))
+        self.ghost_y = np.empty((n, g))
+        self.ghost_cell = np.empty((n, g), dtype=np.int64)
+        self.ghost_target = np.full((n, g), -1, dtype=np.int64)
+        self.ghost_root = np.full((n, g), -1, dtype=np.int64)
+        self.ghost_cooldown = np.zeros((n, g), dtype=np.int64)
+        self._reset_ghosts(np.ones((n, g), dtype=bool))
+
+    def _cell_center(self, cells):
+        """ Centro em pixels de um array de células. """
+        return self.center_x[cells], self.center_y[cells]
+
+    def _reset_player(self, mask):
+        self.player_cell[mask] = self.player_start
+        x, y = self._cell_center(self.player_cell)
+        self.player_x[mask] = x[mask]
+        self.player_y[mask] = y[mask]
+        self.player_dir[mask] = 0
+        self.player_stored[mask] = 0
+
+    def _reset_ghosts(self, mask):
+        starts = np.broadcast_to(self.ghost_starts, mask.shape)
+        self.ghost_cell[mask] = starts[mask]
+        x, y = self._cell_center(starts)
+        self.ghost_x[mask] = x[mask]
+        self.ghost_y[mask] = y[mask]
+        self.ghost_target[mask] = -1
+        self.ghost_root[mask] = -1
+
+    # =========================================================================
+    # SIMULAÇÃO
+    # =========================================================================
+
+    def step(self, inputs=None):
+        """
+        Avança todas as partidas em andamento por um tick.
+
+        Parametros:
+            inputs (numpy.ndarray): Código de direção por partida (0 = sem comando),
+                equivalente a chamar Player.move antes do tick.
+        """
+        alive = self.state == PLAYING
+        if not alive.any():
+            return
+        if inputs is not None:
+            pressed = alive & (inputs != 0)
+            self.player_stored[pressed] = inputs[pressed]
+
+        # Operações com máscaras aritméticas evitam a indexação booleana (bem mais lenta)
+        self.ticks += alive
+        self.tunnel_cooldown -= alive & (self.tunnel_cooldown > 0)
+
+        # Fila de fantasmas: libera o próximo quando o timer estoura
+        queued = alive & (self.released < self.num_ghosts)
+        self.spawn_timer += queued
+        release = queued & (self.spawn_timer >= self.spawn_ticks)
+        self.spawn_timer[release] = 0
+        self.released += release
+
+        self._update_player(alive)
+        self._update_player_field(alive)
+        self._update_ghosts(alive)
+        self._check_collisions(alive)
+
+        self.state[alive & (self.pellets_left == 0)] = VICTORY
+
+    def _update_player(self, alive):
+        """ Mesmas regras de Player.update, para todas as partidas de uma vez. """
+        self.invincibility -= alive & (self.invincibility > 0)
+
+        speed = PLAYER_SPEED
+        # player_cell é sempre a célula de (x, y), então o resto da divisão sai do
+        # centro da célula (consulta em tabela, bem mais barato que '%' em floats)
+        on_center = alive & (np.abs(self.player_x - self.center_x[self.player_cell]) < speed) \
+                          & (np.abs(self.player_y - self.center_y[self.player_cell]) < speed)
+
+        # Túnel: teletransporta e encerra o tick do jogador
+        teleport = on_center & (self.partner[self.player_cell] >= 0) & (self.tunnel_cooldown == 0)
+        if teleport.any():
+            self.player_cell[teleport] = self.partner[self.player_cell[teleport]]
+            x, y = self._cell_center(self.player_cell[teleport])
+            self.player_x[teleport] = x
+            self.player_y[teleport] = y
+            self.tunnel_cooldown[teleport] = self.tunnel_ticks
+
+        # Troca de direção e parada nas paredes (só no centro das células)
+        decide = on_center & ~teleport
+        exits = self.exits[self.player_cell]
+        turn = decide & ((exits & DIRECTION_BIT[self.player_stored]) != 0)
+        self.player_dir = np.where(turn, self.player_stored, self.player_dir)
+        self.player_stored *= ~decide
+        blocked = decide & ((exits & DIRECTION_BIT[self.player_dir]) == 0)
+        self.player_dir *= ~blocked
+
+        moving = alive & ~teleport
+        self.player_x += DIRECTION_X[self.player_dir] * (speed * moving)
+        self.player_y += DIRECTION_Y[self.player_dir] * (speed * moving)
+
+        # As posições nunca são negativas: truncar a divisão equivale a int(pos / GRID_SIZE)
+        new_cell = (self.player_y / GRID_SIZE).astype(np.int64) * self.width \
+            + (self.player_x / GRID_SIZE).astype(np.int64)
+        entered = moving & (new_cell != self.player_cell)
+        self.player_cell = np.where(entered, new_cell, self.player_cell)
+
+        # Come o item da nova célula
+        games = np.nonzero(entered)[0]
+        if len(games):
+            cells = self.player_cell[games]
+            eaten = self.items[games, cells]
+            self.items[games, cells] = NO_ITEM
+            self.score[games] += np.where(eaten == PELLET, 10, np.where(eaten == POWER_UP, 50, 0))
+            self.pellets_left[games] -= eaten != NO_ITEM
+            powered = games[eaten == POWER_UP]
+            self.invincibility[powered] = self.scared_ticks[powered]
+
+    def _update_player_field(self, alive):
+        """ Troca a raiz do campo de distâncias quando o jogador muda de célula. """
+        changed = alive & (self.player_cell != self.field_cell)
+        self.field_cell[changed] = self.player_cell[changed]
+        roots = self.nav_of_cell[self.player_cell]
+        valid = changed & (roots >= 0)
+        self.field_root[valid] = roots[valid]
+
+    def _next_node(self, mask, nodes):
+        """
+        Equivalente a Enemy.set_next_node para os fantasmas em 'mask', partindo de 'nodes'.
+        """
+        roots = self.ghost_root[mask]
+        nodes = nodes[mask]
+        next_cells = self._descend(roots, nodes)
+
+        # Próximo passo do outro lado de um túnel: teletransporta e desce mais um passo
+        teleport = (next_cells >= 0) & (self.partner[nodes] == next_cells)
+        if teleport.any():
+            games, ghosts = np.nonzero(mask)
+            games, ghosts = games[teleport], ghosts[teleport]
+            self.ghost_cell[games, ghosts] = next_cells[teleport]
+            x, y = self._cell_center(next_cells[teleport])
+            self.ghost_x[games, ghosts] = x
+            self.ghost_y[games, ghosts] = y
+            next_cells[teleport] = self._descend(roots[teleport], next_cells[teleport])
+
+        self.ghost_target[mask] = next_cells
+
+    def _descend(self, roots, cells):
+        """ Consulta a tabela de próximos passos (-1 quando não há passo). """
+        nav = self.nav_of_cell[cells]
+        valid = (roots >= 0) & (nav >= 0)
+        next_nav = np.full(len(cells), -1, dtype=np.int64)
+        next_nav[valid] = self.next_hop[roots[valid], nav[valid]]
+        return np.where(next_nav >= 0, self.cell_of_nav[np.maximum(next_nav, 0)], -1)
+
+    def _update_ghosts(self, alive):
+        """ Mesmas regras de Enemy.update e move_towards_target. """
+        active = alive[:, None] & (np.arange(self.num_ghosts)[None, :] < self.released[:, None])
+
+        # "Pensar": cooldown do recálculo de rota
+        counting = active & (self.ghost_cooldown > 0)
+        self.ghost_cooldown[counting] -= 1
+        think = active & (self.ghost_cooldown == 0)
+        if think.any():
+            roots = np.broadcast_to(self.field_root[:, None], think.shape)
+            self.ghost_root[think] = roots[think]
+            idle = think & (self.ghost_target < 0)
+            if idle.any():
+                self._next_node(idle, self.ghost_cell)
+            self.ghost_cooldown[think] = self.cooldown_ticks[think]
+
+        # "Agir": anda em direção ao nó alvo
+        moving = active & (self.ghost_target >= 0)
+        if not moving.any():
+            return
+        target_x, target_y = self._cell_center(np.maximum(self.ghost_target, 0))
+        dx = target_x - self.ghost_x
+        dy = target_y - self.ghost_y
+        distance = np.hypot(dx, dy)
+        speed = np.broadcast_to(self.ghost_speed, moving.shape)
+
+        arrive = moving & (distance < speed)
+        if arrive.any():
+            self.ghost_x[arrive] = target_x[arrive]
+            self.ghost_y[arrive] = target_y[arrive]
+            self._next_node(arrive, self.ghost_target.copy())
+
+        walk = moving & ~arrive
+        safe_distance = np.where(walk, distance, 1.0)
+        self.ghost_x[walk] += (dx / safe_distance)[walk] * speed[walk]
+        self.ghost_y[walk] += (dy / safe_distance)[walk] * speed[walk]
+
+        centered = walk & (np.abs(self.ghost_x % GRID_SIZE - GRID_SIZE // 2) < speed) \
+                        & (np.abs(self.ghost_y % GRID_SIZE - GRID_SIZE // 2) < speed)
+        cells = (self.ghost_y // GRID_SIZE).astype(np.int64) * self.width + (self.ghost_x // GRID_SIZE).astype(np.int64)
+        self.ghost_cell[centered] = cells[centered]
+
+    def _check_collisions(self, alive):
+        """ Mesmas regras de Game.check_collisions. """
+        active = alive[:, None] & (np.arange(self.num_ghosts)[None, :] < self.released[:, None])
+        dx = self.player_x[:, None] - self.ghost_x
+        dy = self.player_y[:, None] - self.ghost_y
+        # Filtro barato com a distância ao quadrado (com folga); a comparação exata
+        # (mesma de Vector2.distance_to) só é feita nos candidatos
+        near = active & (dx * dx + dy * dy < (GRID_SIZE / 2) ** 2 + 1)
+        if not near.any():
+            return
+        hit = near & (np.hypot(dx, dy) < GRID_SIZE / 2)
+        if not hit.any():
+            return
+
+        # Jogador invencível: cada fantasma tocado volta para a base
+        invincible = (self.invincibility > 0)[:, None]
+        eaten = hit & invincible
+        self.score += 200 * eaten.sum(axis=1)
+        self._reset_ghosts(eaten)
+
+        # Jogador vulnerável: perde uma vida e todos voltam para o início.
+        # Na última vida não há reset, então cada fantasma tocado tira mais uma vida.
+        hits = (hit & ~invincible).sum(axis=1)
+        caught = hits > 0
+        last_life = caught & (self.lives <= 1)
+        lose = np.where(last_life, hits, 1) * caught
+        self.lives -= lose
+        self.deaths += lose
+        self.state[last_life] = GAME_OVER
+
+        survived = caught & ~last_life
+        if survived.any():
+            self._reset_player(survived)
+            self._reset_ghosts(survived[:, None] & active)
+
+    def run(self, max_ticks, inputs=None, seed=None, turn_chance=0.05):
+        """
+        Roda até todas as partidas acabarem ou até 'max_ticks'.
+
+        Parametros:
+            inputs (callable): Função (simulador, tick) -> array de códigos de direção.
+                Sem ela, cada partida recebe uma direção aleatória com chance 'turn_chance' por tick.
+            seed (int): Semente do gerador aleatório.
+
+        Retorna:
+            dict: Resultados por partida (veja results()).
+        """
+        rng = np.random.default_rng(seed)
+        for tick in range(max_ticks):
+            if not (self.state == PLAYING).any():
+                break
+            if inputs is not None:
+                commands = inputs(self, tick)
+            else:
+                commands = np.where(rng.random(self.num_games) < turn_chance,
+                                    rng.integers(1, len(GRID_DIRECTIONS) + 1, self.num_games), 0)
+            self.step(commands)
+        return self.results()
+
+    def results(self):
+        """ Estatísticas de cada partida: ticks sobrevividos, placar, itens comidos, mortes e estado. """
+        return {
+            'ticks': self.ticks.copy(),
+            'score': self.score.copy(),
+            'pellets_eaten': int(np.count_nonzero(self.initial_items)) - self.pellets_left,
+            'deaths': self.deaths.copy(),
+            'lives': self.lives.copy(),
+            'state': self.state.copy(),
+        }
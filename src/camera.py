@@ -0,0 +1,56 @@
+#Câmera: qual parte do mapa aparece na janela.
+
+# src/camera.py
+
+import pygame
+from settings import *
+
+
+class Camera:
+    """
+    Janela de visualização (viewport) que acompanha o jogador pelo mapa.
+
+    Guarda o canto superior esquerdo da área visível, em pixels do mundo. Mapas
+    menores que a janela ficam parados no canto (deslocamento zero), como antes.
+    """
+
+    def __init__(self, world_width, world_height, view_width=WIDTH, view_height=VIEWPORT_HEIGHT):
+        """
+        Parametros:
+            world_width (int): Largura do mapa inteiro, em pixels.
+            world_height (int): Altura do mapa inteiro, em pixels.
+            view_width (int): Largura da área de jogo na janela.
+            view_height (int): Altura da área de jogo na janela (sem o painel da UI).
+        """
+        self.world_width = world_width
+        self.world_height = world_height
+        self.width = view_width
+        self.height = view_height
+        self.x = 0
+        self.y = 0
+
+    def follow(self, pos):
+        """
+        Centraliza a câmera na posição (em pixels do mundo), sem sair dos limites do mapa.
+        """
+        self.x = int(max(0, min(pos[0] - self.width // 2, self.world_width - self.width)))
+        self.y = int(max(0, min(pos[1] - self.height // 2, self.world_height - self.height)))
+
+    @property
+    def rect(self):
+        """ Área visível, em pixels do mundo. """
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def to_screen(self, pos):
+        """ Converte uma posição do mundo para a posição na janela. """
+        return pos[0] - self.x, pos[1] - self.y
+
+    def visible_cells(self):
+        """
+        Faixa de células visíveis.
+
+        Retorna:
+            tuple(int, int, int, int): (primeira linha, primeira coluna, última linha, última coluna).
+        """
+        return (self.y // GRID_SIZE, self.x // GRID_SIZE,
+                (self.y + self.height - 1) // GRID_SIZE, (self.x + self.width - 1) // GRID_SIZE)
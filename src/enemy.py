@@ -1,35 +1,44 @@
 # Os Vilões: Lógica dos Fantasmas.
 
+import math
 import pygame
+from collections import deque
 from settings import *
+from asset_manager import asset_manager
+from entity import Entity
 
 
-class Enemy:
+class Enemy(Entity):
+    __slots__ = ('scared_sprite', 'scared', 'field', 'path_target', 'path', 'has_target', 'target_x',
+                 'target_y', 'pathfinding_cooldown_duration_sec', 'pathfinding_cooldown', 'last_plan_tick')
+
     def __init__(self, game, pos, image, cooldown_sec):  # <<<< ADICIONADO: cooldown_sec como parâmetro
-        self.game = game
-        self.grid_pos = pygame.Vector2(pos[0], pos[1])
-        self.pixel_pos = pygame.Vector2(
-            self.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-            self.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-        )
+        # Posição, posição inicial (resetar) e direção parada ficam na Entity
+        super().__init__(game, pos, game.ghost_speed)
         self.image = image
-        self.rect = self.image.get_rect()
-        self.starting_pos = pygame.Vector2(pos[0], pos[1]) #resetar
-        
-        # Carrega a sprite dos fantasmas para o modo invencivel
-        img = pygame.image.load(BLUE_GHOST_SPRITE_PATH).convert_alpha()
-        self.scared_sprite = pygame.transform.scale(img, (GRID_SIZE, GRID_SIZE))
+
+        if self.game.headless:
+            # Modo headless: sem sprites, apenas o retângulo para posicionamento
+            self.rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+            self.scared_sprite = None
+        else:
+            self.rect = self.image.get_rect()
+            # Sprite do modo invencivel, compartilhada por todos os fantasmas
+            self.scared_sprite = asset_manager.load_image(BLUE_GHOST_SPRITE_PATH)
         self.scared = False
 
 
-        self.direction = pygame.Vector2(0, 0)
-        self.speed = GHOST_SPEED
-        self.path = []
-        self.target_node = None
+        self.field = None  # Campo de distâncias (compartilhado) que o fantasma está descendo
+        self.path_target = None  # Célula do jogador, quando o campo ainda é de uma célula anterior
+        self.path = deque()  # Rota própria até path_target, montada sob demanda
+        # Próxima célula do caminho (target_node), guardada em inteiros
+        self.has_target = False
+        self.target_x = self.target_y = 0
 
         #  Cada fantasma agora tem seu próprio tempo de cooldown
         self.pathfinding_cooldown_duration_sec = cooldown_sec
         self.pathfinding_cooldown = 0  # Começa em 0 para pensar imediatamente
+        self.last_plan_tick = 0  # Tick do último replanejamento (prioridade no AIScheduler)
 
     def update(self):
         """
@@ -40,81 +49,127 @@ class Enemy:
         if self.pathfinding_cooldown > 0:
             self.pathfinding_cooldown -= 1
 
-        # Se o timer zerar, calculamos um novo caminho e resetamos o timer.
+        # Se o timer zerar, pedimos um novo caminho ao agendador da IA, que o calcula
+        # (e reinicia o timer) neste tick ou, se o orçamento do tick acabou, em um dos próximos.
         if self.pathfinding_cooldown == 0:
-            self.recalculate_path()
-            self.pathfinding_cooldown = int(self.pathfinding_cooldown_duration_sec * FPS)
+            self.game.ai.request(self)
 
 
         # 2. LÓGICA DE "AGIR" (acontece a cada frame)
         # Move o fantasma em direção ao seu alvo atual.
         self.move_towards_target()
+        # Avisa o índice espacial da nova posição (só muda de balde ao trocar de célula)
+        self.game.spatial.update(self)
         # Determina o estado assustado
         self.scared = self.game.player.invincibility_timer > 0
 
 
-    def is_on_grid_center(self):
-        """ Verifica se o fantasma está próximo o suficiente do centro de uma célula. """
-        return (abs(self.pixel_pos.x % GRID_SIZE - GRID_SIZE // 2) < self.speed and
-                abs(self.pixel_pos.y % GRID_SIZE - GRID_SIZE // 2) < self.speed)
-
+    @property
+    def target_node(self):
+        """ Próxima célula do caminho (Vector2), ou None se o fantasma estiver parado. """
+        return pygame.Vector2(self.target_x, self.target_y) if self.has_target else None
 
+    @target_node.setter
+    def target_node(self, node):
+        self.has_target = node is not None
+        if node is not None:
+            self.target_x, self.target_y = int(node[0]), int(node[1])
 
     def recalculate_path(self):
-        """ Pede ao jogo um novo caminho até o jogador. """
-        start = (int(self.grid_pos.x), int(self.grid_pos.y))
-        target = (int(self.game.player.grid_pos.x), int(self.game.player.grid_pos.y))
-
-        self.path = self.game.find_path(start, target)
-        # Define o primeiro passo do caminho como o alvo imediato
-        if self.path and len(self.path) > 1:
-            self.target_node = pygame.Vector2(self.path[1])
+        """
+        Passa a seguir o campo de distâncias atual do jogador (compartilhado por todos).
+
+        Em mapas grandes o campo pode ser de uma célula por onde o jogador já passou
+        (veja Game.update_player_field): aí o fantasma conserta a própria rota até o
+        jogador com um A* guiado pelo campo, que custa pouco mais que a rota em si.
+        """
+        self.field = self.game.player_field
+        self.path_target = self.game.player_path_target() if self.field is not None else None
+        self.path.clear()
+        self.game.profiler.count('ghost_replans')
+
+        # Enquanto estiver andando, o fantasma só troca de rota ao chegar no próximo nó
+        if not self.has_target:
+            start = (int(self.grid_x), int(self.grid_y))
+            self.set_next_node(start)
+        elif self.path_target is not None:
+            # A rota já sai do próximo nó, para a busca ser paga agora (no orçamento da IA)
+            self.plan_route((self.target_x, self.target_y))
+
+    def plan_route(self, node):
+        """ Monta a rota própria de 'node' até path_target (fora do alcance da busca, segue o campo). """
+        path = self.game.level.navigation.guided_path(node, self.path_target, self.field)
+        if path is None:
+            self.path_target = None
+        else:
+            self.path.extend(path)
+
+    def next_step(self, node):
+        """ Próximo passo a partir de 'node': pela rota própria, se houver, senão pelo campo. """
+        if self.path_target is not None:
+            if not self.path:
+                self.plan_route(node)
+            if self.path:
+                return self.path.popleft()
+            if self.path_target is not None:
+                return None  # Já está na célula do jogador
+        return self.field.next_step(node) if self.field is not None else None
+
+    def set_next_node(self, node):
+        """ Desce o campo de distâncias (ou a rota própria) para saber o próximo passo a partir de 'node'. """
+        next_node = self.next_step(node)
+
+        # Se o próximo passo é o outro lado de um túnel, o fantasma é teletransportado
+        if next_node is not None and self.game.level.tunnels.get((node[1], node[0])) == (next_node[1], next_node[0]):
+            self.grid_x, self.grid_y = next_node
+            self.pixel_x = self.grid_x * GRID_SIZE + GRID_SIZE // 2
+            self.pixel_y = self.grid_y * GRID_SIZE + GRID_SIZE // 2
+            node = next_node
+            next_node = self.next_step(node)
+
+        if next_node is not None:
+            self.has_target = True
+            self.target_x, self.target_y = next_node
         else:
-            self.target_node = None  # Não há caminho, fica parado
+            self.has_target = False  # Chegou ao destino ou não há caminho, fica parado
 
     def move_towards_target(self):
         """ Move o fantasma continuamente em direção ao seu 'target_node'. """
-        if self.target_node is None:
+        if not self.has_target:
             return  # Se não há alvo, não faz nada
 
-        # Calcula a posição em pixels do centro do nó alvo
-        target_pixel_pos = pygame.Vector2(
-            self.target_node.x * GRID_SIZE + GRID_SIZE // 2,
-            self.target_node.y * GRID_SIZE + GRID_SIZE // 2
-        )
-
-        # Calcula o vetor direção para o alvo
-        self.direction = (target_pixel_pos - self.pixel_pos)
-
-        # Se estiver muito perto do alvo, "trava" nele e pega o próximo do caminho
-        if self.direction.length() < self.speed:
-            self.pixel_pos = target_pixel_pos  # Trava na posição exata
-
-            # Primeiro, removemos o nó que acabamos de alcançar
-            if self.path:
-                self.path.pop(0)
-
-            # AGORA, verificamos se AINDA há um caminho a seguir
-            if self.path and len(self.path) > 1:
-                # Se sim, definimos o novo alvo
-                self.target_node = pygame.Vector2(self.path[1])
-            else:
-                # Se não, o caminho acabou. O fantasma espera por um novo cálculo.
-                self.target_node = None
-
+        # Posição em pixels do centro do nó alvo e o vetor até ele (só floats, nada é alocado)
+        target_x = self.target_x * GRID_SIZE + GRID_SIZE // 2
+        target_y = self.target_y * GRID_SIZE + GRID_SIZE // 2
+        dx = target_x - self.pixel_x
+        dy = target_y - self.pixel_y
+        length = math.sqrt(dx * dx + dy * dy)  # A mesma conta de Vector2.length
+
+        # Se estiver muito perto do alvo, "trava" nele e pega o próximo passo
+        if length < self.speed:
+            self.direction_x, self.direction_y = dx, dy
+            self.pixel_x, self.pixel_y = target_x, target_y  # Trava na posição exata
+            if GHOST_REPLAN_EVERY_TILE:
+                self.game.ai.request(self)
+            # O próximo passo vem do campo de distâncias (consulta O(1))
+            self.set_next_node((self.target_x, self.target_y))
             return  # Encerra o movimento para este frame
 
         # Normaliza o vetor (transforma em um vetor de comprimento 1) e multiplica pela velocidade
-        self.direction.normalize_ip()
-        self.pixel_pos += self.direction * self.speed
+        self.direction_x = dx / length
+        self.direction_y = dy / length
+        self.pixel_x += self.direction_x * self.speed
+        self.pixel_y += self.direction_y * self.speed
 
         # Atualiza a posição no grid (para referência)
         # Apenas para fins de cálculo, a posição exata é a de pixels
         if self.is_on_grid_center():
-            self.grid_pos = pygame.Vector2(int(self.pixel_pos.x / GRID_SIZE), int(self.pixel_pos.y / GRID_SIZE))
+            self.grid_x = int(self.pixel_x / GRID_SIZE)
+            self.grid_y = int(self.pixel_y / GRID_SIZE)
 
-    def draw(self, screen):
-        self.rect.center = self.pixel_pos
+    def draw(self, screen, alpha=1.0, camera=None):
+        pos = self.render_position(alpha)
+        self.rect.center = camera.to_screen(pos) if camera is not None else pos
         if self.scared:
             screen.blit(self.scared_sprite, self.rect)
             
@@ -125,11 +180,10 @@ class Enemy:
 
     def reset(self):
         """ Reseta o inimigo para sua posição e estado iniciais. """
-        self.grid_pos = pygame.Vector2(self.starting_pos.x, self.starting_pos.y)
-        self.pixel_pos = pygame.Vector2(
-            self.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-            self.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-        )
-        self.direction = pygame.Vector2(0, 0)
-        self.path = []
-        self.target_node = None
\ No newline at end of file
+        self.place(self.start_x, self.start_y)
+        self.direction_x = self.direction_y = 0
+        self.field = None
+        self.path_target = None
+        self.path.clear()
+        self.has_target = False
+        self.game.spatial.update(self)
\ No newline at end of file
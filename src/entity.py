@@ -0,0 +1,110 @@
+#A Entidade: estado de movimento comum ao jogador e aos fantasmas.
+
+# src/entity.py
+
+import pygame
+from settings import *
+
+
+class Entity:
+    """
+    Posição e direção de uma entidade do jogo (TAD Entidade).
+
+    O estado fica em floats simples, atualizados no lugar a cada tick, e as classes
+    usam __slots__: mover uma entidade não cria nenhum objeto, o que pesa quando há
+    centenas delas (menos trabalho para o alocador e para o coletor de lixo).
+
+    Os vetores de antes (grid_pos, pixel_pos, previous_pixel_pos, direction e
+    starting_pos) continuam disponíveis como propriedades, para o código fora do
+    laço principal: ler devolve um Vector2 novo e atribuir grava nos floats. Por
+    serem cópias, alterar um deles no lugar (ex: entity.grid_pos.x = 3) não muda
+    a entidade; atribua o vetor inteiro.
+    """
+
+    __slots__ = ('game', 'grid_x', 'grid_y', 'pixel_x', 'pixel_y', 'previous_x', 'previous_y',
+                 'direction_x', 'direction_y', 'start_x', 'start_y', 'speed', 'image', 'rect')
+
+    def __init__(self, game, pos, speed):
+        """
+        Parametros:
+            game (Game): Jogo dono da entidade.
+            pos (tuple(int, int)): Célula inicial (x, y).
+            speed (float): Pixels andados por tick.
+        """
+        self.game = game
+        self.start_x, self.start_y = pos[0], pos[1]
+        self.place(pos[0], pos[1])
+        self.direction_x = self.direction_y = 0
+        self.speed = speed
+
+    def place(self, x, y):
+        """ Coloca a entidade parada no centro da célula (x, y), sem interpolar o desenho. """
+        self.grid_x, self.grid_y = x, y
+        self.pixel_x = x * GRID_SIZE + GRID_SIZE // 2
+        self.pixel_y = y * GRID_SIZE + GRID_SIZE // 2
+        self.previous_x, self.previous_y = self.pixel_x, self.pixel_y
+
+    def remember_position(self):
+        """ Guarda a posição atual, para o desenho interpolar entre dois ticks. """
+        self.previous_x = self.pixel_x
+        self.previous_y = self.pixel_y
+
+    def is_on_grid_center(self):
+        """ Verifica se a entidade está próxima o suficiente do centro de uma célula. """
+        return (abs(self.pixel_x % GRID_SIZE - GRID_SIZE // 2) < self.speed and
+                abs(self.pixel_y % GRID_SIZE - GRID_SIZE // 2) < self.speed)
+
+    def render_position(self, alpha):
+        """
+        Posição para desenhar, interpolada entre o tick anterior e o atual (alpha de 0 a 1).
+        """
+        dx = self.pixel_x - self.previous_x
+        dy = self.pixel_y - self.previous_y
+        # Depois de um teletransporte ou reset não interpolamos, para não "deslizar" pela tela
+        if alpha >= 1 or dx * dx + dy * dy > GRID_SIZE * GRID_SIZE:
+            return self.pixel_x, self.pixel_y
+        return self.previous_x + dx * alpha, self.previous_y + dy * alpha
+
+    # =========================================================================
+    # VETORES (COMPATIBILIDADE)
+    # =========================================================================
+
+    @property
+    def grid_pos(self):
+        return pygame.Vector2(self.grid_x, self.grid_y)
+
+    @grid_pos.setter
+    def grid_pos(self, pos):
+        self.grid_x, self.grid_y = pos[0], pos[1]
+
+    @property
+    def pixel_pos(self):
+        return pygame.Vector2(self.pixel_x, self.pixel_y)
+
+    @pixel_pos.setter
+    def pixel_pos(self, pos):
+        self.pixel_x, self.pixel_y = pos[0], pos[1]
+
+    @property
+    def previous_pixel_pos(self):
+        return pygame.Vector2(self.previous_x, self.previous_y)
+
+    @previous_pixel_pos.setter
+    def previous_pixel_pos(self, pos):
+        self.previous_x, self.previous_y = pos[0], pos[1]
+
+    @property
+    def direction(self):
+        return pygame.Vector2(self.direction_x, self.direction_y)
+
+    @direction.setter
+    def direction(self, direction):
+        self.direction_x, self.direction_y = direction[0], direction[1]
+
+    @property
+    def starting_pos(self):
+        return pygame.Vector2(self.start_x, self.start_y)
+
+    @starting_pos.setter
+    def starting_pos(self, pos):
+        self.start_x, self.start_y = pos[0], pos[1]
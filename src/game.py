@@ -11,27 +11,78 @@ from level import Level
 from player import Player
 from collections import deque
 from enemy import Enemy
+from text_cache import TextCache
+from asset_manager import asset_manager
+from profiler import FrameProfiler
+from spatial import SpatialHash
+from camera import Camera
+from ranking import RankingStore
+import snapshot
+from snapshot import RewindBuffer
+import replay
+from path_service import PathService
+from ai_scheduler import AIScheduler
+import ghost_store
+from ghost_store import GhostStore
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, ghost_cooldowns=None, ghost_speed=GHOST_SPEED,
+                 ghost_spawn_time=GHOST_SPAWN_TIME, scared_time=SCARED_TIME, trace_path=None,
+                 record_path=None):
         """
         Construtor da classe Game. Inicializa o Pygame e a tela.
+
+        Parametros:
+            headless (bool): Se True, o jogo roda sem janela, sem sprites e sem
+                limite de FPS (usado em simulações e testes automáticos).
+            ghost_cooldowns (list[float]): Segundos entre os recálculos de rota de cada fantasma
+                (None = GHOST_COOLDOWNS).
+            ghost_speed (float): Velocidade dos fantasmas, em pixels por tick.
+            ghost_spawn_time (float): Segundos entre a saída de dois fantasmas da fila.
+            scared_time (float): Segundos de invencibilidade depois de um power-up.
+            trace_path (str): Se informado, grava o tempo de cada quadro (JSON por linha) nesse arquivo.
+            record_path (str): Se informado, grava o replay de cada partida jogada nesse arquivo.
         """
-        pygame.init()
+        self.headless = headless
+        # Gravação das entradas do jogador (veja replay.py)
+        self.record_path = record_path
+        self.recorder = None
 
+        # Parâmetros dos fantasmas (os padrões vêm do settings.py; o torneio varia esses valores)
+        self.ghost_cooldowns = list(ghost_cooldowns) if ghost_cooldowns is not None else GHOST_COOLDOWNS
+        self.ghost_speed = ghost_speed
+        self.ghost_spawn_time = ghost_spawn_time
+        self.scared_time = scared_time
 
         self.score = 0
         self.lives = PLAYER_START_LIVES
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption(TITULO)
+        if self.headless:
+            # Sem janela: nenhuma chamada a display/convert_alpha é feita
+            self.screen = None
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption(TITULO)
+            if PRELOAD_ASSETS:
+                asset_manager.preload()
         self.clock = pygame.time.Clock()
         self.running = True
+        # Fontes e textos renderizados ficam em cache entre os frames
+        self.text = TextCache()
+        # Melhores pontuações em memória (o arquivo só é relido no que mudou)
+        self.ranking = RankingStore()
+        self.life_icon = None  # Ícone de vida já redimensionado (criado no primeiro draw_ui)
+        self.pause_overlay = None
+        # Tempo gasto em cada parte do quadro (o modo headless não mede nada)
+        self.profiler = FrameProfiler(enabled=PROFILER_ENABLED and not headless, trace_path=trace_path)
 
 
         # Construcao do caminho para o arquivo
         caminho_do_mapa = os.path.join(MAPS_FOLDER, 'level_1.txt')
         #  instância do Level
         self.level = Level(caminho_do_mapa)
+        # Câmera que acompanha o jogador em mapas maiores que a janela
+        self.camera = Camera(self.level.width * GRID_SIZE, self.level.height * GRID_SIZE)
 
         #  Bloco que cria o jogador
         # Usa o metodo find_symbol do TAD Mapa para achar a posição inicial
@@ -54,13 +105,34 @@ class Game:
         self.pause_options = ['Sair e Salvar', 'Sair sem Salvar', 'Cancelar']
         self.selected_pause_option = 0  # O índice da opção selecionada (começa em 0)
 
+        # Campo de distâncias até o jogador, compartilhado por todos os fantasmas.
+        # Só é trocado quando o jogador entra em uma nova célula.
+        self.player_field = None
+        self.player_field_cell = None
+        # Mapas grandes: as buscas rodam em uma thread e o campo novo chega alguns ticks depois
+        # (o modo headless fica sempre síncrono, para os resultados não dependerem da máquina)
+        self.path_service = None
+        if PATH_SERVICE_ENABLED and not headless and not self.level.navigation.precomputed:
+            self.path_service = PathService(self.level.navigation)
+
+        # Contador de ticks da simulação (todos os timers do jogo contam ticks)
+        self.ticks = 0
+        # Checkpoints recentes da partida, para voltar no tempo (tecla R)
+        self.rewind = RewindBuffer()
+
         # Atributo para o cooldown do túnel
         self.tunnel_cooldown = 0  # Em frames. 0 significa que os túneis estão ativos.
 
         #fantasmas
         self.enemies = []
+        # Índice espacial dos inimigos ativos (as colisões só olham as células vizinhas)
+        self.spatial = SpatialHash()
         self.ghost_queue = deque()
         self.ghost_spawn_timer = 0
+        # Replanejamentos dos fantasmas, com um orçamento de busca por tick
+        self.ai = AIScheduler(self)
+        # Estado dos fantasmas em arrays, movidos em lote (None = um objeto Enemy por fantasma)
+        self.ghost_store = GhostStore() if GHOST_STORE_ENABLED and ghost_store.AVAILABLE else None
 
         self.ghost_sprites = {}  # Dicionário para guardar as imagens dos fantasmas
         self.load_ghost_sprites()  # Carrega as imagens na inicialização
@@ -77,20 +149,21 @@ class Game:
         """
         Carrega, redimensiona e armazena todas as imagens dos fantasmas.
         """
-        # Pega todos os arquivos .png da pasta e os ordena para garantir a consistência
-        filenames = sorted([f for f in os.listdir(GHOSTS_FOLDER) if f.endswith('.png')])
+        # Pega todos os arquivos .png da pasta, já ordenados para garantir a consistência
+        paths = asset_manager.list_files(GHOSTS_FOLDER, '.png')
 
         # Mapeia um nome para cada sprite (pode ajustar se os nomes forem diferentes)
         sprite_keys = ['blinky', 'pinky', 'inky', 'clyde']
 
-        for i, filename in enumerate(filenames):
+        for i, path in enumerate(paths):
             # Garante que não tentemos acessar um índice de sprite_keys que não existe
             if i < len(sprite_keys):
                 key = sprite_keys[i]
-                path = os.path.join(GHOSTS_FOLDER, filename)
-                img = pygame.image.load(path).convert_alpha()
-                scaled_img = pygame.transform.scale(img, (GRID_SIZE, GRID_SIZE))
-                self.ghost_sprites[key] = scaled_img
+                # No modo headless só registramos a chave, para criar o mesmo número de fantasmas
+                if self.headless:
+                    self.ghost_sprites[key] = None
+                    continue
+                self.ghost_sprites[key] = asset_manager.load_image(path)
 
     #  metodo para resetar o jogo inteiro
     def reset_game(self):
@@ -98,19 +171,31 @@ class Game:
 
         self.score = 0
         self.lives = PLAYER_START_LIVES
+        self.ticks = 0
+        self.tunnel_cooldown = 0
+        self.player_field = None
+        self.player_field_cell = None
 
         # Reseta as entidades para suas posições iniciais
         self.player.reset()
+        self.player.invincibility_timer = 0
         # Limpa a lista de inimigos ativos
         self.enemies = []
+        self.spatial.clear()
         # Recria a fila de fantasmas e a repopula
         self.ghost_queue = deque()
+        if self.ghost_store is not None:
+            self.ghost_store.clear()
         self.load_enemies()
         # Reseta o timer de spawn dos fantasmas
         self.ghost_spawn_timer = 0
 
         # Reseta o mapa para restaurar todos os pontinhos
         self.level.reset()
+        self.rewind.clear()
+        self.ai.restore()
+        if self.path_service is not None:
+            self.path_service.cancel()
 
     def menu_principal_events(self):
         for event in pygame.event.get():
@@ -128,13 +213,15 @@ class Game:
                     if self.selected_menu_option == 0:
                         self.reset_game()
                         self.state = 'jogando'
+                        self.start_recording()
                     # Opção 1: Ranking
                     elif self.selected_menu_option == 1:
                         self.state = 'exibindo_ranking'
                     # Opção 2: Carregar Jogo Salvo
                     elif self.selected_menu_option == 2:
-                        self.carregar_jogo()
-                        self.state = 'jogando'
+                        # Se o save não puder ser carregado, o erro é informado e o jogo fica no menu
+                        if self.carregar_jogo():
+                            self.start_recording()
                     # Opção 3: Sair
                     elif self.selected_menu_option == 3:
                         self.running = False
@@ -142,22 +229,16 @@ class Game:
 
     def menu_principal_draw(self):
         self.screen.fill(BLACK)
-        try:
-            title_font = pygame.font.Font(MAIN_FONT, 48)
-            option_font = pygame.font.Font(MAIN_FONT, 28)
-        except:
-            title_font = pygame.font.SysFont('arial', 48)
-            option_font = pygame.font.SysFont('arial', 28)
 
         # Desenha o título
-        title_text = title_font.render(TITULO, True, YELLOW)
+        title_text = self.text.render(TITULO, 48, YELLOW)
         title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 3))
         self.screen.blit(title_text, title_rect)
 
         # Desenha as opções
         for index, option in enumerate(self.menu_options):
             color = YELLOW if index == self.selected_menu_option else WHITE
-            option_text = option_font.render(option, True, color)
+            option_text = self.text.render(option, 28, color)
             option_rect = option_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + index * 60))
             self.screen.blit(option_text, option_rect)
 
@@ -182,15 +263,23 @@ class Game:
                 if event.key == pygame.K_p or event.key == pygame.K_q:
                     self.state = 'pausado'
 
+                # Liga/desliga o overlay de desempenho
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+
+                # Volta a partida para o último checkpoint
+                if event.key == pygame.K_r:
+                    self.rewind_game()
+
                 # Agora, verificamos qual tecla foi para mover o jogador
                 if event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                    self.player.move(pygame.Vector2(-1, 0))
+                    self.input_direction(pygame.Vector2(-1, 0))
                 if event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                    self.player.move(pygame.Vector2(1, 0))
+                    self.input_direction(pygame.Vector2(1, 0))
                 if event.key == pygame.K_UP or event.key == pygame.K_w:
-                    self.player.move(pygame.Vector2(0, -1))
+                    self.input_direction(pygame.Vector2(0, -1))
                 if event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                    self.player.move(pygame.Vector2(0, 1))
+                    self.input_direction(pygame.Vector2(0, 1))
 
     def load_enemies(self):
         """
@@ -199,8 +288,8 @@ class Game:
         ghost_positions = self.level.find_symbol('G')
         sprite_keys = list(self.ghost_sprites.keys())
 
-        # <<<< ADICIONADO: Lista com os tempos de cooldown em segundos, na ordem
-        cooldowns = [2.0, 3.1, 4.0, 4.5, 4.6]
+        # Lista com os tempos de cooldown em segundos, na ordem (padrão definido em settings.py)
+        cooldowns = self.ghost_cooldowns
 
         for i, pos in enumerate(ghost_positions):
             if i < len(sprite_keys):
@@ -212,34 +301,125 @@ class Game:
                 cooldown = cooldowns[i % len(cooldowns)]
 
                 # <<<< ALTERADO: Passa o cooldown individual para o construtor do Enemy
-                self.ghost_queue.append(Enemy(self, (pos[1], pos[0]), sprite, cooldown))
+                self.ghost_queue.append(self.create_enemy((pos[1], pos[0]), sprite, cooldown))
+
+    def create_enemy(self, pos, image, cooldown_sec):
+        """ Cria um fantasma: nos arrays da GhostStore, se ela estiver ligada, ou como um Enemy comum. """
+        if self.ghost_store is not None:
+            return self.ghost_store.create(self, pos, image, cooldown_sec)
+        return Enemy(self, pos, image, cooldown_sec)
 
     def playing_update(self):
         """
-        Atualiza a lógica do jogo.
+        Atualiza a lógica do jogo em um tick de duração fixa (1 / FPS segundos).
         """
-        if self.tunnel_cooldown > 0:
-            self.tunnel_cooldown -= 1
-        # Se a fila não estiver vazia, contamos o tempo para liberar o próximo
-        if self.ghost_queue:
-            self.ghost_spawn_timer += 1
-            # Se o tempo passou (convertido para frames), libera um fantasma
-            if self.ghost_spawn_timer >= GHOST_SPAWN_TIME * FPS:
-                self.ghost_spawn_timer = 0
-                self.enemies.append(self.ghost_queue.popleft())  # Tira da fila e põe no jogo
-
-
-        self.player.update()
-        # Atualiza cada inimigo na lista de ativos
-        for enemy in self.enemies:
-            enemy.update()
+        profiler = self.profiler
+        with profiler.section('update'):
+            self.ticks += 1
+            # Guarda as posições atuais para o desenho poder interpolar entre dois ticks
+            self.player.remember_position()
+            if self.ghost_store is not None:
+                self.ghost_store.remember_positions(self.enemies)
+            else:
+                for enemy in self.enemies:
+                    enemy.remember_position()
+
+            if self.tunnel_cooldown > 0:
+                self.tunnel_cooldown -= 1
+            # Se a fila não estiver vazia, contamos o tempo para liberar o próximo
+            if self.ghost_queue:
+                self.ghost_spawn_timer += 1
+                # Se o tempo passou (convertido para frames), libera um fantasma
+                if self.ghost_spawn_timer >= self.ghost_spawn_time * FPS:
+                    self.ghost_spawn_timer = 0
+                    self.release_enemy()
+
+            self.player.update()
+
+        with profiler.section('ai'):
+            self.ai.begin_tick()
+            self.update_player_field()
+            # Pedidos de rota que não couberam no orçamento dos ticks anteriores
+            self.ai.run()
+            # Atualiza os inimigos ativos: todos de uma vez nos arrays, ou cada um na lista
+            if self.ghost_store is not None:
+                self.ghost_store.update(self)
+            else:
+                for enemy in self.enemies:
+                    enemy.update()
+            self.ai.end_tick()
 
         #Chamada para verificar colisões a cada frame
-        self.check_collisions()
+        with profiler.section('collisions'):
+            self.check_collisions()
 
         if self.level.total_pellets == 0:
             self.state = 'vitoria_fase'
 
+        # Checkpoint para o rewind: o snapshot tem poucos bytes e leva microssegundos
+        if self.state == 'jogando' and self.ticks % (REWIND_INTERVAL_SEC * FPS) == 0:
+            self.rewind.push(self.ticks, snapshot.capture(self))
+
+    def rewind_game(self):
+        """ Volta a partida para o checkpoint mais recente (cada chamada volta mais um). """
+        data = self.rewind.pop(before=self.ticks)
+        if data is None:
+            print("Nenhum checkpoint para voltar.")
+            return
+        if self.recorder is not None:
+            self.recorder.record_rewind(self.ticks)
+        snapshot.restore(self, data)
+        print(f"Partida voltou para o tick {self.ticks}.")
+
+    def input_direction(self, direction):
+        """ Passa uma direção para o jogador, gravando-a no replay se houver gravação. """
+        if self.recorder is not None:
+            self.recorder.record(self.ticks, direction)
+        self.player.move(direction)
+
+    def start_recording(self):
+        """ Começa a gravar o replay a partir do estado atual (se houver record_path). """
+        if self.record_path:
+            self.recorder = replay.ReplayRecorder(self)
+
+    def finish_recording(self):
+        """ Grava o replay da partida em andamento em record_path. """
+        if self.recorder is None:
+            return
+        try:
+            snapshot.write(self.record_path, self.recorder.finish(self))
+            print(f"Replay com {len(self.recorder)} eventos salvo em {self.record_path}")
+        except OSError as e:
+            print(f"Não foi possível salvar o replay: {e}")
+        self.recorder = None
+
+    def run_headless(self, max_frames=None, controller=None):
+        """
+        Roda a lógica da partida sem janela, sem desenho e sem limitar o FPS.
+
+        Parametros:
+            max_frames (int): Número máximo de frames a simular (None = até a partida acabar).
+            controller (callable): Função opcional chamada a cada frame com o jogo;
+                se retornar um Vector2, ele é passado para Player.move.
+
+        Se o jogo tiver record_path, a partida é gravada como replay.
+
+        Retorna:
+            int: Número de frames simulados.
+        """
+        self.reset_game()
+        self.state = 'jogando'
+        self.start_recording()
+        frames = 0
+        while self.state == 'jogando' and (max_frames is None or frames < max_frames):
+            if controller is not None:
+                direction = controller(self)
+                if direction is not None:
+                    self.input_direction(direction)
+            self.playing_update()
+            frames += 1
+        self.finish_recording()
+        return frames
 
 
     # --- MÉTODOS DE ESTADO: VITÓRIA ---
@@ -255,15 +435,9 @@ class Game:
 
     def vitoria_fase_draw(self):
         self.screen.fill(BLACK)
-        try:
-            font = pygame.font.Font(MAIN_FONT, 48)
-            sub_font = pygame.font.Font(MAIN_FONT, UI_FONT_SIZE)
-        except FileNotFoundError:
-            font = pygame.font.SysFont('arial', 48)
-            sub_font = pygame.font.SysFont('arial', UI_FONT_SIZE)
 
-        title_text = font.render("FASE COMPLETA!", True, YELLOW)
-        instructions_text = sub_font.render("Pressione ENTER para voltar ao menu", True, WHITE)
+        title_text = self.text.render("FASE COMPLETA!", 48, YELLOW)
+        instructions_text = self.text.render("Pressione ENTER para voltar ao menu", UI_FONT_SIZE, WHITE)
         title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
         instructions_rect = instructions_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
 
@@ -272,47 +446,58 @@ class Game:
         pygame.display.flip()
 
 
-    def playing_draw(self):
+    def playing_draw(self, alpha=1.0):
         """
         Desenha todos os elementos na tela.
-        """
-        self.screen.fill(BLACK)
-        self.level.draw(self.screen)
-        # Chama o metodo de desenho do jogador
-        self.player.draw(self.screen)
-
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
 
-        self.draw_ui()# Garante que a UI seja desenhada por cima
-        pygame.display.flip()
+        Parametros:
+            alpha (float): Fração do próximo tick já decorrida, usada para interpolar as posições.
+        """
+        if not INTERPOLATE_RENDER:
+            alpha = 1.0
+        profiler = self.profiler
+        camera = self.camera
+        with profiler.section('level_draw'):
+            camera.follow(self.player.render_position(alpha))
+            self.screen.fill(BLACK)
+            # Só os blocos do mapa que aparecem na janela são desenhados
+            self.level.draw(self.screen, camera)
+
+        with profiler.section('entity_draw'):
+            # Chama o metodo de desenho do jogador
+            self.player.draw(self.screen, alpha, camera)
+            # Só os inimigos dentro da área visível (com uma célula de folga para os sprites nas bordas)
+            for enemy in self.spatial.query_rect(camera.rect.inflate(2 * GRID_SIZE, 2 * GRID_SIZE)):
+                enemy.draw(self.screen, alpha, camera)
+
+        with profiler.section('ui'):
+            self.draw_ui()# Garante que a UI seja desenhada por cima
+            profiler.draw(self.screen, self.text)
+
+        with profiler.section('flip'):
+            pygame.display.flip()
 
     def draw_ui(self):
         # Área do painel inferior
         panel_rect = pygame.Rect(UI_PANEL_POS[0], UI_PANEL_POS[1], WIDTH, HEIGHT - (GRID_HEIGHT * GRID_SIZE))
         pygame.draw.rect(self.screen, BLACK, panel_rect)  # Fundo preto para o painel
 
-        # Tenta usar a fonte personalizada, se não encontrar, usa uma padrão
-        try:
-            font = pygame.font.Font(MAIN_FONT, UI_FONT_SIZE)
-        except FileNotFoundError:
-            font = pygame.font.SysFont('arial', UI_FONT_SIZE)
-
-        # Desenha o Score
-        score_text = font.render(f"SCORE: {self.score}", True, WHITE)
+        # Desenha o Score (o texto só é renderizado de novo quando o score muda)
+        score_text = self.text.render(f"SCORE: {self.score}", UI_FONT_SIZE, WHITE)
         self.screen.blit(score_text, (20, HEIGHT - 40))
 
         # Desenha as Vidas
-        lives_text = font.render(f"LIVES: ", True, WHITE)
+        lives_text = self.text.render("LIVES: ", UI_FONT_SIZE, WHITE)
         self.screen.blit(lives_text, (WIDTH - 180, HEIGHT - 40))
 
+        # Usamos o primeiro sprite da animação 'right' como ícone, redimensionado uma única vez
+        if self.life_icon is None:
+            life_icon = self.player.animations['right'][0]
+            self.life_icon = pygame.transform.scale(life_icon, (GRID_SIZE - 10, GRID_SIZE - 10))
+
         # Desenha os ícones de vida do Pac-Man
         for i in range(self.lives):
-            # Usamos o primeiro sprite da animação 'right' como ícone
-            life_icon = self.player.animations['right'][0]
-            # Ajusta o tamanho do ícone se necessário
-            life_icon_small = pygame.transform.scale(life_icon, (GRID_SIZE - 10, GRID_SIZE - 10))
-            self.screen.blit(life_icon_small, (WIDTH - 100 + (i * 35), HEIGHT - 45))
+            self.screen.blit(self.life_icon, (WIDTH - 100 + (i * 35), HEIGHT - 45))
 
     # Dentro da classe Game
 
@@ -357,23 +542,18 @@ class Game:
 
     def pausado_draw(self):
 
-        # Agora, criamos uma camada escura semi-transparente por cima
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)  # SRCALPHA permite transparência
-        overlay.fill((0, 0, 0, 170))  # Preto com 170 de alpha (0-255)
-        self.screen.blit(overlay, (0, 0))
-
-        # Define as fontes
-        try:
-            menu_font = pygame.font.Font(MAIN_FONT, 36)
-        except FileNotFoundError:
-            menu_font = pygame.font.SysFont('arial', 36)
+        # Agora, criamos uma camada escura semi-transparente por cima (criada uma única vez)
+        if self.pause_overlay is None:
+            self.pause_overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)  # SRCALPHA permite transparência
+            self.pause_overlay.fill((0, 0, 0, 170))  # Preto com 170 de alpha (0-255)
+        self.screen.blit(self.pause_overlay, (0, 0))
 
         # Desenha as opções do menu
         for index, option in enumerate(self.pause_options):
             # Se a opção estiver selecionada, usa a cor amarela. Senão, branca.
             color = YELLOW if index == self.selected_pause_option else WHITE
 
-            option_text = menu_font.render(option, True, color)
+            option_text = self.text.render(option, 36, color)
 
             # Calcula a posição de cada opção
             option_rect = option_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40 + index * 60))
@@ -386,43 +566,80 @@ class Game:
     #IA fantasmas
     def find_path(self, start_pos, target_pos):
         """
-        Encontra o caminho mais curto entre dois pontos usando o algoritmo BFS.
+        Encontra o caminho mais curto entre dois pontos.
+
+        O caminho é montado a partir da tabela de navegação do mapa, que é
+        calculada uma única vez quando o Level é carregado.
 
         :param start_pos: Tupla (x, y) da posição inicial no grid.
         :param target_pos: Tupla (x, y) da posição alvo no grid.
         :return: Lista de tuplas representando o caminho, ou None se não houver caminho.
         """
-        # O mapa é o nosso grafo. Usaremos os métodos do TAD Mapa para navegar.
-        grid = self.level.matrix
-        # Fila para o BFS, armazena os caminhos a serem explorados
-        queue = deque([[start_pos]])
-        # Conjunto para guardar as posições já visitadas e evitar loops
-        visited = {start_pos}
-
-        while queue:
-            # Pega o primeiro caminho da fila
-            path = queue.popleft()
-            # Pega o último nó (posição) desse caminho
-            node = path[-1]
-
-            # Se chegamos ao alvo, retornamos o caminho encontrado
-            if node == target_pos:
-                return path
-
-            # Explora os vizinhos (Cima, Baixo, Esquerda, Direita)
-            for direction in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                next_node = (node[0] + direction[0], node[1] + direction[1])
-
-                # Verifica se o vizinho está dentro do mapa
-                if (0 <= next_node[0] < self.level.width and 0 <= next_node[1] < self.level.height):
-                    # Verifica se o vizinho não é uma parede e se ainda não foi visitado
-                    if not self.level.is_wall(next_node[1], next_node[0]) and next_node not in visited:
-                        new_path = list(path)
-                        new_path.append(next_node)
-                        queue.append(new_path)
-                        visited.add(next_node)
-
-        return None  # Retorna None se não encontrar um caminho
+        return self.level.navigation.path(start_pos, target_pos)
+
+    def update_player_field(self):
+        """
+        Atualiza o campo de distâncias até o jogador, apenas se ele mudou de célula.
+        """
+        cell = (int(self.player.grid_x), int(self.player.grid_y))
+        service = self.path_service
+        if cell != self.player_field_cell:
+            self.player_field_cell = cell
+            navigation = self.level.navigation
+            field = navigation.cached_field(cell)
+            if field is not None:
+                if service is not None:
+                    service.drop('player')
+            elif not self._player_field_covers(cell):
+                if service is None:
+                    field = navigation.field(cell)
+                else:
+                    # A busca vai para a thread e os fantasmas seguem o campo antigo até o novo chegar
+                    service.request('player', cell)
+            # Fora de uma célula caminhável mantemos o último campo válido
+            if field is not None:
+                self.player_field = field
+        if service is not None:
+            field = service.poll('player')
+            if field is not None:
+                self.player_field = field
+
+    def _player_field_covers(self, cell):
+        """
+        Verifica se o campo atual do jogador ainda serve de guia para 'cell' (no máximo
+        NAV_ANCHOR_MAX_DRIFT passos da raiz), dispensando um campo novo.
+        """
+        if self.player_field is None:
+            return False
+        distance = self.player_field.distance(cell)
+        return distance is not None and distance <= NAV_ANCHOR_MAX_DRIFT
+
+    def player_path_target(self):
+        """
+        Célula do jogador, quando o campo dele é de uma célula que ficou para trás.
+
+        Nesse caso cada fantasma monta a própria rota até o jogador (Enemy.recalculate_path).
+
+        Retorna:
+            tuple(int, int): Célula (x, y), ou None se o campo já termina no jogador.
+        """
+        field = self.player_field
+        if field is None or field.root_pos == self.player_field_cell:
+            return None
+        return self.player_field_cell
+
+    def path_distance(self, start_pos, target_pos):
+        """
+        Retorna quantos passos separam duas posições (x, y), ou None se não houver caminho.
+        """
+        return self.level.navigation.distance(start_pos, target_pos)
+
+    def release_enemy(self):
+        """ Tira o próximo fantasma da fila e o coloca no jogo (e no índice espacial). """
+        enemy = self.ghost_queue.popleft()
+        self.enemies.append(enemy)
+        self.spatial.insert(enemy)
+        return enemy
 
     def reset_entities(self):
         """ Reseta todas as entidades para suas posições iniciais. """
@@ -432,25 +649,31 @@ class Game:
 
     def check_collisions(self):
         """ Verifica e trata as colisões entre o jogador e os inimigos. """
-        for enemy in self.enemies:
-            # Calcula a distância entre o centro do jogador e o do inimigo
-            dist = self.player.pixel_pos.distance_to(enemy.pixel_pos)
-            # Se a distância for menor que o raio de ambos (meio GRID_SIZE), eles colidiram
-            if dist < GRID_SIZE / 2:
-                # Caso 1: Jogador está invencível
-                if self.player.invincibility_timer > 0:
-                    print("Fantasma comido!")
-                    self.score += 200  # Adiciona pontos por comer o fantasma
-                    enemy.reset()  # Manda o fantasma de volta para a base
-                # Caso 2: Jogador está vulnerável
+        # Colidem os inimigos a menos de meio GRID_SIZE do jogador (o raio de ambos).
+        # O índice espacial só compara com os inimigos das células vizinhas, e devolve
+        # os encontrados na mesma ordem da lista de inimigos.
+        radius = GRID_SIZE / 2
+        player = self.player
+        hits = self.spatial.query((player.pixel_x, player.pixel_y), radius)
+        while hits:
+            enemy = hits.pop(0)
+            # Caso 1: Jogador está invencível
+            if self.player.invincibility_timer > 0:
+                print("Fantasma comido!")
+                self.score += 200  # Adiciona pontos por comer o fantasma
+                enemy.reset()  # Manda o fantasma de volta para a base
+            # Caso 2: Jogador está vulnerável
+            else:
+                self.lives -= 1
+                print(f"Vida perdida! Vidas restantes: {self.lives}")
+                if self.lives <= 0:
+                    self.state = 'game_over'
                 else:
-                    self.lives -= 1
-                    print(f"Vida perdida! Vidas restantes: {self.lives}")
-                    if self.lives <= 0:
-                        self.state = 'game_over'
-                    else:
-                        # Reseta a posição de todos para continuar a rodada
-                        self.reset_entities()
+                    # Reseta a posição de todos para continuar a rodada
+                    self.reset_entities()
+                    # Todos mudaram de lugar: refaz a consulta com os inimigos que ainda faltavam
+                    hits = self.spatial.query((player.pixel_x, player.pixel_y), radius,
+                                              after=self.spatial.order_of(enemy))
 
     # --- MÉTODOS DE ESTADO: GAME OVER ---
     def game_over_events(self):
@@ -465,16 +688,10 @@ class Game:
 
     def game_over_draw(self):
         self.screen.fill(BLACK)
-        try:
-            title_font = pygame.font.Font(MAIN_FONT, 48)
-            instructions_font = pygame.font.Font(MAIN_FONT, UI_FONT_SIZE)
-        except FileNotFoundError:
-            title_font = pygame.font.SysFont('arial', 48)
-            instructions_font = pygame.font.SysFont('arial', UI_FONT_SIZE)
 
-        title_text = title_font.render("GAME OVER", True, RED)
-        score_text = instructions_font.render(f"PONTUAÇÃO FINAL: {self.score}", True, WHITE)
-        instructions_text = instructions_font.render("Pressione ENTER para voltar ao menu", True, WHITE)
+        title_text = self.text.render("GAME OVER", 48, RED)
+        score_text = self.text.render(f"PONTUAÇÃO FINAL: {self.score}", UI_FONT_SIZE, WHITE)
+        instructions_text = self.text.render("Pressione ENTER para voltar ao menu", UI_FONT_SIZE, WHITE)
 
         title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 80))
         score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
@@ -490,11 +707,9 @@ class Game:
         """
         Salva a pontuação atual no arquivo de ranking.
         """
-        # Usamos 'a' para 'append', que adiciona ao final do arquivo sem apagar o que já existe.
         try:
-            with open(RANKING_FILE, 'a') as file:
-                # Salva no formato "NOME PONTOS" para facilitar a leitura depois
-                file.write(f"JOGADOR {self.score}\n")
+            # Grava no formato "NOME PONTOS" (a linha já está no disco quando add retorna)
+            self.ranking.add("JOGADOR", self.score)
             print(f"Pontuação {self.score} salva no ranking.")
         except Exception as e:
             print(f"Não foi possível salvar o score: {e}")
@@ -502,31 +717,16 @@ class Game:
 
     def load_scores(self):
         """
-        Lê o arquivo de ranking, ordena os scores e retorna os melhores.
-        """
-        if not os.path.exists(RANKING_FILE):
-            return []  # Retorna lista vazia se o arquivo não existe
+        Retorna os 10 melhores scores, do maior para o menor.
 
-        scores = []
+        O ranking fica em memória: aqui só são lidas as linhas que outras partidas
+        (ou outros processos) acrescentaram ao arquivo desde a última consulta.
+        """
         try:
-            with open(RANKING_FILE, 'r') as file:
-                for line in file:
-                    # Tenta separar a linha em nome e score. Se falhar, ignora a linha.
-                    try:
-                        name, score = line.strip().split()
-                        scores.append((name, int(score)))
-                    except ValueError:
-                        continue  # Pula para a próxima linha se esta estiver mal formatada
+            self.ranking.refresh()
         except Exception as e:
             print(f"Não foi possível carregar os scores: {e}")
-            return []
-
-        # A mágica da ordenação: ordena a lista de tuplas pelo segundo elemento (o score),
-        # em ordem decrescente (do maior para o menor).
-        sorted_scores = sorted(scores, key=lambda x: x[1], reverse=True)
-
-        # Retorna apenas os 10 melhores resultados
-        return sorted_scores[:10]
+        return self.ranking.top(10)
 
     # --- MÉTODOS DE ESTADO: RANKING ---
     def ranking_events(self):
@@ -542,79 +742,98 @@ class Game:
         # Carrega os scores ordenados
         high_scores = self.load_scores()
 
-        try:
-            title_font = pygame.font.Font(MAIN_FONT, 36)
-            score_font = pygame.font.Font(MAIN_FONT, UI_FONT_SIZE)
-        except:
-            title_font = pygame.font.SysFont('arial', 36)
-            score_font = pygame.font.SysFont('arial', UI_FONT_SIZE)
-
         # Desenha o título
-        title_text = title_font.render("RANKING", True, YELLOW)
+        title_text = self.text.render("RANKING", 36, YELLOW)
         title_rect = title_text.get_rect(center=(WIDTH // 2, 80))
         self.screen.blit(title_text, title_rect)
 
         # Desenha cada score
         for index, (name, score) in enumerate(high_scores):
             score_text_str = f"{index + 1:2}. {name:<10} {score:>6}"
-            score_text = score_font.render(score_text_str, True, WHITE)
+            score_text = self.text.render(score_text_str, UI_FONT_SIZE, WHITE)
             score_rect = score_text.get_rect(center=(WIDTH // 2, 180 + index * 40))
             self.screen.blit(score_text, score_rect)
 
         # Desenha instrução para voltar
-        back_text = score_font.render("Pressione ENTER para voltar", True, GREY)
+        back_text = self.text.render("Pressione ENTER para voltar", UI_FONT_SIZE, GREY)
         back_rect = back_text.get_rect(center=(WIDTH // 2, HEIGHT - 50))
         self.screen.blit(back_text, back_rect)
 
         pygame.display.flip()
 
     def salvar_jogo(self):
-        save_data = {
-            "score": self.score,
-            "vidas": self.lives,
-            "player_pos": [self.player.grid_pos.x, self.player.grid_pos.y],
-            "invincibility_timer": self.player.invincibility_timer,
-            "mapa": self.level.matrix,
-            "ghosts_pos": [[enemy.grid_pos.x, enemy.grid_pos.y] for enemy in self.enemies] 
-            }    
-            
-                
-        with open("../assets/save.json", "w") as arquivo:
-            json.dump(save_data, arquivo)
+        """
+        Salva o estado completo da partida em SAVE_FILE (snapshot binário).
+        """
+        try:
+            snapshot.write(SAVE_FILE, snapshot.capture(self))
+        except OSError as e:
+            print(f"Não foi possível salvar o jogo: {e}")
 
     def carregar_jogo(self):
+        """
+        Carrega o jogo salvo (ou o save antigo em JSON, se só ele existir).
+
+        Se o save existe mas não pode ser lido (arquivo corrompido ou de uma versão
+        antiga do formato), o erro é informado e nada muda: o save antigo em JSON é
+        outro jogo e não deve ser carregado no lugar dele.
+
+        Retorna:
+            bool: True se o jogo foi carregado (o estado passa a ser 'jogando').
+        """
+        if not os.path.exists(SAVE_FILE):
+            return self.carregar_jogo_antigo()
+        try:
+            data = snapshot.read(SAVE_FILE)
+            # Confere o save inteiro antes do reset, para um erro não apagar a partida atual
+            snapshot.check(self, data)
+        except (OSError, ValueError) as e:
+            print(f"Não foi possível carregar o jogo salvo: {e}")
+            return False
+        self.reset_game()
+        snapshot.restore(self, data)
+        self.state = "jogando"
+        print("Jogo carregado com sucesso.")
+        return True
+
+    def carregar_jogo_antigo(self):
+        """
+        Carrega um save no formato JSON antigo (só posições, pontuação e itens).
+
+        Retorna:
+            bool: True se o jogo foi carregado (o estado passa a ser 'jogando').
+        """
         try:
-            with open("../assets/save.json", "r") as arquivo:
+            with open(LEGACY_SAVE_FILE, "r") as arquivo:
                 save_data = json.load(arquivo)
 
+            self.reset_game()
             self.score = save_data["score"]
             self.lives = save_data["vidas"]
-            self.player.grid_pos = pygame.Vector2(save_data["player_pos"])
-            self.player.pixel_pos = pygame.Vector2(
-                self.player.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-                self.player.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-            )
+            self.player.place(*save_data["player_pos"])
             self.player.invincibility_timer = save_data["invincibility_timer"]
-            self.level.matrix = save_data["mapa"]
+            if "pellets_comidos" in save_data:
+                for line, column in save_data["pellets_comidos"]:
+                    self.level.eat(line, column)
+            else:
+                # Save antigo, com a matriz inteira
+                self.level.restore(save_data["mapa"])
             
             for ghost in save_data["ghosts_pos"]:
                 if self.ghost_queue:
-                    self.enemies.append(self.ghost_queue.popleft())
-            print(self.enemies)
+                    self.release_enemy()
             
             for i, enemy in enumerate(self.enemies):
-                enemy.grid_pos.x = save_data["ghosts_pos"][i][0]
-                enemy.grid_pos.y = save_data["ghosts_pos"][i][1]
-                enemy.pixel_pos = pygame.Vector2(
-                    enemy.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-                    enemy.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-                )
+                enemy.place(*save_data["ghosts_pos"][i])
+                self.spatial.update(enemy)
 
             self.state = "jogando"
             print("Jogo carregado com sucesso.")
+            return True
 
         except FileNotFoundError:
             print("Nenhum jogo salvo encontrado.")
+            return False
 
 
 
@@ -623,33 +842,81 @@ class Game:
 
 #loop principal
     def run(self):
+        if self.headless:
+            self.run_headless()
+            return
+
+        # Loop de passo fixo: a simulação avança em ticks de 1 / FPS segundos, não importa
+        # quantos quadros por segundo a máquina consiga desenhar.
+        tick_ms = 1000 / FPS
+        accumulator = 0.0
+        profiler = self.profiler
+
         while self.running:
+            # Tempo real desde o último quadro (limitado para não "disparar" após um travamento longo).
+            # Só a partida desenha sem limite (MAX_RENDER_FPS): menus, pausa e telas finais são
+            # estáticos e ficam em FPS, para não ocupar um núcleo inteiro redesenhando a mesma tela.
+            max_fps = MAX_RENDER_FPS if self.state == 'jogando' else FPS
+            accumulator += min(self.clock.tick(max_fps), MAX_CATCHUP_TICKS * tick_ms)
+
             if self.state == 'menu_principal':
-                self.menu_principal_events()
-                self.menu_principal_draw()
+                with profiler.section('events'):
+                    self.menu_principal_events()
+                with profiler.section('ui'):
+                    self.menu_principal_draw()
             
             elif self.state == 'jogando':
-                self.playing_events()
-                self.playing_update()
-                self.playing_draw()
+                with profiler.section('events'):
+                    self.playing_events()
+                # Se o quadro atrasou, roda quantos ticks forem necessários para alcançar o relógio
+                while accumulator >= tick_ms and self.state == 'jogando':
+                    self.playing_update()
+                    profiler.count('ticks')
+                    accumulator -= tick_ms
+                if self.state == 'jogando':
+                    self.playing_draw(accumulator / tick_ms)
            
             elif self.state == 'pausado':
-                self.pausado_events()
-                self.pausado_draw()
+                with profiler.section('events'):
+                    self.pausado_events()
+                with profiler.section('ui'):
+                    self.pausado_draw()
 
             elif self.state == 'game_over':
-                self.game_over_events()
-                self.game_over_draw()
+                with profiler.section('events'):
+                    self.game_over_events()
+                with profiler.section('ui'):
+                    self.game_over_draw()
 
             elif self.state == 'vitoria_fase':
-                 self.vitoria_fase_events()
-                 self.vitoria_fase_draw()
+                with profiler.section('events'):
+                    self.vitoria_fase_events()
+                with profiler.section('ui'):
+                    self.vitoria_fase_draw()
 
             elif self.state == 'exibindo_ranking':
-                 self.ranking_events()
-                 self.ranking_draw()
-
-            self.clock.tick(FPS)
+                with profiler.section('events'):
+                    self.ranking_events()
+                with profiler.section('ui'):
+                    self.ranking_draw()
+
+            # Fora da partida não há simulação: o tempo acumulado é descartado
+            if self.state != 'jogando':
+                accumulator = 0.0
+                # A partida acabou (ou voltou ao menu): fecha o replay
+                if self.state != 'pausado':
+                    self.finish_recording()
+
+            profiler.take_counters(self.level.navigation.counters)
+            profiler.take_counters(self.ai.counters)
+            if self.path_service is not None:
+                profiler.take_counters(self.path_service.counters)
+            profiler.end_frame(self.state)
+
+        self.finish_recording()
+        if self.path_service is not None:
+            self.path_service.close()
+        profiler.stop_trace()
 
 
 
@@ -0,0 +1,201 @@
+#Fantasmas em arrays: o estado de todos os fantasmas em vetores contíguos, atualizados em lote.
+
+# src/ghost_store.py
+
+from settings import *
+from enemy import Enemy
+
+try:
+    import numpy as np  # Opcional: sem NumPy o jogo usa um objeto Enemy comum por fantasma
+except ImportError:
+    np = None
+
+AVAILABLE = np is not None
+
+# Campos guardados nos arrays (o resto do estado do fantasma continua no objeto)
+FLOAT_FIELDS = ('pixel_x', 'pixel_y', 'previous_x', 'previous_y', 'direction_x', 'direction_y', 'speed')
+INT_FIELDS = ('grid_x', 'grid_y', 'target_x', 'target_y', 'pathfinding_cooldown')
+BOOL_FIELDS = ('has_target', 'scared')
+
+
+def _field(name, convert):
+    """ Propriedade que lê e grava a posição 'slot' do array 'name' da GhostStore. """
+    def get(self):
+        return convert(getattr(self.store, name)[self.slot])
+
+    def set(self, value):
+        getattr(self.store, name)[self.slot] = value
+    return property(get, set)
+
+
+class StoredEnemy(Enemy):
+    """
+    Fantasma cujo estado de movimento mora nos arrays de uma GhostStore.
+
+    É um Enemy completo (recalculate_path, set_next_node, draw, reset...): só os
+    campos de FLOAT_FIELDS, INT_FIELDS e BOOL_FIELDS viram propriedades que leem
+    e gravam a posição 'slot' dos arrays, devolvendo float/int/bool do Python.
+    """
+
+    __slots__ = ('store', 'slot')
+
+    def __init__(self, store, slot, game, pos, image, cooldown_sec):
+        self.store = store
+        self.slot = slot
+        super().__init__(game, pos, image, cooldown_sec)
+
+
+for _name in FLOAT_FIELDS:
+    setattr(StoredEnemy, _name, _field(_name, float))
+for _name in INT_FIELDS:
+    setattr(StoredEnemy, _name, _field(_name, int))
+for _name in BOOL_FIELDS:
+    setattr(StoredEnemy, _name, _field(_name, bool))
+
+
+class GhostStore:
+    """
+    Struct-of-arrays com o estado de movimento de todos os fantasmas da partida.
+
+    Posições, direções, velocidades, alvos, cooldowns e o estado assustado ficam em
+    arrays NumPy contíguos (um elemento por fantasma), e o tick dos fantasmas vira
+    algumas operações sobre os arrays inteiros em vez de um laço em Python. Só o que
+    é raro continua por fantasma: o replanejamento (quando o cooldown zera) e a
+    escolha do próximo nó (ao chegar em uma célula).
+
+    O resto do jogo enxerga os fantasmas pelas StoredEnemy, que se comportam como Enemy.
+    """
+
+    def __init__(self, capacity=16):
+        self.ghosts = []  # StoredEnemy de cada posição dos arrays
+        self._capacity = capacity
+        for name in FLOAT_FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        for name in INT_FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=np.int64))
+        for name in BOOL_FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=bool))
+        self._active = None  # Lista de fantasmas ativos para a qual _slots foi calculado
+        self._active_count = 0
+        self._slots = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ghosts)
+
+    def create(self, game, pos, image, cooldown_sec):
+        """
+        Cria um fantasma na próxima posição livre dos arrays.
+
+        Retorna:
+            StoredEnemy: O fantasma (use como um Enemy).
+        """
+        slot = len(self.ghosts)
+        if slot == self._capacity:
+            self._capacity *= 2
+            for name in FLOAT_FIELDS + INT_FIELDS + BOOL_FIELDS:
+                array = getattr(self, name)
+                grown = np.zeros(self._capacity, dtype=array.dtype)
+                grown[:slot] = array
+                setattr(self, name, grown)
+        ghost = StoredEnemy(self, slot, game, pos, image, cooldown_sec)
+        self.ghosts.append(ghost)
+        return ghost
+
+    def clear(self):
+        """ Esquece todos os fantasmas (os arrays são reaproveitados). """
+        self.ghosts.clear()
+        self._active = None
+
+    def active_slots(self, enemies):
+        """ Posições nos arrays dos fantasmas ativos, na ordem da lista (refeito só quando ela muda). """
+        if enemies is not self._active or len(enemies) != self._active_count:
+            self._active = enemies
+            self._active_count = len(enemies)
+            self._slots = np.fromiter((ghost.slot for ghost in enemies), dtype=np.int64, count=len(enemies))
+        return self._slots
+
+    def _buckets(self, spatial, slots):
+        """ Balde do índice espacial de cada fantasma (a mesma conta de SpatialHash.bucket_of). """
+        return np.stack((np.floor_divide(self.pixel_x[slots], spatial.cell_size),
+                         np.floor_divide(self.pixel_y[slots], spatial.cell_size)), axis=1)
+
+    # =========================================================================
+    # TICK EM LOTE
+    # =========================================================================
+
+    def remember_positions(self, enemies):
+        """ Guarda a posição atual de todos os fantasmas ativos (interpolação do desenho). """
+        slots = self.active_slots(enemies)
+        self.previous_x[slots] = self.pixel_x[slots]
+        self.previous_y[slots] = self.pixel_y[slots]
+
+    def update(self, game):
+        """
+        Faz o tick de todos os fantasmas ativos, com o mesmo resultado de chamar
+        Enemy.update em cada um, na ordem da lista.
+
+        A diferença é só de ordem: todos os replanejamentos do tick são pedidos antes
+        de qualquer fantasma andar (na tabela completa dos mapas pequenos isso não
+        muda nada; nos grandes muda só a ordem em que as buscas gastam o orçamento).
+        """
+        enemies = game.enemies
+        if not enemies:
+            return
+        slots = self.active_slots(enemies)
+        buckets = self._buckets(game.spatial, slots)
+
+        # 1. Cooldown da IA: quem zerou pede um novo caminho (por fantasma, é raro)
+        cooldown = self.pathfinding_cooldown[slots]
+        cooldown[cooldown > 0] -= 1
+        self.pathfinding_cooldown[slots] = cooldown
+        for index in np.flatnonzero(cooldown == 0):
+            game.ai.request(enemies[index])
+
+        # 2. Movimento rumo ao nó alvo (as mesmas contas de Enemy.move_towards_target)
+        moving = np.flatnonzero(self.has_target[slots])
+        if len(moving):
+            ghost_slots = slots[moving]
+            target_x = self.target_x[ghost_slots] * GRID_SIZE + GRID_SIZE // 2
+            target_y = self.target_y[ghost_slots] * GRID_SIZE + GRID_SIZE // 2
+            dx = target_x - self.pixel_x[ghost_slots]
+            dy = target_y - self.pixel_y[ghost_slots]
+            length = np.sqrt(dx * dx + dy * dy)
+            speed = self.speed[ghost_slots]
+            arrive = length < speed
+
+            walk = ~arrive
+            walking = ghost_slots[walk]
+            direction_x = dx[walk] / length[walk]
+            direction_y = dy[walk] / length[walk]
+            pixel_x = self.pixel_x[walking] + direction_x * speed[walk]
+            pixel_y = self.pixel_y[walking] + direction_y * speed[walk]
+            self.direction_x[walking] = direction_x
+            self.direction_y[walking] = direction_y
+            self.pixel_x[walking] = pixel_x
+            self.pixel_y[walking] = pixel_y
+            # A célula só muda perto do centro dela (veja Entity.is_on_grid_center)
+            center = ((np.abs(pixel_x % GRID_SIZE - GRID_SIZE // 2) < speed[walk]) &
+                      (np.abs(pixel_y % GRID_SIZE - GRID_SIZE // 2) < speed[walk]))
+            centered = walking[center]
+            self.grid_x[centered] = np.trunc(pixel_x[center] / GRID_SIZE)
+            self.grid_y[centered] = np.trunc(pixel_y[center] / GRID_SIZE)
+
+            # Quem chegou trava no centro do nó e escolhe o próximo (por fantasma, uma vez por célula)
+            arrived = ghost_slots[arrive]
+            self.direction_x[arrived] = dx[arrive]
+            self.direction_y[arrived] = dy[arrive]
+            self.pixel_x[arrived] = target_x[arrive]
+            self.pixel_y[arrived] = target_y[arrive]
+            for index in moving[arrive]:
+                ghost = enemies[index]
+                if GHOST_REPLAN_EVERY_TILE:
+                    game.ai.request(ghost)
+                ghost.set_next_node((ghost.target_x, ghost.target_y))
+
+        # 3. Índice espacial: só os fantasmas que trocaram de balde neste tick
+        changed = np.flatnonzero((self._buckets(game.spatial, slots) != buckets).any(axis=1))
+        for index in changed:
+            game.spatial.update(enemies[index])
+
+        # 4. Estado assustado
+        self.scared[slots] = game.player.invincibility_timer > 0
@@ -2,31 +2,92 @@
 # src/level.py
 
 import pygame
+from collections import deque, OrderedDict
 from settings import *
+from pathfinding import NavigationTable
+import map_compiler
+
+try:
+    import numpy as np  # Opcional: só é usado em Level.as_array
+except ImportError:
+    np = None
+
+# Direções de movimento no grid (dx, dy) e o bit de cada uma na máscara de saídas
+GRID_DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+DIRECTION_BITS = {direction: 1 << bit for bit, direction in enumerate(GRID_DIRECTIONS)}
+
+
+def _tile_table(tiles):
+    """ Cria uma tabela de 256 posições: 1 para os códigos dos caracteres informados. """
+    table = bytearray(256)
+    for tile in tiles:
+        table[ord(tile)] = 1
+    return bytes(table)
+
+
+# Tabelas de classificação dos tiles, indexadas pelo código (byte) do caractere
+WALL_TILES = _tile_table('#')
+OPEN_TILES = bytes(1 - is_wall for is_wall in WALL_TILES)  # Tudo que não é parede (inclui a porta '-')
+WALKABLE_TILES = _tile_table(' .oPGABNMXY')
+PELLET_TILES = _tile_table('.o')
+PORTAL_TILES = _tile_table('ABNMXY')
+EMPTY_TILE_CODE = ord(' ')
 
 
 class Level:
     """
     Representa o mapa do jogo, gerenciando tanto os dados (matriz) quanto
     sua representação visual na tela.
+
+    O mapa fica guardado em um bytearray contínuo (um byte por célula, linha a
+    linha), e a classificação dos tiles é feita por tabelas de consulta.
     """
 
-    def __init__(self, map_file_path):
+    def __init__(self, map_file_path, use_cache=MAP_CACHE_ENABLED):
         """
         Inicializa o mapa a partir de um arquivo txt.
+
+        Parametros:
+            map_file_path (str): Caminho do mapa (.txt).
+            use_cache (bool): Usa a versão compilada do mapa (veja map_compiler.py),
+                criando-a no primeiro carregamento ou quando o .txt mudar.
         """
-        self.matrix = []
-        self.load(map_file_path)
-        self.original_matrix = [list(row) for row in self.matrix]
-        self.height = len(self.matrix)
-        # Verifica se existe ao menos uma linha na matriz antes de tentar acessa-la
-        self.width = len(self.matrix[0]) if self.height > 0 else 0
-        self.tunnels = {}
-        self._find_tunnels() # Chama o metodo para popular o dicionário
+        self.grid = bytearray()
+        self.width = 0
+        self.height = 0
+        # Índice dos itens coletáveis (células com '.' e 'o') e das células alteradas
+        self.pellets = set()
+        self.power_ups = set()
         self.total_pellets = 0
-        self._count_pellets()
+        self.changed = {}  # célula -> código original, para o reset custar O(itens comidos)
+        self._item_cells = None  # Células com item no mapa original (ordem dos bits do snapshot)
+        self.item_bitmap = None  # 1 bit por item do mapa original (veja pellet_bitmap)
+        self._symbol_cache = {}
+        self.tunnels = {}
+
+        compiled = map_compiler.load(map_file_path) if use_cache else None
+        if compiled is not None:
+            self._load_compiled(compiled)
+        else:
+            self.load(map_file_path)
+            self._find_tunnels() # Chama o metodo para popular o dicionário
+            self._count_pellets()
+            # Grafo de navegação (células caminháveis, vizinhos e túneis), compilado uma vez
+            self._build_graph()
+            # Tabela de caminhos dos fantasmas (as paredes não mudam, então é calculada uma vez)
+            self.navigation = NavigationTable(self)
+            if use_cache:
+                try:
+                    map_compiler.save(self, map_file_path)
+                except OSError as e:
+                    print(f"Não foi possível salvar o mapa compilado: {e}")
+
+        # Cópia imutável do mapa original, usada para o reset
+        self.original_grid = bytes(self.grid)
         #: Guarda o número inicial de pellets para o reset
         self.initial_pellet_count = self.total_pellets
+        # Blocos do labirinto pré-desenhados (criados quando aparecem na tela), em cache LRU
+        self.chunks = OrderedDict()
 
 
 
@@ -34,37 +95,234 @@ class Level:
     # MÉTODOS DE LÓGICA E DADOS
     # =========================================================================
 
+    def _load_compiled(self, compiled):
+        """
+        Preenche o mapa a partir da versão compilada, sem varrer nem analisar o texto.
+
+        Parametros:
+            compiled (map_compiler.CompiledMap): Mapa compilado (aberto com mmap).
+        """
+        self.width, self.height = compiled.width, compiled.height
+        # O grid é alterado durante o jogo, então é a única tabela copiada do arquivo
+        self.grid = bytearray(compiled.grid)
+
+        for cell, dest_cell in compiled.portals:
+            self.tunnels[divmod(cell, self.width)] = divmod(dest_cell, self.width)
+        for symbol, cells in compiled.spawns.items():
+            self._symbol_cache[ord(symbol)] = cells
+        self.pellets = set(compiled.pellets)
+        self.power_ups = set(compiled.power_ups)
+        self.total_pellets = len(self.pellets) + len(self.power_ups)
+        print(f"Túneis carregados: {self.tunnels}")
+        print(f"Mapa compilado carregado com {self.total_pellets} itens coletáveis.")
+
+        self._build_graph(compiled.exits)
+        self.navigation = NavigationTable(self, compiled.navigation)
+        # Mantém o arquivo mapeado aberto enquanto as tabelas de navegação o usarem
+        self.compiled = compiled
+
     def load(self, map_file_path):
         """
-        Carrega o mapa do arquivo e transforma em uma matriz 2D de caracteres.
+        Carrega o mapa do arquivo para o grid compacto (um byte por célula).
 
         Parametros:
             map_file_path (str): Caminho para o arquivo de texto com o layout do mapa.
         """
         with open(map_file_path, 'r') as map_file:
-            for line in map_file:
-                # Usar list() para transformar a string em uma lista de caracteres
-                self.matrix.append(list(line.strip()))
+            rows = [line.strip() for line in map_file]
+        self.load_matrix(rows)
+
+    def load_matrix(self, rows):
+        """
+        Substitui o conteúdo do grid por uma lista de linhas (strings ou listas de caracteres).
+
+        Linhas menores que a primeira são completadas com parede.
+        """
+        self.height = len(rows)
+        # Verifica se existe ao menos uma linha antes de tentar acessa-la
+        self.width = len(rows[0]) if self.height > 0 else 0
+        grid = bytearray()
+        for row in rows:
+            row = ''.join(row)[:self.width].ljust(self.width, '#')
+            grid += row.encode('latin-1')
+        # Mantém o mesmo objeto, para que visões já criadas (as_array) continuem válidas
+        if len(grid) == len(self.grid):
+            self.grid[:] = grid
+        else:
+            self.grid = grid
+
+    @property
+    def matrix(self):
+        """
+        Cópia do mapa como lista de listas de caracteres (formato antigo, usado no save).
+        """
+        return [list(self.grid[line * self.width:(line + 1) * self.width].decode('latin-1'))
+                for line in range(self.height)]
+
+    def as_array(self):
+        """
+        Retorna o grid como um array NumPy uint8 (altura x largura) que compartilha a memória.
+
+        Retorna:
+            numpy.ndarray: Visão do grid, ou None se o NumPy não estiver instalado.
+        """
+        if np is None:
+            return None
+        return np.frombuffer(self.grid, dtype=np.uint8).reshape(self.height, self.width)
 
         # metodo para resetar o mapa
     def reset(self):
-            """ Restaura o mapa ao seu estado original, com todos os pontinhos. """
-            self.matrix = [list(row) for row in self.original_matrix]
+            """
+            Restaura o mapa ao seu estado original, com todos os pontinhos.
+
+            Apenas as células alteradas desde o último reset são restauradas.
+            """
+            for cell, original_code in self.changed.items():
+                self._write_cell(cell, original_code)
+            self.changed.clear()
             print("Mapa resetado com todos os pontinhos.")
-
-            self.total_pellets = self.initial_pellet_count
             print("Mapa e contador de pellets resetados.")
 
+    def restore(self, rows):
+        """
+        Carrega um mapa completo salvo (lista de linhas) e reconstrói os índices.
+
+        Usado para saves antigos, que guardavam a matriz inteira.
+        """
+        self.load_matrix(rows)
+        self.changed = {cell: original_code for cell, original_code in enumerate(self.original_grid)
+                        if self.grid[cell] != original_code}
+        self._symbol_cache.clear()
+        self._count_pellets()
+        self.invalidate_background()
+        self.item_bitmap = self._item_cells = None  # Refeito no próximo snapshot
+
+    def eaten_cells(self):
+        """
+        Retorna as células (linha, coluna) cujo item já foi comido, para o save.
+        """
+        return [divmod(cell, self.width) for cell, original_code in self.changed.items()
+                if PELLET_TILES[original_code] and not PELLET_TILES[self.grid[cell]]]
+
+    def _item_index(self):
+        """
+        Células que tinham item no mapa original e a posição de cada uma no bitmap.
+
+        Criado no primeiro snapshot; a partir daí o bitmap (self.item_bitmap) é mantido
+        por _write_cell a cada item comido ou restaurado.
+
+        Retorna:
+            tuple(list[int], dict): Células em ordem e célula -> bit.
+        """
+        if self._item_cells is None:
+            grid = self.original_grid
+            cells = sorted([*self._scan(ord('.'), grid), *self._scan(ord('o'), grid)])
+            bits = {cell: bit for bit, cell in enumerate(cells)}
+            bitmap = bytearray(b'\xff' * (len(cells) // 8))
+            if len(cells) % 8:
+                bitmap.append((1 << len(cells) % 8) - 1)
+            # Apaga os itens já comidos (só as células alteradas podem ter perdido o item)
+            for cell, original_code in self.changed.items():
+                if PELLET_TILES[original_code] and not PELLET_TILES[self.grid[cell]]:
+                    bitmap[bits[cell] >> 3] &= ~(1 << (bits[cell] & 7))
+            self._item_cells = (cells, bits)
+            self.item_bitmap = bitmap
+        return self._item_cells
+
+    def pellet_bitmap(self):
+        """
+        Estado dos itens como bitmap (1 bit por item do mapa original, 1 = ainda no mapa).
+
+        O bitmap é mantido a cada alteração do mapa, então aqui é só uma cópia.
+        """
+        self._item_index()
+        return bytes(self.item_bitmap)
+
+    def pellet_bitmap_size(self):
+        """ Tamanho em bytes do bitmap de pellet_bitmap (sem copiá-lo). """
+        self._item_index()
+        return len(self.item_bitmap)
+
+    def load_pellet_bitmap(self, bitmap):
+        """
+        Aplica um bitmap de pellet_bitmap, reescrevendo só as células que mudaram.
+
+        Parametros:
+            bitmap (bytes): Bitmap gerado por pellet_bitmap para este mesmo mapa.
+        """
+        cells, _ = self._item_index()
+        current = self.item_bitmap
+        if len(bitmap) != len(current):
+            raise ValueError("O bitmap de itens não corresponde a este mapa.")
+        changes = []
+        # Compara em blocos (em C) e só desce aos bits onde há diferença
+        for start in range(0, len(current), 64):
+            if bitmap[start:start + 64] == current[start:start + 64]:
+                continue
+            for index in range(start, min(start + 64, len(current))):
+                different = current[index] ^ bitmap[index]
+                while different:
+                    low = different & -different
+                    changes.append((cells[index * 8 + low.bit_length() - 1], bitmap[index] & low))
+                    different ^= low
+
+        for cell, present in changes:
+            line, column = divmod(cell, self.width)
+            self.set_tile(line, column, chr(self.original_grid[cell]) if present else ' ')
 
     # Novo metodo para contar os itens no início
     def _count_pellets(self):
-        """ Conta o número total de pontinhos e power-ups no mapa. """
-        for row in self.matrix:
-            for tile in row:
-                if tile == '.' or tile == 'o':
-                    self.total_pellets += 1
+        """ Monta o índice dos pontinhos e power-ups (uma varredura, só no carregamento). """
+        self.pellets = set(self._scan(ord('.')))
+        self.power_ups = set(self._scan(ord('o')))
+        self.total_pellets = len(self.pellets) + len(self.power_ups)
         print(f"Mapa carregado com {self.total_pellets} itens coletáveis.")
 
+    def _scan(self, code, grid=None):
+        """ Percorre o grid (em C, via bytearray.find) devolvendo as células com o código. """
+        grid = self.grid if grid is None else grid
+        index = grid.find(code)
+        while index != -1:
+            yield index
+            index = grid.find(code, index + 1)
+
+    def _write_cell(self, cell, code):
+        """
+        Escreve um código no grid mantendo o índice de itens, o cache de símbolos
+        e a superfície pré-desenhada atualizados.
+        """
+        old_code = self.grid[cell]
+        if old_code == code:
+            return
+        if old_code == ord('.'):
+            self.pellets.discard(cell)
+        elif old_code == ord('o'):
+            self.power_ups.discard(cell)
+        if code == ord('.'):
+            self.pellets.add(cell)
+        elif code == ord('o'):
+            self.power_ups.add(cell)
+        self.total_pellets = len(self.pellets) + len(self.power_ups)
+        if self.item_bitmap is not None:
+            bit = self._item_cells[1].get(cell)
+            if bit is not None:
+                if PELLET_TILES[code]:
+                    self.item_bitmap[bit >> 3] |= 1 << (bit & 7)
+                else:
+                    self.item_bitmap[bit >> 3] &= ~(1 << (bit & 7))
+
+        self._symbol_cache.pop(old_code, None)
+        self._symbol_cache.pop(code, None)
+        self.grid[cell] = code
+        if OPEN_TILES[code] != OPEN_TILES[old_code]:
+            self._update_walkable(cell)
+        # Redesenha apenas a célula alterada, se o bloco dela estiver em cache
+        if self.chunks:
+            line, column = divmod(cell, self.width)
+            chunk = self.chunks.get((column // CHUNK_CELLS, line // CHUNK_CELLS))
+            if chunk is not None:
+                origin = (column // CHUNK_CELLS * CHUNK_CELLS * GRID_SIZE, line // CHUNK_CELLS * CHUNK_CELLS * GRID_SIZE)
+                self._draw_tile(chunk, line, column, chr(code), origin)
 
     def get_tile(self, line, column):
         """
@@ -78,7 +336,7 @@ class Level:
             str: Caractere presente na posicao ou '#' se estiver fora do mapa.
         """
         if (0 <= line < self.height) and (0 <= column < self.width):
-            return self.matrix[line][column]
+            return chr(self.grid[line * self.width + column])
         return '#'  # Retorna parede se estiver fora dos limites
 
     def set_tile(self, line, column, new_tile):
@@ -91,7 +349,25 @@ class Level:
             new (str): Novo caractere a ser colocado na posicao.
         """
         if 0 <= line < self.height and 0 <= column < self.width:
-            self.matrix[line][column] = new_tile
+            cell = line * self.width + column
+            # Guarda o valor original da célula para o reset incremental
+            original_code = self.changed.setdefault(cell, self.grid[cell])
+            self._write_cell(cell, ord(new_tile))
+            if original_code == self.grid[cell]:
+                del self.changed[cell]
+
+    def eat(self, line, column):
+        """
+        Remove o item coletável da posição, se houver.
+
+        Retorna:
+            str: O item comido ('.' ou 'o'), ou None se a célula não tinha item.
+        """
+        tile = self.get_tile(line, column)
+        if tile == '.' or tile == 'o':
+            self.set_tile(line, column, ' ')
+            return tile
+        return None
 
     def is_wall(self, line, column):
         """
@@ -104,7 +380,9 @@ class Level:
         Retorna:
             bool: True se for parede ('#'), False caso contrario.
         """
-        return self.get_tile(line, column) == '#'
+        if (0 <= line < self.height) and (0 <= column < self.width):
+            return WALL_TILES[self.grid[line * self.width + column]] == 1
+        return True  # Fora dos limites conta como parede
 
     def is_path(self, line, column):
         """
@@ -117,7 +395,142 @@ class Level:
         Retorna:
             bool: True se for uma celula que o jogador possa passar (ex: '.', ' ', 'o').
         """
-        return self.get_tile(line, column) in [' ', '.', 'o', 'P', 'G', 'A', 'B', 'N', 'M', 'X', 'Y']
+        if (0 <= line < self.height) and (0 <= column < self.width):
+            return WALKABLE_TILES[self.grid[line * self.width + column]] == 1
+        return False
+
+    def is_pellet(self, line, column):
+        """ Verifica se há um pontinho ou power-up na posição. """
+        if (0 <= line < self.height) and (0 <= column < self.width):
+            return PELLET_TILES[self.grid[line * self.width + column]] == 1
+        return False
+
+    def is_portal(self, line, column):
+        """ Verifica se a posição é a entrada de um túnel. """
+        if (0 <= line < self.height) and (0 <= column < self.width):
+            return PORTAL_TILES[self.grid[line * self.width + column]] == 1
+        return False
+
+    def cell_id(self, line, column):
+        """ Converte (linha, coluna) no índice da célula usado pelo grafo. """
+        return line * self.width + column
+
+    def _build_graph(self, exits=None):
+        """
+        Compila o grafo de navegação do mapa.
+
+        Cada célula recebe uma máscara de bits com as direções livres (usada nas
+        verificações de movimento e para listar os vizinhos), e os portais dos
+        túneis viram arestas diretas entre si.
+
+        As máscaras são calculadas para o grid inteiro de uma vez: para cada direção,
+        o grid de células caminháveis é deslocado e combinado com ele mesmo com um
+        AND byte a byte (feito em C, com inteiros grandes), então mesmo mapas de
+        milhões de células compilam em milissegundos.
+
+        Parametros:
+            exits (bytes): Máscaras já calculadas (vindas do mapa compilado).
+        """
+        # Classificação de todas as células de uma vez, pela tabela de consulta (1 = caminhável)
+        walkable = self.grid.translate(OPEN_TILES)
+        self.walkable = bytearray(walkable)
+
+        if exits is not None:
+            self.exits = bytearray(exits)
+        else:
+            self.exits = self._compute_exits(walkable)
+
+        # Deslocamento (no índice da célula) de cada vizinho, para cada máscara de saídas
+        self._exit_offsets = [tuple(direction[1] * self.width + direction[0] for direction in GRID_DIRECTIONS
+                                    if mask & DIRECTION_BITS[direction]) for mask in range(16)]
+
+        # Os túneis viram arestas diretas entre os dois portais
+        self.tunnel_edges = {self.cell_id(line, column): self.cell_id(dest_line, dest_column)
+                             for (line, column), (dest_line, dest_column) in self.tunnels.items()}
+
+    def _compute_exits(self, walkable):
+        """ Máscara de direções livres de todas as células (veja _build_graph). """
+        size = self.width * self.height
+        # Colunas que têm vizinho à direita / à esquerda (o deslocamento não pode "dar a volta" na linha)
+        has_right = (b'\x01' * (self.width - 1) + b'\x00') * self.height
+        has_left = (b'\x00' + b'\x01' * (self.width - 1)) * self.height
+
+        exits = 0
+        walkable_bits = int.from_bytes(walkable, 'big')
+        for direction in GRID_DIRECTIONS:
+            offset = direction[1] * self.width + direction[0]
+            # neighbours[i] = walkable[i + offset] (fora do mapa conta como parede)
+            if offset > 0:
+                neighbours = walkable[offset:] + bytes(offset)
+            else:
+                neighbours = bytes(-offset) + walkable[:size + offset]
+            bits = walkable_bits & int.from_bytes(neighbours, 'big')
+            if direction[0] == 1:
+                bits &= int.from_bytes(has_right, 'big')
+            elif direction[0] == -1:
+                bits &= int.from_bytes(has_left, 'big')
+            # Cada byte vale 0 ou 1: o deslocamento leva o 1 para o bit da direção, sem vazar
+            exits |= bits << (DIRECTION_BITS[direction].bit_length() - 1)
+        return bytearray(exits.to_bytes(size, 'big'))
+
+    def _cell_exits(self, line, column):
+        """ Máscara de direções livres de uma única célula (veja _compute_exits). """
+        if not self.walkable[line * self.width + column]:
+            return 0
+        mask = 0
+        for direction in GRID_DIRECTIONS:
+            neighbour_line, neighbour_column = line + direction[1], column + direction[0]
+            if (0 <= neighbour_line < self.height and 0 <= neighbour_column < self.width
+                    and self.walkable[neighbour_line * self.width + neighbour_column]):
+                mask |= DIRECTION_BITS[direction]
+        return mask
+
+    def _update_walkable(self, cell):
+        """
+        Atualiza o grafo quando uma célula vira parede ou deixa de ser (ex: a porta da
+        casa dos fantasmas ou uma parede destrutível).
+
+        Só mudam as máscaras da célula e das quatro vizinhas; a NavigationTable é
+        avisada e os campos de distância se consertam aos poucos, sem nova busca.
+        """
+        old_neighbours = self.neighbours(cell) if self.walkable[cell] else []
+        self.walkable[cell] = OPEN_TILES[self.grid[cell]]
+        line, column = divmod(cell, self.width)
+        for direction in [(0, 0)] + GRID_DIRECTIONS:
+            neighbour_line, neighbour_column = line + direction[1], column + direction[0]
+            if 0 <= neighbour_line < self.height and 0 <= neighbour_column < self.width:
+                self.exits[neighbour_line * self.width + neighbour_column] = \
+                    self._cell_exits(neighbour_line, neighbour_column)
+        self.navigation.cell_changed(cell, old_neighbours)
+
+    def neighbours(self, cell):
+        """
+        Vizinhos de uma célula no grafo de navegação.
+
+        Retorna:
+            list[tuple(int, int)]: Pares (célula vizinha, custo), incluindo o outro lado do túnel.
+        """
+        result = [(cell + offset, 1) for offset in self._exit_offsets[self.exits[cell]]]
+        tunnel = self.tunnel_edges.get(cell)
+        if tunnel is not None:
+            result.append((tunnel, TUNNEL_EDGE_COST))
+        return result
+
+    def can_move(self, line, column, direction):
+        """
+        Verifica no grafo se é possível sair da célula na direção indicada.
+
+        Parametros:
+            line (int): Indice da linha.
+            column (int): Indice da coluna.
+            direction (tuple(int, int)): Direção (dx, dy).
+
+        Retorna:
+            bool: True se a célula vizinha naquela direção for caminhável.
+        """
+        if not (0 <= line < self.height and 0 <= column < self.width):
+            return False
+        return bool(self.exits[line * self.width + column] & DIRECTION_BITS.get(direction, 0))
 
     def _find_tunnels(self):
         """
@@ -153,32 +566,133 @@ class Level:
         Retorna:
             list[tuple(int, int)]: Lista de tuplas com coordenadas (linha, coluna).
         """
-        positions = []
-        for y, line in enumerate(self.matrix):
-            for x, tile in enumerate(line):
-                if tile == symbol:
-                    positions.append((y, x))
-        return positions
+        code = ord(symbol)
+        # Pontinhos e power-ups já estão indexados; os demais símbolos ficam em cache
+        if symbol == '.' or symbol == 'o':
+            cells = sorted(self.pellets if symbol == '.' else self.power_ups)
+        else:
+            cells = self._symbol_cache.get(code)
+            if cells is None:
+                cells = self._symbol_cache[code] = list(self._scan(code))
+        return [divmod(cell, self.width) for cell in cells]
+
+    def nearest_pellet(self, line, column):
+        """
+        Encontra o item coletável mais próximo andando pelo labirinto (inclui túneis).
+
+        A busca para assim que encontra o primeiro item, então só percorre a
+        vizinhança necessária.
+
+        Retorna:
+            tuple(int, int): Posição (linha, coluna) do item, ou None se não houver.
+        """
+        if not (0 <= line < self.height and 0 <= column < self.width) or self.total_pellets == 0:
+            return None
+        start = self.cell_id(line, column)
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            if cell in self.pellets or cell in self.power_ups:
+                return divmod(cell, self.width)
+            for neighbour, _ in self.neighbours(cell):
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    queue.append(neighbour)
+        return None
+
+    def pellets_in_region(self, top, left, bottom, right):
+        """
+        Conta os itens coletáveis restantes no retângulo [top..bottom] x [left..right].
+        """
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self.height - 1), min(right, self.width - 1)
+        count = 0
+        for line in range(top, bottom + 1):
+            start = line * self.width
+            # translate classifica a fatia inteira da linha de uma vez
+            count += self.grid[start + left:start + right + 1].translate(PELLET_TILES).count(1)
+        return count
 
     # =========================================================================
     # METODO DE RENDERIZAÇÃO
     # =========================================================================
 
-    def draw(self, screen):
+    def invalidate_background(self):
+        """ Descarta os blocos pré-desenhados; eles serão refeitos no próximo draw. """
+        self.chunks.clear()
+
+    def _build_chunk(self, chunk_x, chunk_y):
+        """
+        Desenha paredes e pontinhos de um bloco de CHUNK_CELLS x CHUNK_CELLS células.
         """
-        Desenha o mapa na tela, com base nos caracteres da matriz.
+        first_line, first_column = chunk_y * CHUNK_CELLS, chunk_x * CHUNK_CELLS
+        last_line = min(first_line + CHUNK_CELLS, self.height)
+        last_column = min(first_column + CHUNK_CELLS, self.width)
+        # convert() deixa a superfície no formato da tela, o que acelera o blit
+        surface = pygame.Surface(((last_column - first_column) * GRID_SIZE,
+                                  (last_line - first_line) * GRID_SIZE)).convert()
+        surface.fill(BLACK)
+        origin = (first_column * GRID_SIZE, first_line * GRID_SIZE)
+        for line in range(first_line, last_line):
+            start = line * self.width
+            for column in range(first_column, last_column):
+                code = self.grid[start + column]
+                # Células vazias já estão pintadas de preto pelo fill
+                if code != EMPTY_TILE_CODE:
+                    self._draw_tile(surface, line, column, chr(code), origin)
+        return surface
+
+    def _get_chunk(self, chunk_x, chunk_y):
+        """ Retorna o bloco pré-desenhado, criando-o se ainda não estiver no cache (LRU). """
+        key = (chunk_x, chunk_y)
+        surface = self.chunks.get(key)
+        if surface is None:
+            surface = self.chunks[key] = self._build_chunk(chunk_x, chunk_y)
+            if len(self.chunks) > CHUNK_CACHE_SIZE:
+                self.chunks.popitem(last=False)  # Descarta o bloco usado há mais tempo
+        else:
+            self.chunks.move_to_end(key)
+        return surface
+
+    def _draw_tile(self, surface, line, column, tile, origin=(0, 0)):
         """
-        # Ajustamos self.data para self.matrix para usar a variável correta da classe
-        for row_index, row in enumerate(self.matrix):
-            for col_index, tile in enumerate(row):
-                x = col_index * GRID_SIZE
-                y = row_index * GRID_SIZE
+        Desenha (ou apaga) uma única célula na superfície indicada.
 
-                if tile == '#':  # Desenha uma parede
-                    pygame.draw.rect(screen, BLUE_WALL, (x, y, GRID_SIZE, GRID_SIZE))
-                elif tile == '.':  # Desenha um pontinho
-                    pygame.draw.circle(screen, YELLOW, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), 4)
-                elif tile == 'o':  # Desenha um super ponto (power-up)
-                    pygame.draw.circle(screen, WHITE, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), 8)
-                # Os símbolos 'P' e 'G' não são desenhados aqui,
-                # pois as entidades (Jogador, Fantasma) serão desenhadas por cima.
\ No newline at end of file
+        Parametros:
+            origin (tuple(int, int)): Posição, em pixels do mapa, do canto da superfície.
+        """
+        x = column * GRID_SIZE - origin[0]
+        y = line * GRID_SIZE - origin[1]
+        # Limpa a célula antes de desenhar, para que itens comidos desapareçam
+        pygame.draw.rect(surface, BLACK, (x, y, GRID_SIZE, GRID_SIZE))
+
+        if tile == '#':  # Desenha uma parede
+            pygame.draw.rect(surface, BLUE_WALL, (x, y, GRID_SIZE, GRID_SIZE))
+        elif tile == '.':  # Desenha um pontinho
+            pygame.draw.circle(surface, YELLOW, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), 4)
+        elif tile == 'o':  # Desenha um super ponto (power-up)
+            pygame.draw.circle(surface, WHITE, (x + GRID_SIZE // 2, y + GRID_SIZE // 2), 8)
+        # Os símbolos 'P' e 'G' não são desenhados aqui,
+        # pois as entidades (Jogador, Fantasma) serão desenhadas por cima.
+
+    def draw(self, screen, camera=None):
+        """
+        Desenha a parte visível do mapa copiando os blocos pré-renderizados.
+
+        Parametros:
+            camera (Camera): Área visível; sem câmera, desenha a partir do canto do mapa.
+        """
+        if camera is not None:
+            left, top = camera.x, camera.y
+            width, height = camera.width, camera.height
+        else:
+            left, top = 0, 0
+            width, height = screen.get_size()
+        chunk_pixels = CHUNK_CELLS * GRID_SIZE
+        last_chunk_x = min((left + width - 1) // chunk_pixels, (self.width - 1) // CHUNK_CELLS)
+        last_chunk_y = min((top + height - 1) // chunk_pixels, (self.height - 1) // CHUNK_CELLS)
+        for chunk_y in range(top // chunk_pixels, last_chunk_y + 1):
+            for chunk_x in range(left // chunk_pixels, last_chunk_x + 1):
+                screen.blit(self._get_chunk(chunk_x, chunk_y),
+                            (chunk_x * chunk_pixels - left, chunk_y * chunk_pixels - top))
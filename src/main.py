@@ -13,9 +13,9 @@ class Main:
     """
     Classe principal que inicializa e executa o jogo.
     """
-    def __init__(self):
-        # Cria uma instância da classe Game
-        self.game = Game()
+    def __init__(self, headless=False, trace_path=None, record_path=None):
+        # Cria uma instância da classe Game (headless = sem janela, para simulações)
+        self.game = Game(headless=headless, trace_path=trace_path, record_path=record_path)
 
     def run(self):
         # Chama o metodo que contém o loop principal do jogo
@@ -24,7 +24,12 @@ class Main:
 # O bloco de código que será executado quando você rodar "python src/main.py"
 if __name__ == '__main__':
     # Cria uma instância da classe Main
-    main = Main()
+    # "python src/main.py --headless" roda uma partida sem janela e sem limite de FPS
+    # "python src/main.py --trace arquivo.jsonl" grava o tempo de cada quadro para análise
+    # "python src/main.py --record partida.rpl" grava o replay da partida (confira com replay.py)
+    trace_path = sys.argv[sys.argv.index('--trace') + 1] if '--trace' in sys.argv[:-1] else None
+    record_path = sys.argv[sys.argv.index('--record') + 1] if '--record' in sys.argv[:-1] else None
+    main = Main(headless='--headless' in sys.argv, trace_path=trace_path, record_path=record_path)
     # Inicia a execução do jogo
     main.run()
 
@@ -0,0 +1,193 @@
+#Compilador de mapas: converte os .txt em um formato binário pronto para uso.
+
+# src/map_compiler.py
+#
+# Uso (de dentro da pasta src), para compilar um pacote de mapas de uma vez:
+#   python map_compiler.py ../assets/maps/*.txt
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from settings import *
+
+# Versão do formato: mudar o layout do arquivo invalida todos os mapas compilados
+FORMAT_VERSION = 1
+MAGIC = b'PMAP'
+
+# Cabeçalho: magic, versão, largura, altura, hash da fonte (sha1), flag de navegação,
+# quantidades (portais, jogador, fantasmas, pontinhos, power-ups, células de navegação)
+HEADER = struct.Struct('<4sHII20sB6I')
+
+# Símbolos dos pontos de nascimento guardados no arquivo
+SPAWN_SYMBOLS = ('P', 'G')
+
+
+class CompiledMap:
+    """
+    Mapa compilado aberto com mmap.
+
+    As tabelas grandes (grid, máscara de saídas e tabelas de navegação) são
+    memoryviews sobre o próprio arquivo mapeado: nada é lido até ser usado, e
+    o sistema operacional compartilha as páginas entre processos.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.mmap)
+        (magic, version, self.width, self.height, self.source_hash, has_navigation,
+         portals, players, ghosts, pellets, power_ups, nav_cells) = HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} não é um mapa compilado compatível.")
+
+        size = self.width * self.height
+        offset = HEADER.size
+        tables_offset = offset + 2 * size + padding(offset + 2 * size)
+        # Tamanho exato que o cabeçalho promete: um arquivo cortado ou com sobras é recompilado
+        int_count = portals * 2 + players + ghosts + pellets + power_ups
+        if has_navigation:
+            int_count += nav_cells + 2 * nav_cells * nav_cells
+        if len(view) != tables_offset + int_count * 4:
+            raise ValueError(f"{path} está incompleto ou corrompido.")
+
+        self.grid = view[offset:offset + size]
+        offset += size
+        self.exits = view[offset:offset + size]
+        # Daqui em diante todas as tabelas são de inteiros de 32 bits
+        ints = view[tables_offset:].cast('i')
+        position = 0
+
+        def take(count):
+            nonlocal position
+            values = ints[position:position + count]
+            if len(values) != count:
+                raise ValueError(f"{path} está incompleto ou corrompido.")
+            position += count
+            return values
+
+        pairs = take(portals * 2)
+        self.portals = [(pairs[i], pairs[i + 1]) for i in range(0, len(pairs), 2)]
+        self.spawns = {'P': list(take(players)), 'G': list(take(ghosts))}
+        self.pellets = take(pellets)
+        self.power_ups = take(power_ups)
+        self.navigation = None
+        if has_navigation:
+            cells = take(nav_cells)
+            # Uma linha de nav_cells inteiros por célula alvo
+            self.navigation = (cells, take(nav_cells * nav_cells), take(nav_cells * nav_cells))
+
+
+def padding(offset):
+    """ Bytes de enchimento para as tabelas de inteiros começarem alinhadas em 4 bytes. """
+    return -offset % 4
+
+
+def source_hash(map_file_path):
+    """
+    Hash do arquivo de texto junto com as configurações que mudam o resultado compilado
+    (MAP_CACHE_NAVIGATION inclusive: um mapa compilado sem as tabelas é recompilado
+    quando elas são ligadas, em vez de refazer as buscas a cada carregamento).
+    """
+    digest = hashlib.sha1()
+    with open(map_file_path, 'rb') as file:
+        digest.update(file.read())
+    digest.update(f"{FORMAT_VERSION}:{TUNNEL_EDGE_COST}:{NAV_TABLE_MAX_CELLS}:{MAP_CACHE_NAVIGATION}".encode())
+    return digest.digest()
+
+
+def compiled_path(map_file_path):
+    """
+    Caminho do arquivo compilado de um mapa, dentro de MAP_CACHE_FOLDER.
+
+    O nome leva um hash curto do caminho absoluto do .txt, para dois mapas com o
+    mesmo nome em pastas diferentes não sobrescreverem o cache um do outro.
+    """
+    name = os.path.splitext(os.path.basename(map_file_path))[0]
+    folder_hash = hashlib.sha1(os.path.abspath(map_file_path).encode()).hexdigest()[:8]
+    return os.path.join(MAP_CACHE_FOLDER, f"{name}-{folder_hash}.pmap")
+
+
+def load(map_file_path):
+    """
+    Abre a versão compilada do mapa, se ela existir e ainda corresponder ao .txt.
+
+    Retorna:
+        CompiledMap: Mapa compilado, ou None se for preciso (re)compilar.
+    """
+    path = compiled_path(map_file_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        compiled = CompiledMap(path)
+    except (ValueError, TypeError, IndexError, struct.error, OSError):
+        return None  # Arquivo cortado ou estragado: é recompilado a partir do .txt
+    if compiled.source_hash != source_hash(map_file_path):
+        return None  # O .txt mudou desde a última compilação
+    return compiled
+
+
+def save(level, map_file_path, with_navigation=MAP_CACHE_NAVIGATION):
+    """
+    Grava a versão compilada de um Level recém-carregado do .txt.
+
+    Parametros:
+        level (Level): Mapa carregado (ainda sem nenhum item comido).
+        with_navigation (bool): Inclui as tabelas de distância e de próximo passo,
+            quando o mapa é pequeno o bastante para tê-las completas.
+
+    Retorna:
+        str: Caminho do arquivo gravado.
+    """
+    navigation = level.navigation
+    with_navigation = with_navigation and navigation.precomputed
+
+    portals = array('i')
+    for (line, column), (dest_line, dest_column) in level.tunnels.items():
+        portals.extend((level.cell_id(line, column), level.cell_id(dest_line, dest_column)))
+    spawns = [array('i', (level.cell_id(line, column) for line, column in level.find_symbol(symbol)))
+              for symbol in SPAWN_SYMBOLS]
+    pellets = array('i', sorted(level.pellets))
+    power_ups = array('i', sorted(level.power_ups))
+
+    nav_cells = array('i')
+    tables = []
+    if with_navigation:
+        nav_cells = array('i', (level.cell_id(y, x) for x, y in navigation.cells))
+        distances = array('i')
+        next_hops = array('i')
+        for field in navigation.fields:
+            distances.extend(field.distances)
+            next_hops.extend(field.next_hops)
+        tables = [distances, next_hops]
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, level.width, level.height, source_hash(map_file_path),
+                         with_navigation, len(portals) // 2, len(spawns[0]), len(spawns[1]),
+                         len(pellets), len(power_ups), len(nav_cells))
+
+    path = compiled_path(map_file_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Grava em um arquivo temporário e troca no final: quem estiver lendo nunca vê um arquivo pela metade
+    temp_path = f"{path}.{os.getpid()}.tmp"  # Um por processo (o torneio carrega mapas em paralelo)
+    with open(temp_path, 'wb') as file:
+        file.write(header)
+        file.write(level.grid)
+        file.write(level.exits)
+        file.write(bytes(padding(HEADER.size + 2 * len(level.grid))))
+        for table in [portals] + spawns + [pellets, power_ups, nav_cells] + tables:
+            file.write(table.tobytes())
+    os.replace(temp_path, path)
+    return path
+
+
+def compile_map(map_file_path):
+    """ Carrega o .txt e grava a versão compilada (mesmo se já houver uma válida). """
+    from level import Level
+    return save(Level(map_file_path, use_cache=False), map_file_path)
+
+
+if __name__ == '__main__':
+    for map_path in sys.argv[1:]:
+        print(f"Compilado: {compile_map(map_path)}")
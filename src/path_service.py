@@ -0,0 +1,119 @@
+#Serviço de caminhos: calcula os campos de distância em uma thread separada.
+
+# src/path_service.py
+
+import threading
+import time
+from settings import *
+
+
+def _yield_gil():
+    """ Devolve o GIL por um instante, para a thread do jogo não esperar a busca terminar. """
+    time.sleep(0)
+
+
+class PathService:
+    """
+    Calcula campos de distância (NavigationTable.search_field) em uma thread de fundo.
+
+    Cada pedido tem uma chave (ex: 'player'). Só o pedido mais recente de cada chave
+    interessa: um pedido novo substitui o que ainda estava na fila, e um resultado que
+    chega depois de um pedido mais novo é descartado. Enquanto isso, quem pediu continua
+    usando o campo que já tinha.
+
+    O resultado só entra no cache da NavigationTable quando é recolhido (poll), na
+    thread do jogo, então o cache nunca é alterado pelas duas threads ao mesmo tempo.
+
+    É uma thread, não um processo: os campos são dicionários grandes, e copiá-los
+    entre processos custaria mais que a própria busca. A busca devolve o GIL a cada
+    256 nós, então o quadro não fica travado esperando por ela.
+    """
+
+    def __init__(self, navigation):
+        """
+        Parametros:
+            navigation (NavigationTable): Tabela de navegação do mapa atual.
+        """
+        self.navigation = navigation
+        self._condition = threading.Condition()
+        self._pending = {}  # chave -> (número do pedido, alvo): só o mais recente de cada chave
+        self._results = {}  # chave -> (número do pedido, campo, nós expandidos)
+        self._latest = {}  # chave -> número do último pedido feito (só a thread do jogo usa)
+        self._sequence = 0
+        self._closed = False
+        # Contadores (lidos e zerados pelo FrameProfiler a cada quadro). Só a thread do jogo
+        # escreve neles: o trabalho da busca é contado quando o resultado é recolhido (poll).
+        self.counters = {'path_requests': 0, 'path_superseded': 0, 'path_stale': 0,
+                         'path_searches': 0, 'path_nodes_expanded': 0}
+        self._thread = threading.Thread(target=self._run, name='PathService', daemon=True)
+        self._thread.start()
+
+    def request(self, key, target_pos):
+        """
+        Pede o campo de distâncias até 'target_pos' (substitui o pedido anterior da mesma chave).
+        """
+        self._sequence += 1
+        self._latest[key] = self._sequence
+        self.counters['path_requests'] += 1
+        with self._condition:
+            if key in self._pending:
+                self.counters['path_superseded'] += 1
+            self._pending[key] = (self._sequence, target_pos)
+            self._condition.notify()
+
+    def poll(self, key):
+        """
+        Recolhe o resultado do último pedido da chave, se já estiver pronto.
+
+        Retorna:
+            DistanceField: Campo calculado, ou None se ainda não terminou (ou se o
+            resultado era de um pedido antigo).
+        """
+        with self._condition:
+            result = self._results.pop(key, None)
+        if result is None:
+            return None
+        sequence, field, expanded = result
+        self.counters['path_searches'] += 1
+        self.counters['path_nodes_expanded'] += expanded
+        if sequence != self._latest.get(key):
+            self.counters['path_stale'] += 1
+            return None
+        if field is not None:
+            self.navigation.add_field(field)
+        return field
+
+    def drop(self, key):
+        """ Desiste do pedido em andamento da chave (o resultado, quando chegar, é descartado). """
+        if self._latest.pop(key, None) is None:
+            return
+        with self._condition:
+            self._pending.pop(key, None)
+
+    def cancel(self):
+        """ Esquece todos os pedidos e resultados (ex: ao recomeçar a partida). """
+        with self._condition:
+            self._pending.clear()
+            self._results.clear()
+        self._latest.clear()
+
+    def close(self):
+        """ Encerra a thread (os pedidos que ainda estavam na fila são descartados). """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Atende as chaves na ordem em que foram pedidas
+                key = next(iter(self._pending))
+                sequence, target_pos = self._pending.pop(key)
+            field, expanded = self.navigation.search_field(target_pos, pause=_yield_gil)
+            with self._condition:
+                self._results[key] = (sequence, field, expanded)
@@ -0,0 +1,680 @@
+#IA dos fantasmas: tabelas de distância e de próximo passo sobre o mapa.
+
+# src/pathfinding.py
+
+import heapq
+from array import array
+from collections import deque, OrderedDict
+from settings import *
+
+
+class DistanceField:
+    """
+    Campo de distâncias até uma célula raiz (resultado de uma busca reversa).
+
+    Qualquer entidade pode descer o campo: a partir de uma célula, o próximo
+    passo rumo à raiz é uma consulta O(1). Vários fantasmas podem compartilhar
+    o mesmo campo quando perseguem o mesmo alvo.
+
+    Quando uma célula do mapa vira parede ou deixa de ser (a porta da casa dos
+    fantasmas, paredes destrutíveis), o campo não é refeito: na próxima consulta
+    ele é consertado só na parte afetada pela mudança (veja repair).
+    """
+
+    limit = None  # Distância máxima guardada no campo (None = sem limite)
+
+    def __init__(self, navigation, root, distances, next_hops, version):
+        """
+        Parametros:
+            version (int): NavigationTable.version do início da busca que gerou o campo
+                (mudanças do mapa feitas durante a busca são consertadas na primeira consulta).
+        """
+        self.navigation = navigation
+        self.root = root
+        self.root_pos = navigation.cells[root]
+        self.distances = distances
+        self.next_hops = next_hops
+        self.version = version  # Mudanças do mapa já aplicadas a este campo
+
+    def distance(self, pos):
+        """ Custo de 'pos' até a raiz, ou None se não houver caminho. """
+        if self.version != self.navigation.version:
+            self._sync()
+        cell = self.navigation.index.get(pos)
+        if cell is None or self.distances[cell] < 0:
+            return None
+        return self.distances[cell]
+
+    def next_step(self, pos):
+        """ Próxima célula (x, y) a partir de 'pos' rumo à raiz, ou None. """
+        if self.version != self.navigation.version:
+            self._sync()
+        cell = self.navigation.index.get(pos)
+        if cell is None or self.next_hops[cell] < 0:
+            return None
+        return self.navigation.cells[self.next_hops[cell]]
+
+    def path(self, pos):
+        """ Caminho completo de 'pos' até a raiz (inclusive), ou None. """
+        if self.version != self.navigation.version:
+            self._sync()
+        cell = self.navigation.index.get(pos)
+        if cell is None or self.distances[cell] < 0:
+            return None
+        path = [pos]
+        while cell != self.root:
+            cell = self.next_hops[cell]
+            path.append(self.navigation.cells[cell])
+        return path
+
+    # =========================================================================
+    # CONSERTO INCREMENTAL
+    # =========================================================================
+
+    def _sync(self):
+        """ Aplica ao campo as mudanças do mapa feitas desde a última consulta. """
+        navigation = self.navigation
+        changed = {}
+        for node, old_neighbours in navigation.changes[self.version:]:
+            # Vale a vizinhança de antes da primeira mudança ainda não aplicada
+            changed.setdefault(node, old_neighbours)
+        self.version = navigation.version
+        self.repair(changed)
+
+    def _get(self, node):
+        return self.distances[node]
+
+    def _hop(self, node):
+        return self.next_hops[node]
+
+    def _set(self, node, distance, next_hop):
+        self.distances[node] = distance
+        self.next_hops[node] = next_hop if next_hop is not None else -1
+
+    def _clear(self, node):
+        self.distances[node] = -1
+        self.next_hops[node] = -1
+
+    def _neighbours(self, node):
+        return self.navigation.neighbours[node]
+
+    def _prepare(self):
+        """ Deixa as tabelas graváveis e do tamanho atual do índice (células novas entram com -1). """
+        count = len(self.navigation.cells)
+        if not isinstance(self.distances, array):
+            # Fatias do mapa compilado são só leitura: copiadas no primeiro conserto
+            self.distances = array('i', self.distances)
+            self.next_hops = array('i', self.next_hops)
+        missing = count - len(self.distances)
+        if missing > 0:
+            self.distances.extend([-1] * missing)
+            self.next_hops.extend([-1] * missing)
+
+    def repair(self, changed):
+        """
+        Conserta o campo depois que células mudaram de caminhável para parede (ou o contrário).
+
+        É a ideia do LPA*: só as células cujo caminho até a raiz passava por uma
+        célula alterada perdem a distância (a subárvore delas). Elas são refeitas
+        com um Dijkstra que parte da borda com o resto do campo, que continua
+        correto, e um atalho novo só se espalha enquanto encurtar distâncias.
+        O custo depende do tamanho da parte afetada, não do mapa.
+
+        Parametros:
+            changed (dict): Índice da célula alterada -> vizinhos (índice, custo) que ela
+                tinha antes da mudança.
+        """
+        self._prepare()
+        navigation = self.navigation
+
+        # 1. Subárvores das células alteradas (os filhos de um nó são os vizinhos cujo
+        #    próximo passo é ele; nas células alteradas vale a vizinhança antiga)
+        affected = set(changed)
+        stack = [node for node in changed if self._get(node) >= 0]
+        while stack:
+            node = stack.pop()
+            for neighbour, _ in self._neighbours(node) + list(changed.get(node, ())):
+                if neighbour not in affected and self._hop(neighbour) == node:
+                    affected.add(neighbour)
+                    stack.append(neighbour)
+        for node in affected:
+            self._clear(node)
+
+        # 2. Cada célula afetada parte do melhor vizinho que ficou fora da subárvore
+        limit = self.limit
+        heap = []
+        for node in affected:
+            if node == self.root:
+                if navigation.is_open(node):
+                    heap.append((0, node, None))
+                continue
+            for neighbour, cost in self._neighbours(node):
+                distance = self._get(neighbour)
+                if distance >= 0 and neighbour not in affected:
+                    distance += cost
+                    if limit is None or distance <= limit:
+                        heap.append((distance, node, neighbour))
+        heapq.heapify(heap)
+
+        # 3. Dijkstra: fecha as células afetadas e propaga as distâncias que diminuíram
+        expanded = 0
+        while heap:
+            distance, node, next_hop = heapq.heappop(heap)
+            current = self._get(node)
+            if 0 <= current <= distance:
+                continue
+            self._set(node, distance, next_hop)
+            expanded += 1
+            for neighbour, cost in self._neighbours(node):
+                new_distance = distance + cost
+                if limit is not None and new_distance > limit:
+                    continue
+                old_distance = self._get(neighbour)
+                if old_distance < 0 or new_distance < old_distance:
+                    heapq.heappush(heap, (new_distance, neighbour, node))
+        navigation.counters['nav_repairs'] += 1
+        navigation.count_expanded(expanded)
+
+
+class SparseDistanceField(DistanceField):
+    """
+    Campo de distâncias parcial (só as células alcançadas pela busca limitada).
+
+    As tabelas são dicionários: células fora do alcance simplesmente não aparecem.
+    """
+
+    limit = NAV_SEARCH_MAX_DISTANCE
+
+    def distance(self, pos):
+        if self.version != self.navigation.version:
+            self._sync()
+        cell = self.navigation.index.get(pos)
+        return self.distances.get(cell)
+
+    def next_step(self, pos):
+        if self.version != self.navigation.version:
+            self._sync()
+        next_hop = self.next_hops.get(self.navigation.index.get(pos))
+        return self.navigation.cells[next_hop] if next_hop is not None else None
+
+    def path(self, pos):
+        if self.version != self.navigation.version:
+            self._sync()
+        cell = self.navigation.index.get(pos)
+        if cell not in self.distances:
+            return None
+        path = [pos]
+        while cell != self.root:
+            cell = self.next_hops[cell]
+            path.append(self.navigation.cells[cell])
+        return path
+
+    def _get(self, node):
+        return self.distances.get(node, -1)
+
+    def _hop(self, node):
+        return self.next_hops.get(node)
+
+    def _set(self, node, distance, next_hop):
+        self.distances[node] = distance
+        if next_hop is not None:
+            self.next_hops[node] = next_hop
+
+    def _clear(self, node):
+        self.distances.pop(node, None)
+        self.next_hops.pop(node, None)
+
+    def _neighbours(self, node):
+        return self.navigation.level.neighbours(node)
+
+    def _prepare(self):
+        pass
+
+
+class _GridCells:
+    """ Converte a célula do mapa em (x, y) sob demanda (substitui a lista 'cells' em mapas grandes). """
+
+    def __init__(self, width):
+        self.width = width
+
+    def __getitem__(self, cell):
+        return cell % self.width, cell // self.width
+
+
+class _GridIndex:
+    """ Converte (x, y) na célula do mapa, ou None se não for caminhável (substitui o dicionário 'index'). """
+
+    def __init__(self, level):
+        self.level = level
+
+    def get(self, pos):
+        if pos is None:
+            return None
+        x, y = pos
+        level = self.level
+        if 0 <= x < level.width and 0 <= y < level.height:
+            cell = y * level.width + x
+            if level.walkable[cell]:
+                return cell
+        return None
+
+
+class NavigationTable:
+    """
+    Tabela de navegação "todos para todos" do mapa.
+
+    Para cada célula alvo guardamos, para todas as outras células, a distância
+    até o alvo e o próximo passo do caminho mais curto. Com isso, pedir o próximo
+    passo ou a distância entre duas células é uma consulta O(1), e um caminho
+    completo é montado apenas encadeando os próximos passos.
+
+    Em mapas grandes (mais de NAV_TABLE_MAX_CELLS células caminháveis) a tabela
+    completa não cabe na memória: cada campo é calculado sob demanda, limitado a
+    NAV_SEARCH_MAX_DISTANCE passos do alvo, e o índice é a própria célula do mapa.
+
+    As posições seguem o formato usado pelos fantasmas: tuplas (x, y).
+    """
+
+    def __init__(self, level, tables=None):
+        """
+        Constrói a tabela a partir do mapa carregado.
+
+        Parametros:
+            level (Level): Mapa já carregado.
+            tables (tuple): Tabelas prontas vindas do mapa compilado: (células do mapa,
+                distâncias, próximos passos), com uma linha por célula alvo.
+        """
+        self.width = level.width
+        self.height = level.height
+        self.level = level
+
+        # Contadores de trabalho (lidos e zerados pelo FrameProfiler a cada quadro)
+        self.counters = {'nav_searches': 0, 'nav_nodes_expanded': 0, 'nav_field_requests': 0,
+                         'nav_repairs': 0, 'nav_guided_paths': 0}
+        # Nós expandidos na thread do jogo desde o carregamento (nunca é zerado, e as buscas
+        # do PathService não entram: é a medida do orçamento do AIScheduler)
+        self.nodes_expanded = 0
+        self.fields = []
+        self._cache = OrderedDict()
+        # Mudanças de caminhabilidade do mapa, em ordem: (índice da célula, vizinhos de antes).
+        # Cada campo guarda até onde já aplicou a lista e se conserta na próxima consulta.
+        self.version = 0
+        self.changes = []
+
+        # Mapas pequenos: tabela completa (um campo por célula alvo), calculada no carregamento.
+        # Mapas grandes não cabem na memória: os campos são calculados sob demanda, até
+        # NAV_SEARCH_MAX_DISTANCE passos do alvo, e guardados em um cache LRU.
+        self.precomputed = level.walkable.count(1) <= NAV_TABLE_MAX_CELLS
+        if not self.precomputed:
+            # O índice é a própria célula do mapa (nada é montado por célula)
+            self.cells = _GridCells(level.width)
+            self.index = _GridIndex(level)
+            self.neighbours = None
+            self.uniform_cost = not level.tunnel_edges
+            return
+
+        # Índice compacto de cada célula caminhável do grafo compilado pelo Level
+        self.cells = []
+        self.index = {}
+        self._level_to_index = level_to_index = {}
+        for cell, walkable in enumerate(level.walkable):
+            if walkable:
+                x, y = cell % level.width, cell // level.width
+                level_to_index[cell] = len(self.cells)
+                self.index[(x, y)] = len(self.cells)
+                self.cells.append((x, y))
+
+        # Vizinhos (índice, custo) de cada célula, incluindo as arestas dos túneis
+        self.neighbours = []
+        self.uniform_cost = True
+        for x, y in self.cells:
+            cell_neighbours = []
+            for neighbour, cost in level.neighbours(level.cell_id(y, x)):
+                cell_neighbours.append((level_to_index[neighbour], cost))
+                if cost != 1:
+                    self.uniform_cost = False
+            self.neighbours.append(cell_neighbours)
+
+        # Um campo de distâncias por célula alvo; -1 nas tabelas significa inalcançável
+        if tables is not None and len(tables[0]) == len(self.cells):
+            # Fatias do arquivo compilado (memoryview): nenhuma busca, nenhuma cópia
+            _, distances, next_hops = tables
+            count = len(self.cells)
+            for target in range(count):
+                row = slice(target * count, (target + 1) * count)
+                self.fields.append(DistanceField(self, target, distances[row], next_hops[row], self.version))
+            return
+        for target in range(len(self.cells)):
+            self.fields.append(self._search(target))
+        # As buscas do carregamento não entram nos contadores do jogo
+        self.counters['nav_searches'] = self.counters['nav_nodes_expanded'] = 0
+
+    def is_open(self, node):
+        """ Verifica se a célula do índice é caminhável agora (células fechadas continuam no índice). """
+        x, y = self.cells[node]
+        return self.level.walkable[y * self.width + x] == 1
+
+    def _neighbours_of(self, node):
+        return self.neighbours[node] if self.precomputed else self.level.neighbours(node)
+
+    def cell_changed(self, cell, old_neighbours):
+        """
+        Registra que uma célula virou parede ou deixou de ser (chamado pelo Level).
+
+        Só o índice e as listas de vizinhos em volta da célula são atualizados; os
+        campos de distância se consertam sozinhos na próxima consulta (veja
+        DistanceField.repair).
+
+        Parametros:
+            cell (int): Célula do mapa (linha * largura + coluna), já com o grafo atualizado.
+            old_neighbours (list): Vizinhos (célula do mapa, custo) que ela tinha antes.
+        """
+        if not self.precomputed:
+            # O índice é a própria célula do mapa e os vizinhos vêm direto do Level
+            self.changes.append((cell, old_neighbours))
+            self.version += 1
+            return
+
+        level = self.level
+        pos = (cell % self.width, cell // self.width)
+        node = self._level_to_index.get(cell)
+        added = node is None
+        if added:
+            # Célula que nunca foi caminhável: ganha um índice novo no fim das tabelas
+            node = len(self.cells)
+            self._level_to_index[cell] = node
+            self.cells.append(pos)
+            self.neighbours.append([])
+        # Células fechadas saem do índice de posições, mas guardam o número para quando reabrirem
+        if level.walkable[cell]:
+            self.index[pos] = node
+        else:
+            self.index.pop(pos, None)
+
+        old = [(self._level_to_index[neighbour], cost) for neighbour, cost in old_neighbours]
+        new = level.neighbours(cell) if level.walkable[cell] else []
+        self.neighbours[node] = [(self._level_to_index[neighbour], cost) for neighbour, cost in new]
+        for neighbour, _ in old + self.neighbours[node]:
+            level_cell = self.cells[neighbour][1] * self.width + self.cells[neighbour][0]
+            self.neighbours[neighbour] = [(self._level_to_index[other], cost)
+                                          for other, cost in level.neighbours(level_cell)]
+        self.changes.append((node, old))
+        self.version += 1
+        if added:
+            self.fields.append(self._search(node))
+
+    def count_expanded(self, expanded):
+        """ Soma nos contadores os nós expandidos por uma busca feita na thread do jogo. """
+        self.counters['nav_nodes_expanded'] += expanded
+        self.nodes_expanded += expanded
+
+    def _search(self, target):
+        """ Busca o campo de um alvo na thread do jogo, contando o trabalho nos contadores. """
+        field, expanded = self._run_search(target)
+        self.counters['nav_searches'] += 1
+        self.count_expanded(expanded)
+        return field
+
+    def _run_search(self, target, pause=None):
+        """
+        Busca reversa a partir do alvo: preenche a distância e o próximo passo de cada célula.
+
+        Com todos os custos iguais a 1 um BFS basta; com túneis mais caros usamos Dijkstra.
+        Não mexe nos contadores (pode rodar na thread do PathService).
+
+        Parametros:
+            pause (callable): Chamada a cada 256 nós expandidos na busca limitada (o
+                PathService a usa para devolver o GIL à thread do jogo).
+
+        Retorna:
+            tuple(DistanceField, int): O campo e quantos nós a busca expandiu.
+        """
+        # A versão é lida antes da busca: na thread do PathService o mapa pode mudar no meio
+        # dela, e o campo precisa saber que essas mudanças ainda não foram aplicadas
+        version = self.version
+        if not self.precomputed:
+            return self._search_bounded(target, version, pause)
+        if self.uniform_cost:
+            return self._search_bfs(target, version)
+        return self._search_dijkstra(target, version)
+
+    def _search_bfs(self, target, version):
+        distances = array('i', [-1]) * len(self.cells)
+        next_hops = array('i', [-1]) * len(self.cells)
+        distances[target] = 0
+        queue = deque([target])
+        expanded = 0
+        while queue:
+            node = queue.popleft()
+            expanded += 1
+            for neighbour, _ in self.neighbours[node]:
+                if distances[neighbour] == -1:
+                    distances[neighbour] = distances[node] + 1
+                    # Quem está no vizinho chega ao alvo passando por 'node'
+                    next_hops[neighbour] = node
+                    queue.append(neighbour)
+        return DistanceField(self, target, distances, next_hops, version), expanded
+
+    def _search_dijkstra(self, target, version):
+        distances = array('i', [-1]) * len(self.cells)
+        next_hops = array('i', [-1]) * len(self.cells)
+        distances[target] = 0
+        heap = [(0, target)]
+        expanded = 0
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue  # Entrada antiga da fila, já encontramos algo melhor
+            expanded += 1
+            for neighbour, cost in self.neighbours[node]:
+                # As arestas são simétricas, então o custo de ida e volta é o mesmo
+                new_distance = distance + cost
+                if distances[neighbour] == -1 or new_distance < distances[neighbour]:
+                    distances[neighbour] = new_distance
+                    next_hops[neighbour] = node
+                    heapq.heappush(heap, (new_distance, neighbour))
+        return DistanceField(self, target, distances, next_hops, version), expanded
+
+    def _search_bounded(self, target, version, pause=None):
+        """
+        Busca reversa limitada a NAV_SEARCH_MAX_DISTANCE passos, para mapas grandes.
+
+        Usa as células do próprio mapa como índice e dicionários no lugar das tabelas,
+        então o custo depende só da vizinhança visitada, não do tamanho do mapa.
+        """
+        limit = NAV_SEARCH_MAX_DISTANCE
+        neighbours_of = self.level.neighbours
+        distances = {target: 0}
+        next_hops = {}
+        heap = [(0, target)]
+        expanded = 0
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            expanded += 1
+            if pause is not None and not expanded & 255:
+                pause()
+            for neighbour, cost in neighbours_of(node):
+                new_distance = distance + cost
+                if new_distance <= limit and new_distance < distances.get(neighbour, new_distance + 1):
+                    distances[neighbour] = new_distance
+                    next_hops[neighbour] = node
+                    heapq.heappush(heap, (new_distance, neighbour))
+        return SparseDistanceField(self, target, distances, next_hops, version), expanded
+
+    def _field_for(self, target):
+        """ Retorna o campo de distâncias de um alvo (pelo índice da célula). """
+        if self.precomputed:
+            return self.fields[target]
+
+        field = self._cache.get(target)
+        if field is None:
+            field = self._search(target)
+            self.add_field(field)
+        else:
+            self._cache.move_to_end(target)
+        return field
+
+    def add_field(self, field):
+        """ Guarda no cache LRU um campo calculado (também os que vêm do PathService). """
+        if self.precomputed:
+            return
+        self._cache[field.root] = field
+        self._cache.move_to_end(field.root)
+        if len(self._cache) > NAV_CACHE_SIZE:
+            self._cache.popitem(last=False)  # Descarta o alvo usado há mais tempo
+
+    def cached_field(self, target_pos):
+        """
+        Retorna o campo de 'target_pos' só se ele já estiver pronto (tabela completa ou cache).
+
+        Retorna:
+            DistanceField: Campo, ou None se a célula não for caminhável ou o campo ainda não existir.
+        """
+        self.counters['nav_field_requests'] += 1
+        target = self.index.get(target_pos)
+        if target is None:
+            return None
+        if self.precomputed:
+            return self.fields[target]
+        field = self._cache.get(target)
+        if field is not None:
+            self._cache.move_to_end(target)
+        return field
+
+    def search_field(self, target_pos, pause=None):
+        """
+        Calcula o campo de 'target_pos' sem consultar nem alterar o cache.
+
+        Só lê o grafo do mapa e não mexe nos contadores, então pode rodar na thread do
+        PathService (que conta o trabalho nos contadores dele).
+
+        Retorna:
+            tuple(DistanceField, int): Campo novo (None se a célula não for caminhável) e
+            quantos nós a busca expandiu.
+        """
+        target = self.index.get(target_pos)
+        if target is None:
+            return None, 0
+        return self._run_search(target, pause)
+
+    def field(self, target_pos):
+        """
+        Retorna o campo de distâncias enraizado em 'target_pos'.
+
+        Retorna:
+            DistanceField: Campo compartilhável, ou None se a célula não for caminhável.
+        """
+        self.counters['nav_field_requests'] += 1
+        target = self.index.get(target_pos)
+        if target is None:
+            return None
+        return self._field_for(target)
+
+    def distance(self, start_pos, target_pos):
+        """
+        Retorna o custo do caminho mais curto entre duas células.
+
+        Retorna:
+            int: Distância em passos (túneis custam TUNNEL_EDGE_COST), ou None se não houver caminho.
+        """
+        field = self.field(target_pos)
+        return field.distance(start_pos) if field is not None else None
+
+    def next_step(self, start_pos, target_pos):
+        """
+        Retorna a próxima célula do caminho mais curto até o alvo.
+
+        Retorna:
+            tuple(int, int): Próxima célula (x, y), ou None se já estiver no alvo ou não houver caminho.
+        """
+        field = self.field(target_pos)
+        return field.next_step(start_pos) if field is not None else None
+
+    def path(self, start_pos, target_pos):
+        """
+        Monta o caminho completo encadeando os próximos passos.
+
+        Retorna:
+            list[tuple(int, int)]: Caminho de start_pos até target_pos (inclusive), ou None.
+        """
+        field = self.field(target_pos)
+        return field.path(start_pos) if field is not None else None
+
+    def guided_path(self, start_pos, target_pos, guide):
+        """
+        Caminho mais curto de start_pos até target_pos por A*, usando como heurística
+        um campo de distâncias de outra raiz ('guide').
+
+        |guide(v) - guide(alvo)| nunca passa da distância real (desigualdade
+        triangular) e é quase exata quando o alvo está perto da raiz do guia: a busca
+        expande pouco mais que as células do próprio caminho. É assim que um
+        fantasma conserta a rota quando o jogador anda algumas células, em vez de
+        pedir um campo novo para o mapa inteiro.
+
+        Parametros:
+            guide (DistanceField): Campo de uma raiz próxima do alvo (ex: o campo do jogador).
+
+        Retorna:
+            list[tuple(int, int)]: Caminho sem a célula inicial (vazio se já estiver no
+            alvo), ou None se o alvo estiver a mais de NAV_SEARCH_MAX_DISTANCE passos.
+        """
+        start = self.index.get(start_pos)
+        target = self.index.get(target_pos)
+        if start is None or target is None:
+            return None
+        self.counters['nav_guided_paths'] += 1
+        if guide.version != self.version:
+            guide._sync()
+        estimate_of = guide._get
+        target_estimate = estimate_of(target)
+        target_x, target_y = target_pos
+        cells = self.cells
+        # Sem túneis, a distância em linha reta no grid (Manhattan) também nunca passa da real
+        manhattan = not self.level.tunnel_edges
+
+        def heuristic(node):
+            estimate = estimate_of(node)
+            # Fora do campo guia ele não diz nada: 0 continua sendo uma estimativa segura
+            guess = abs(estimate - target_estimate) if estimate >= 0 and target_estimate >= 0 else 0
+            if manhattan:
+                x, y = cells[node]
+                guess = max(guess, abs(x - target_x) + abs(y - target_y))
+            return guess
+
+        limit = NAV_SEARCH_MAX_DISTANCE
+        costs = {start: 0}
+        parents = {start: None}
+        # Empate no f: sai primeiro quem está mais longe da origem (mais perto do alvo)
+        heap = [(heuristic(start), 0, start)]
+        expanded = 0
+        found = False
+        while heap:
+            _, cost, node = heapq.heappop(heap)
+            cost = -cost
+            if cost > costs[node]:
+                continue
+            if node == target:
+                found = True
+                break
+            expanded += 1
+            for neighbour, step in self._neighbours_of(node):
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, new_cost + 1):
+                    estimate = new_cost + heuristic(neighbour)
+                    if estimate > limit:
+                        continue
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = node
+                    heapq.heappush(heap, (estimate, -new_cost, neighbour))
+        self.count_expanded(expanded)
+        if not found:
+            return None
+        path = []
+        node = target
+        while node != start:
+            path.append(self.cells[node])
+            node = parents[node]
+        path.reverse()
+        return path
@@ -3,34 +3,35 @@
 # src/player.py
 
 import pygame
-import os
 from settings import *
+from asset_manager import asset_manager
+from entity import Entity
 
 
-class Player:
+class Player(Entity):
+    __slots__ = ('stored_direction', 'animations', 'current_frame_index', 'animation_timer',
+                 'animation_speed_ms', 'invincibility_timer')
+
     def __init__(self, game, pos):
         """
         Construtor da entidade Player (Pac-Man).
         """
-        self.game = game
-        self.grid_pos = pygame.Vector2(pos[0], pos[1])
-        self.pixel_pos = pygame.Vector2(
-            self.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-            self.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-        )
-        self.direction = pygame.Vector2(0, 0)  # Começa virado para a direita
+        # Posição, posição inicial (colisões/resetar) e direção parada ficam na Entity
+        super().__init__(game, pos, PLAYER_SPEED)
         self.stored_direction = None
-        self.speed = PLAYER_SPEED
-        self.starting_pos = pygame.Vector2(pos[0], pos[1]) #colisões/resetar
 
 
         # --- LÓGICA DE ANIMAÇÃO ---
         self.animations = {}  # Dicionário para guardar as listas de sprites
-        self.load_animations()
-
         self.current_frame_index = 0
-        self.image = self.animations['right'][self.current_frame_index]  # Imagem atual a ser desenhada
-        self.rect = self.image.get_rect()  # Retângulo da imagem, para posicionamento
+        if self.game.headless:
+            # Sem display não há como carregar sprites (convert_alpha precisa da janela)
+            self.image = None
+            self.rect = pygame.Rect(0, 0, GRID_SIZE, GRID_SIZE)
+        else:
+            self.load_animations()
+            self.image = self.animations['right'][self.current_frame_index]  # Imagem atual a ser desenhada
+            self.rect = self.image.get_rect()  # Retângulo da imagem, para posicionamento
 
         self.animation_timer = 0
         self.animation_speed_ms = 80  # Tempo em milissegundos para cada frame da animação
@@ -44,26 +45,17 @@ class Player:
         """
         Carrega todas as imagens de animação do Pac-Man a partir das pastas.
         """
-        # Mapeia a direção para a pasta correspondente e a lista de sprites
+        # Mapeia a direção para a pasta correspondente
         directions = {
-            'right': (PACMAN_RIGHT_FOLDER, []),
-            'left': (PACMAN_LEFT_FOLDER, []),
-            'up': (PACMAN_UP_FOLDER, []),
-            'down': (PACMAN_DOWN_FOLDER, [])
+            'right': PACMAN_RIGHT_FOLDER,
+            'left': PACMAN_LEFT_FOLDER,
+            'up': PACMAN_UP_FOLDER,
+            'down': PACMAN_DOWN_FOLDER
         }
 
-        for direction, (folder_path, image_list) in directions.items():
-            # Pega todos os arquivos da pasta, ignorando subdiretórios
-            filenames = sorted([f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))])
-
-            for filename in filenames:
-                # Carrega a imagem
-                img = pygame.image.load(os.path.join(folder_path, filename)).convert_alpha()
-                # Redimensiona a imagem para o tamanho do nosso grid
-                scaled_img = pygame.transform.scale(img, (GRID_SIZE, GRID_SIZE))
-                image_list.append(scaled_img)
-
-        self.animations = {direction: data[1] for direction, data in directions.items()}
+        # O gerenciador de assets lê e redimensiona cada quadro uma única vez
+        self.animations = {direction: asset_manager.load_folder(folder_path)
+                           for direction, folder_path in directions.items()}
 
     # Dentro da classe Player (src/player.py)
 
@@ -80,44 +72,43 @@ class Player:
         # 2. Só permitimos decisões de movimento quando o jogador está alinhado no grid
         if self.is_on_grid_center():
             # <<<< LÓGICA DO TÚNEL ATUALIZADA >>>>
-            current_grid_pos_tuple = (int(self.grid_pos.y), int(self.grid_pos.x))
+            line, column = int(self.grid_y), int(self.grid_x)
             # VERIFICAÇÃO 1: O jogador está em um portal E o cooldown está zerado?
-            if current_grid_pos_tuple in self.game.level.tunnels and self.game.tunnel_cooldown == 0:
-                # Se for, teletransporta o jogador
-                destination = self.game.level.tunnels[current_grid_pos_tuple]
-                self.grid_pos = pygame.Vector2(destination[1], destination[0])
-                self.pixel_pos = pygame.Vector2(
-                    self.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-                    self.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-                )
+            destination = self.game.level.tunnels.get((line, column))
+            if destination is not None and self.game.tunnel_cooldown == 0:
+                # Se for, teletransporta o jogador (a posição anterior continua a de antes do túnel)
+                self.grid_x, self.grid_y = destination[1], destination[0]
+                self.pixel_x = self.grid_x * GRID_SIZE + GRID_SIZE // 2
+                self.pixel_y = self.grid_y * GRID_SIZE + GRID_SIZE // 2
 
                 # VERIFICAÇÃO 2: Ativa o cooldown geral do jogo
                 self.game.tunnel_cooldown = int(TUNNEL_COOLDOWN_SEC * FPS)
                 return  # Encerra o update deste frame para evitar outros movimentos
 
             # Se não estiver em um túnel (ou se o túnel estiver em cooldown), processa o input
-            if self.stored_direction:
-                next_pos_grid = self.grid_pos + self.stored_direction
-                if not self.game.level.is_wall(int(next_pos_grid.y), int(next_pos_grid.x)):
-                    self.direction = self.stored_direction
+            # As verificações de parede usam as saídas livres do grafo compilado do mapa
+            stored = self.stored_direction
+            if stored:
+                if self.game.level.can_move(line, column, (int(stored[0]), int(stored[1]))):
+                    self.direction_x, self.direction_y = stored[0], stored[1]
             self.stored_direction = None
 
             # Verifica se a direção atual vai bater numa parede
-            next_pos_grid = self.grid_pos + self.direction
-            if self.game.level.is_wall(int(next_pos_grid.y), int(next_pos_grid.x)):
-                self.direction = pygame.Vector2(0, 0)
+            if not self.game.level.can_move(line, column, (int(self.direction_x), int(self.direction_y))):
+                self.direction_x = self.direction_y = 0
 
-        # 3. Move o jogador em pixels
-        self.pixel_pos += self.direction * self.speed
+        # 3. Move o jogador em pixels (no lugar, sem criar vetores)
+        self.pixel_x += self.direction_x * self.speed
+        self.pixel_y += self.direction_y * self.speed
 
         # 4. Atualiza a posição no grid e interage com itens
-        new_grid_pos = pygame.Vector2(int(self.pixel_pos.x / GRID_SIZE), int(self.pixel_pos.y / GRID_SIZE))
-        if new_grid_pos != self.grid_pos:
-            self.grid_pos = new_grid_pos
+        grid_x, grid_y = int(self.pixel_x / GRID_SIZE), int(self.pixel_y / GRID_SIZE)
+        if grid_x != self.grid_x or grid_y != self.grid_y:
+            self.grid_x, self.grid_y = grid_x, grid_y
             self.eat_item()
 
-        # 5. Atualiza a animação
-        if self.direction.x != 0 or self.direction.y != 0:
+        # 5. Atualiza a animação (não há sprites no modo headless)
+        if (self.direction_x != 0 or self.direction_y != 0) and not self.game.headless:
             self.animate()
 
 
@@ -125,7 +116,8 @@ class Player:
 
     def animate(self):
         """ Controla a troca de frames da animação. """
-        self.animation_timer += self.game.clock.get_time()  # Adiciona o tempo passado
+        # Cada tick da simulação dura 1000 / FPS ms, independente da taxa de desenho
+        self.animation_timer += 1000 / FPS
 
         if self.animation_timer > self.animation_speed_ms:
             self.animation_timer = 0  # Reseta o timer
@@ -136,12 +128,16 @@ class Player:
         # Atualiza a imagem atual com base no frame e na direção
         self.image = self.animations[self.get_current_direction_key()][self.current_frame_index]
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, camera=None):
         """
         Desenha o sprite atual do Pac-Man na tela.
+
+        Parametros:
+            camera (Camera): Converte a posição no mapa para a posição na janela.
         """
         # Atualiza a posição do retângulo da imagem para o centro da posição em pixels
-        self.rect.center = self.pixel_pos
+        pos = self.render_position(alpha)
+        self.rect.center = camera.to_screen(pos) if camera is not None else pos
         # Desenha a imagem na tela
         screen.blit(self.image, self.rect)
 
@@ -151,25 +147,20 @@ class Player:
         """
         self.stored_direction = direction
 
-    def is_on_grid_center(self):
-        """ Verifica se o jogador está próximo o suficiente do centro de uma célula. """
-        return (abs(self.pixel_pos.x % GRID_SIZE - GRID_SIZE // 2) < self.speed and
-                abs(self.pixel_pos.y % GRID_SIZE - GRID_SIZE // 2) < self.speed)
-
     def get_current_direction_key(self):
         """ Retorna a chave de string ('up', 'down', etc.) para a direção atual. """
-        if self.direction.x == 1: return 'right'
-        if self.direction.x == -1: return 'left'
-        if self.direction.y == -1: return 'up'
-        if self.direction.y == 1: return 'down'
+        if self.direction_x == 1: return 'right'
+        if self.direction_x == -1: return 'left'
+        if self.direction_y == -1: return 'up'
+        if self.direction_y == 1: return 'down'
 
         # Se estiver parado (direction é 0,0), usa a última direção armazenada
         # para que a imagem não mude para 'right' toda vez que ele para.
         if self.stored_direction:
-            if self.stored_direction.x == 1: return 'right'
-            if self.stored_direction.x == -1: return 'left'
-            if self.stored_direction.y == -1: return 'up'
-            if self.stored_direction.y == 1: return 'down'
+            if self.stored_direction[0] == 1: return 'right'
+            if self.stored_direction[0] == -1: return 'left'
+            if self.stored_direction[1] == -1: return 'up'
+            if self.stored_direction[1] == 1: return 'down'
 
         return 'right'  # Retorna 'right' como um padrão seguro no início do jogo
 
@@ -180,29 +171,20 @@ class Player:
         Verifica se há um item na posição atual do jogador e o consome.
         """
         # Pega a posição no grid, garantindo que sejam inteiros para usar como índice da matriz
-        grid_x = int(self.grid_pos.x)
-        grid_y = int(self.grid_pos.y)
+        grid_x = int(self.grid_x)
+        grid_y = int(self.grid_y)
 
-        # Usa o TAD Mapa para consultar o que há na célula
-        tile = self.game.level.get_tile(grid_y, grid_x)
+        # Usa o TAD Mapa para remover o item (troca por espaço vazio); o contador
+        # de pellets do mapa é atualizado junto com o índice de itens
+        tile = self.game.level.eat(grid_y, grid_x)
 
-        item_eaten = False  # Flag para saber se algo foi comido
         if tile == '.':  # Se for um pontinho
-            # Usa o TAD Mapa para remover o item (troca por espaço vazio)
-            self.game.level.set_tile(grid_y, grid_x, ' ')
             # Aumenta a pontuação no TAD Cenário (a classe Game)
             self.game.score += 10
-            item_eaten = True
 
         elif tile == 'o':  # Se for um power-up
-            self.game.level.set_tile(grid_y, grid_x, ' ')
             self.game.score += 50
             self.activate_invincibility()
-            item_eaten = True
-
-        # <<<< ADICIONADO: Decrementa o contador se um item foi comido
-        if item_eaten:
-            self.game.level.total_pellets -= 1
 
 
     def activate_invincibility(self):
@@ -211,16 +193,13 @@ class Player:
         """
         # Converte o tempo em segundos (de settings.py) para frames
         # Ex: 7 segundos * 60 FPS = 420 frames de invencibilidade
-        self.invincibility_timer = SCARED_TIME * FPS
+        # (int: o torneio aceita segundos fracionários, e o timer precisa chegar exatamente a 0)
+        self.invincibility_timer = int(self.game.scared_time * FPS)
         print("MODO INVENCÍVEL ATIVADO!")  # Mensagem de teste
 
     # metodo de resetar o jogador
     def reset(self):
         """ Reseta o jogador para sua posição e estado iniciais. """
-        self.grid_pos = pygame.Vector2(self.starting_pos.x, self.starting_pos.y)
-        self.pixel_pos = pygame.Vector2(
-            self.grid_pos.x * GRID_SIZE + GRID_SIZE // 2,
-            self.grid_pos.y * GRID_SIZE + GRID_SIZE // 2
-        )
-        self.direction = pygame.Vector2(0, 0)
+        self.place(self.start_x, self.start_y)
+        self.direction_x = self.direction_y = 0
         self.stored_direction = None
@@ -0,0 +1,216 @@
+#Medição do tempo gasto por cada parte do quadro (eventos, lógica, IA, desenho...).
+
+# src/profiler.py
+
+import json
+import time
+import pygame
+from collections import deque
+from settings import *
+
+
+class _Section:
+    """ Bloco 'with' que soma o tempo gasto em uma seção do quadro atual. """
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        times = self.profiler.current
+        times[self.name] = times.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000
+        return False
+
+
+class _NoSection:
+    """ Bloco 'with' vazio, usado quando o profiler está desligado. """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SECTION = _NoSection()
+
+
+class FrameProfiler:
+    """
+    Registra, a cada quadro, quantos milissegundos foram gastos em cada seção
+    (eventos, update, IA, colisões, desenho do mapa, das entidades, UI e flip)
+    e contadores (ex: nós expandidos pelas buscas, campos de distância calculados).
+
+    Os últimos PROFILER_WINDOW quadros ficam guardados para calcular médias e o p99
+    mostrados no overlay (F3). Opcionalmente, cada quadro é gravado como uma
+    linha JSON em um arquivo de trace, para análise depois.
+    """
+
+    # Ordem em que as seções aparecem no overlay
+    SECTIONS = ['events', 'update', 'ai', 'collisions', 'level_draw', 'entity_draw', 'ui', 'flip']
+
+    def __init__(self, enabled=PROFILER_ENABLED, window=PROFILER_WINDOW, trace_path=None):
+        self.enabled = enabled
+        self.visible = False  # Overlay ligado/desligado (F3)
+        self.window = window
+        self.frame = 0
+        self.current = {}  # seção -> ms no quadro atual
+        self.counters = {}  # contador -> valor no quadro atual
+        self.history = {}  # seção ou contador -> deque com os últimos quadros
+        self.frame_times = deque(maxlen=window)
+        self.last_frame_end = None
+        self._sections = {}
+        self._overlay = None  # Superfície do overlay, refeita a cada PROFILER_OVERLAY_REFRESH quadros
+        self.trace_file = None
+        if trace_path:
+            self.start_trace(trace_path)
+
+    # =========================================================================
+    # MEDIÇÃO
+    # =========================================================================
+
+    def section(self, name):
+        """
+        Retorna o bloco 'with' que mede uma seção: with profiler.section('ai'): ...
+
+        O mesmo objeto é reaproveitado entre os quadros (nada é alocado por medição).
+        """
+        if not self.enabled:
+            return _NO_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def count(self, name, amount=1):
+        """ Soma 'amount' a um contador do quadro atual. """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def take_counters(self, source):
+        """ Soma os valores de um dicionário de contadores (ex: NavigationTable.counters) e os zera. """
+        for name, value in source.items():
+            if value:
+                self.count(name, value)
+                source[name] = 0
+
+    def end_frame(self, state=None):
+        """
+        Fecha o quadro atual: guarda os tempos no histórico e grava a linha do trace.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        frame_ms = (now - self.last_frame_end) * 1000 if self.last_frame_end is not None else 0.0
+        self.last_frame_end = now
+        self.frame_times.append(frame_ms)
+
+        for name in self.history.keys() | self.current.keys() | self.counters.keys():
+            values = self.history.get(name)
+            if values is None:
+                values = self.history[name] = deque(maxlen=self.window)
+            values.append(self.current.get(name, self.counters.get(name, 0)))
+
+        if self.trace_file is not None:
+            record = {'frame': self.frame, 'state': state, 'frame_ms': round(frame_ms, 4),
+                      'sections': {name: round(ms, 4) for name, ms in self.current.items()},
+                      'counters': self.counters}
+            self.trace_file.write(json.dumps(record) + '\n')
+
+        self.frame += 1
+        self.current = {}
+        self.counters = {}
+
+    # =========================================================================
+    # ESTATÍSTICAS
+    # =========================================================================
+
+    @staticmethod
+    def _summary(values):
+        ordered = sorted(values)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return {'avg': sum(ordered) / len(ordered), 'p99': p99, 'max': ordered[-1]}
+
+    def stats(self):
+        """
+        Médias, p99 e máximo de cada seção e contador na janela atual.
+
+        Retorna:
+            dict: nome -> {'avg', 'p99', 'max'} (tempos em ms). A chave 'frame' é o quadro inteiro.
+        """
+        result = {}
+        if self.frame_times:
+            result['frame'] = self._summary(self.frame_times)
+        for name, values in self.history.items():
+            if values:
+                result[name] = self._summary(values)
+        return result
+
+    # =========================================================================
+    # TRACE
+    # =========================================================================
+
+    def start_trace(self, path):
+        """ Passa a gravar um quadro por linha (JSON) em 'path'. """
+        self.stop_trace()
+        self.trace_file = open(path, 'w')
+        print(f"Trace de desempenho em {path}")
+
+    def stop_trace(self):
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+
+    # =========================================================================
+    # OVERLAY
+    # =========================================================================
+
+    def toggle_overlay(self):
+        self.visible = not self.visible
+        self._overlay = None
+
+    def draw(self, screen, text):
+        """
+        Desenha o overlay com as médias e o p99 de cada seção.
+
+        O painel só é refeito a cada PROFILER_OVERLAY_REFRESH quadros, para que o
+        próprio overlay quase não pese no quadro que ele está medindo.
+
+        Parametros:
+            text (TextCache): Cache de textos do jogo.
+        """
+        if not self.visible:
+            return
+        if self._overlay is None or self.frame % PROFILER_OVERLAY_REFRESH == 0:
+            stats = self.stats()
+            lines = ['secao       media    p99 (ms)']
+            for name in ['frame'] + self.SECTIONS:
+                if name in stats:
+                    lines.append(f"{name:<11}{stats[name]['avg']:>6.2f}{stats[name]['p99']:>7.2f}")
+            for name in sorted(self.history.keys() - set(self.SECTIONS)):
+                if name in stats:
+                    lines.append(f"{name:<18}{stats[name]['avg']:>8.1f}")
+
+            # Monta o painel inteiro em uma superfície só (um blit por quadro). Os números
+            # mudam sempre, então não passam pelo cache de textos (só a fonte é reaproveitada)
+            font = text.get_font(PROFILER_FONT_SIZE)
+            surfaces = [font.render(line, True, GREEN) for line in lines]
+            width = max(surface.get_width() for surface in surfaces) + 10
+            height = sum(surface.get_height() for surface in surfaces) + 10
+            self._overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            self._overlay.fill((0, 0, 0, 180))
+            y = 5
+            for surface in surfaces:
+                self._overlay.blit(surface, (5, y))
+                y += surface.get_height()
+
+        screen.blit(self._overlay, (5, 5))
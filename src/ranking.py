@@ -0,0 +1,181 @@
+#Ranking: guarda as pontuações em disco e mantém os melhores resultados em memória.
+
+# src/ranking.py
+
+import heapq
+import os
+from settings import *
+
+try:
+    import fcntl  # Trava entre processos (Linux/macOS); no Windows o ranking funciona sem ela
+except ImportError:
+    fcntl = None
+
+
+class RankingStore:
+    """
+    Ranking com as K melhores pontuações em memória (um heap de mínimo).
+
+    O arquivo continua no formato de texto "NOME PONTOS" (uma linha por partida),
+    mas nunca é relido inteiro a cada consulta: guardamos até onde ele já foi lido
+    e, quando cresce, só as linhas novas são processadas (inclusive as gravadas por
+    outros processos). Consultar o ranking custa O(K).
+
+    As gravações usam O_APPEND + fsync, sob uma trava de arquivo compartilhada por
+    todos os processos, e de tempos em tempos o arquivo é compactado para conter
+    só as K melhores linhas.
+    """
+
+    def __init__(self, path=RANKING_FILE, top_k=RANKING_TOP_K, compact_every=RANKING_COMPACT_EVERY):
+        """
+        Parametros:
+            path (str): Arquivo do ranking.
+            top_k (int): Quantas pontuações ficam em memória (e sobrevivem à compactação).
+            compact_every (int): Compacta o arquivo quando ele tiver essa quantidade de
+                linhas além das K melhores.
+        """
+        self.path = path
+        self.lock_path = path + '.lock'
+        self.top_k = top_k
+        self.compact_every = compact_every
+        self.error = None  # Último erro de leitura do arquivo (None = leitura em dia)
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self.heap = []  # (pontos, -ordem, nome): o topo é a pior pontuação guardada
+        self.offset = 0  # Bytes do arquivo já processados
+        self.file_id = None  # (dispositivo, inode): muda quando outro processo compacta o arquivo
+        self.lines = 0  # Linhas lidas desde o início do arquivo atual
+        self._sorted = None  # Ranking ordenado (refeito só quando o heap muda)
+
+    # =========================================================================
+    # LEITURA
+    # =========================================================================
+
+    def refresh(self):
+        """
+        Lê as linhas acrescentadas desde a última leitura.
+
+        Um os.stat por chamada quando nada mudou, então pode ser chamado a cada quadro.
+        Se o arquivo não puder ser lido (sem permissão, ou um diretório no lugar dele), o
+        ranking fica com o que já tinha (vazio, na primeira leitura) e tenta de novo depois.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self.file_id is not None:
+                self._reset()
+            return
+        except OSError as e:
+            self._read_failed(e)
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self.file_id or stat.st_size < self.offset:
+            # Arquivo novo ou compactado por outro processo: recomeça do zero
+            self._reset()
+            self.file_id = file_id
+        if stat.st_size == self.offset:
+            return
+
+        try:
+            with open(self.path, 'rb') as file:
+                file.seek(self.offset)
+                data = file.read(stat.st_size - self.offset)
+        except OSError as e:
+            self._read_failed(e)
+            return
+        self.error = None
+        # Só consome até a última quebra de linha (uma linha pela metade fica para depois)
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        for line in data[:end].decode('utf-8', errors='replace').splitlines():
+            self._push_line(line)
+
+    def _read_failed(self, error):
+        # Avisa uma vez por erro (refresh é chamado a cada quadro na tela do ranking)
+        if str(error) != self.error:
+            self.error = str(error)
+            print(f"Não foi possível carregar os scores: {error}")
+
+    def _push_line(self, line):
+        # Tenta separar a linha em nome e score. Se falhar, ignora a linha.
+        try:
+            name, score = line.strip().split()
+            score = int(score)
+        except ValueError:
+            return
+        self.lines += 1
+        entry = (score, -self.lines, name)  # Empate: fica a pontuação registrada primeiro
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, entry)
+        elif entry > self.heap[0]:
+            heapq.heapreplace(self.heap, entry)
+        else:
+            return
+        self._sorted = None
+
+    def top(self, count=10):
+        """
+        Retorna as melhores pontuações, da maior para a menor.
+
+        Retorna:
+            list[tuple(str, int)]: Pares (nome, pontos).
+        """
+        if self._sorted is None:
+            self._sorted = [(name, score) for score, _, name in sorted(self.heap, reverse=True)]
+        return self._sorted[:count]
+
+    # =========================================================================
+    # GRAVAÇÃO
+    # =========================================================================
+
+    def _lock(self):
+        """ Abre e trava o arquivo de trava (exclusivo entre processos). """
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def _unlock(self, fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def add(self, name, score):
+        """
+        Registra uma pontuação de forma durável (a linha está no disco quando retorna).
+        """
+        name = '_'.join(str(name).split()) or 'JOGADOR'  # O nome não pode ter espaços
+        line = f"{name} {int(score)}\n".encode('utf-8')
+        lock = self._lock()
+        try:
+            # O_APPEND: cada write vai para o fim do arquivo, mesmo com outros processos gravando
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.refresh()
+            if self.lines - len(self.heap) >= self.compact_every:
+                self._compact()
+        finally:
+            self._unlock(lock)
+
+    def _compact(self):
+        """
+        Reescreve o arquivo só com as K melhores linhas (chamado com a trava já obtida).
+        """
+        self.refresh()  # Garante que nenhuma linha de outro processo fique de fora
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            for name, score in self.top(self.top_k):
+                file.write(f"{name} {score}\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        # O arquivo novo é relido (só K linhas) para recomeçar a contagem
+        self._reset()
+        self.refresh()
+        print(f"Ranking compactado: {len(self.heap)} pontuações mantidas.")
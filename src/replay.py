@@ -0,0 +1,166 @@
+#Replays: grava as direções do jogador (com o tick de cada uma) e reproduz a partida.
+
+# src/replay.py
+#
+# Uso (de dentro da pasta src), para conferir um replay gravado com "main.py --record":
+#   python replay.py partida.rpl
+
+import hashlib
+import struct
+import sys
+import time
+from array import array
+import pygame
+from settings import *
+import snapshot
+
+# Versão do formato: mudar o layout invalida os replays antigos
+FORMAT_VERSION = 1
+MAGIC = b'PRPL'
+
+# Cabeçalho: magic, versão, parâmetros dos fantasmas (velocidade, intervalo de spawn,
+# tempo assustado), quantidade de cooldowns e tamanho do snapshot inicial.
+# Depois vêm os cooldowns (doubles), o snapshot inicial e os eventos.
+HEADER = struct.Struct('<4sHdddBI')
+# Final do arquivo: tick final, score, vidas, estado e o hash do snapshot final
+FOOTER = struct.Struct('<Iqi16s20s')
+
+# Códigos dos eventos: as quatro direções (índice em DIRECTIONS) e o rewind (tecla R)
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+REWIND = len(DIRECTIONS)
+
+
+def state_digest(game):
+    """ Hash do estado completo da simulação (o snapshot), para comparar duas partidas. """
+    return hashlib.sha1(snapshot.capture(game)).digest()
+
+
+class ReplayRecorder:
+    """
+    Grava os eventos de entrada de uma partida a partir do estado atual do jogo.
+
+    Cada evento ocupa 5 bytes (tick de 32 bits + código), então uma partida de
+    10 minutos com uma tecla por segundo cabe em 3 KB mais o snapshot inicial.
+    """
+
+    def __init__(self, game):
+        self.params = (game.ghost_speed, game.ghost_spawn_time, game.scared_time)
+        self.cooldowns = list(game.ghost_cooldowns)
+        self.initial = snapshot.capture(game)
+        self.ticks = array('I')  # Tick em que cada evento chegou (antes do update desse tick)
+        self.codes = bytearray()
+
+    def __len__(self):
+        return len(self.codes)
+
+    def record(self, ticks, direction):
+        """ Grava uma direção passada para Player.move. """
+        code = DIRECTION_CODES.get((int(direction[0]), int(direction[1])))
+        if code is None:
+            raise ValueError(f"Direção {direction} não pode ser gravada no replay.")
+        self.ticks.append(ticks)
+        self.codes.append(code)
+
+    def record_rewind(self, ticks):
+        self.ticks.append(ticks)
+        self.codes.append(REWIND)
+
+    def finish(self, game):
+        """
+        Fecha a gravação com o resultado da partida.
+
+        Retorna:
+            bytes: Conteúdo do arquivo de replay.
+        """
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, *self.params, len(self.cooldowns), len(self.initial))
+        footer = FOOTER.pack(game.ticks, game.score, game.lives, game.state.encode(), state_digest(game))
+        return b''.join([header, array('d', self.cooldowns).tobytes(), self.initial,
+                         struct.pack('<I', len(self.codes)), self.ticks.tobytes(), bytes(self.codes), footer])
+
+
+class Replay:
+    """ Replay lido do disco: parâmetros, snapshot inicial, eventos e o resultado esperado. """
+
+    def __init__(self, data):
+        (magic, version, self.ghost_speed, self.ghost_spawn_time, self.scared_time,
+         cooldown_count, initial_size) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Arquivo não é um replay compatível.")
+        offset = HEADER.size
+        self.cooldowns = array('d', data[offset:offset + cooldown_count * 8]).tolist()
+        offset += cooldown_count * 8
+        self.initial = data[offset:offset + initial_size]
+        offset += initial_size
+        (count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        self.ticks = array('I', data[offset:offset + count * 4])
+        offset += count * 4
+        self.codes = data[offset:offset + count]
+        offset += count
+        final_ticks, self.score, self.lives, state, self.digest = FOOTER.unpack_from(data, offset)
+        self.final_ticks = final_ticks
+        self.state = state.rstrip(b'\0').decode()
+
+    def new_game(self):
+        """ Cria um jogo headless com os mesmos parâmetros da partida gravada. """
+        from game import Game
+        return Game(headless=True, ghost_cooldowns=self.cooldowns, ghost_speed=self.ghost_speed,
+                    ghost_spawn_time=self.ghost_spawn_time, scared_time=self.scared_time)
+
+    def play(self, game=None):
+        """
+        Reproduz a partida sem janela e sem limite de FPS.
+
+        Parametros:
+            game (Game): Jogo headless a reaproveitar (None = cria um com new_game).
+
+        Retorna:
+            Game: O jogo no estado final.
+        """
+        if game is None:
+            game = self.new_game()
+        game.reset_game()
+        snapshot.restore(game, self.initial)
+        game.state = 'jogando'
+
+        ticks, codes = self.ticks, self.codes
+        index, count = 0, len(codes)
+        player = game.player
+        while game.state == 'jogando' and (index < count or game.ticks < self.final_ticks):
+            # Aplica os eventos que chegaram antes deste tick, na ordem em que foram gravados
+            while index < count and ticks[index] <= game.ticks:
+                if ticks[index] < game.ticks:
+                    raise ValueError(f"Evento do tick {ticks[index]} fora de ordem (tick atual {game.ticks}).")
+                code = codes[index]
+                index += 1
+                if code == REWIND:
+                    game.rewind_game()
+                else:
+                    player.move(pygame.Vector2(DIRECTIONS[code]))
+            game.playing_update()
+        return game
+
+    def matches(self, game):
+        """ Confere se o jogo terminou exatamente no estado gravado. """
+        return ((game.ticks, game.score, game.lives, game.state) ==
+                (self.final_ticks, self.score, self.lives, self.state) and state_digest(game) == self.digest)
+
+
+def load(path):
+    with open(path, 'rb') as file:
+        return Replay(file.read())
+
+
+if __name__ == '__main__':
+    failed = False
+    for replay_path in sys.argv[1:]:
+        replay = load(replay_path)
+        start = time.perf_counter()
+        game = replay.play()
+        elapsed = time.perf_counter() - start
+        ok = replay.matches(game)
+        failed = failed or not ok
+        print(f"{replay_path}: {len(replay.codes)} eventos, {game.ticks} ticks em {elapsed:.3f}s, "
+              f"score {game.score}, vidas {game.lives}, {game.state} -> {'OK' if ok else 'DIFERENTE'}")
+    sys.exit(1 if failed else 0)
@@ -7,7 +7,14 @@ import os
 # 1. CONFIGURAÇÕES GERAIS DA TELA E DO JOGO
 # =========================================================================================
 TITULO = "Pacman"
-FPS = 60  # Taxa de quadros por segundo para um movimento suave
+FPS = 60  # Ticks da simulação por segundo (todos os timers do jogo contam ticks)
+# Limite de quadros desenhados por segundo durante a partida (0 = sem limite, desenha o máximo
+# que a máquina aguentar). Menus, pausa e telas finais ficam sempre em FPS.
+MAX_RENDER_FPS = 0
+# Máximo de ticks simulados em um único quadro para alcançar o relógio após um atraso
+MAX_CATCHUP_TICKS = 5
+# Interpola as posições das entidades entre dois ticks ao desenhar
+INTERPOLATE_RENDER = True
 
 # O requisito é um mapa 20x20. Vamos definir o tamanho de cada "bloco" do grid
 # e calcular a largura e altura da tela a partir disso.
@@ -19,6 +26,13 @@ GRID_HEIGHT = 20  # Altura do grid conforme o requisito
 WIDTH = GRID_WIDTH * GRID_SIZE
 # Altura da tela. Adicionamos um espaço extra na parte inferior para UI (pontos, vidas)
 HEIGHT = GRID_HEIGHT * GRID_SIZE + 50
+# Área da janela onde o mapa aparece (o resto é o painel da UI). Mapas maiores
+# que isso rolam com a câmera, que acompanha o jogador.
+VIEWPORT_HEIGHT = GRID_HEIGHT * GRID_SIZE
+# O mapa é desenhado em blocos (chunks) de CHUNK_CELLS x CHUNK_CELLS células,
+# criados só quando aparecem na tela; os CHUNK_CACHE_SIZE mais recentes ficam em cache.
+CHUNK_CELLS = 16
+CHUNK_CACHE_SIZE = 64
 
 
 # =========================================================================================
@@ -48,11 +62,26 @@ PROJECT_ROOT = os.path.dirname(BASE_DIR)
 ASSETS_FOLDER = os.path.join(PROJECT_ROOT, 'assets')
 MAPS_FOLDER = os.path.join(ASSETS_FOLDER, 'maps')
 FONTS_FOLDER = os.path.join(ASSETS_FOLDER, 'fonts')
+# Mapas compilados (binários, refeitos automaticamente quando o .txt muda)
+MAP_CACHE_FOLDER = os.path.join(MAPS_FOLDER, 'compiled')
+MAP_CACHE_ENABLED = True
+# Guarda também as tabelas de navegação dos mapas pequenos no arquivo compilado
+MAP_CACHE_NAVIGATION = True
 
 # Exemplo de arquivo de fonte
 MAIN_FONT = os.path.join(FONTS_FOLDER, 'press-start-2p.ttf')
 # Arquivo para salvar o ranking
 RANKING_FILE = os.path.join(PROJECT_ROOT, 'ranking.txt')
+# Quantas pontuações o ranking mantém em memória (e no arquivo, depois de compactado)
+RANKING_TOP_K = 100
+# Compacta o arquivo do ranking quando ele passar de RANKING_TOP_K + RANKING_COMPACT_EVERY linhas
+RANKING_COMPACT_EVERY = 1000
+# Jogo salvo (snapshot binário, veja snapshot.py) e o save antigo em JSON, ainda aceito no carregamento
+SAVE_FILE = os.path.join(ASSETS_FOLDER, 'save.bin')
+LEGACY_SAVE_FILE = os.path.join(ASSETS_FOLDER, 'save.json')
+# Rewind (tecla R): um checkpoint a cada REWIND_INTERVAL_SEC segundos, guardando os últimos REWIND_SNAPSHOTS
+REWIND_INTERVAL_SEC = 1
+REWIND_SNAPSHOTS = 10
 
 
 # =========================================================================================
@@ -73,15 +102,55 @@ SCARED_TIME = 20
 # Tempo em segundos para o próximo fantasma sair da "fila" e entrar no jogo.
 # Isso se relaciona diretamente com o requisito do "TAD Cenário".
 GHOST_SPAWN_TIME = 5
+# Tempo em segundos entre dois recálculos de rota de cada fantasma, na ordem em que saem da fila.
+GHOST_COOLDOWNS = [2.0, 3.1, 4.0, 4.5, 4.6]
+# Número de fantasmas criados (um por sprite da pasta de fantasmas)
+MAX_GHOSTS = 4
+# Mapas com até esse número de células caminháveis têm a tabela de navegação
+# (distância e próximo passo entre todos os pares) calculada inteira no carregamento.
+NAV_TABLE_MAX_CELLS = 2000
+# Em mapas maiores, quantos alvos ficam guardados no cache de navegação.
+NAV_CACHE_SIZE = 64
+# Em mapas maiores, a busca de cada campo para a essa distância (em passos) do alvo:
+# fantasmas mais longe que isso do jogador não o "enxergam" e ficam parados.
+NAV_SEARCH_MAX_DISTANCE = 60
+# Em mapas maiores, o campo do jogador só é refeito quando ele se afasta mais que isso
+# (em passos) da raiz do campo atual; até lá, cada fantasma conserta a própria rota com
+# um A* guiado pelo campo (veja NavigationTable.guided_path). 0 = um campo por célula.
+NAV_ANCHOR_MAX_DRIFT = 8
+# Recalcula a rota de cada fantasma a cada célula andada, e não só a cada GHOST_COOLDOWNS.
+# Desligado por padrão para manter o comportamento (e os replays) do jogo original.
+GHOST_REPLAN_EVERY_TILE = False
+# Orçamento da IA dos fantasmas por tick, em nós expandidos pelas buscas de caminho (o campo
+# do jogador entra na conta). Os replanejamentos que não cabem esperam os próximos ticks
+# (veja ai_scheduler.py). É em nós, e não em milissegundos, para o jogo continuar determinístico.
+AI_NODE_BUDGET = 1000
+# Na fila, cada segundo sem replanejar vale como estar essa quantidade de células mais perto do jogador.
+AI_PRIORITY_AGE_WEIGHT = 4
+# Guarda o estado dos fantasmas em arrays NumPy e os move em lote (veja ghost_store.py),
+# para partidas com centenas de fantasmas (com 4 fantasmas o laço por objeto é mais rápido).
+# Sem NumPy, fica sempre o laço por fantasma.
+GHOST_STORE_ENABLED = False
+# Calcula os campos de distância dos mapas grandes em uma thread (veja path_service.py).
+# Desligado por padrão: com a thread, o momento em que cada campo fica pronto depende da
+# máquina, e os replays e o modo headless precisam do resultado sempre igual.
+PATH_SERVICE_ENABLED = False
 
 
 # =========================================================================================
 # 6. CONFIGURAÇÕES DA INTERFACE (UI)
 # =========================================================================================
 UI_FONT_SIZE = 20
+# Quantos textos renderizados ficam guardados no cache (os menos usados são descartados)
+TEXT_CACHE_SIZE = 256
 UI_VERTICAL_MARGIN = 10
 # Posição do painel da UI (na parte inferior da tela)
 UI_PANEL_POS = (0, GRID_HEIGHT * GRID_SIZE)
+# Profiler de quadros: mede o tempo de cada parte do quadro (overlay com F3)
+PROFILER_ENABLED = True
+PROFILER_WINDOW = 120  # Quantos quadros entram nas médias e no p99
+PROFILER_OVERLAY_REFRESH = 15  # O texto do overlay é atualizado a cada N quadros
+PROFILER_FONT_SIZE = 14
 
 # =========================================================================================
 # 7. CAMINHOS DOS SPRITES (NOVO BLOCO)
@@ -97,11 +166,15 @@ PACMAN_RIGHT_FOLDER = os.path.join(ART_FOLDER, 'pacman-right')
 # Caminho para a pasta dos fantasmas
 GHOSTS_FOLDER = os.path.join(ART_FOLDER, 'ghosts')
 BLUE_GHOST_SPRITE_PATH = os.path.join(ART_FOLDER, 'blue_ghost.png')
+# Carrega todos os sprites ao abrir o jogo (False = carrega cada um só quando for usado)
+PRELOAD_ASSETS = True
 
 # =========================================================================================
 # 8. CONFIGURAÇÕES DE JOGABILIDADE (NOVA SEÇÃO)
 # =========================================================================================
 TUNNEL_COOLDOWN_SEC = 1.5 # Tempo em segundos que os túneis ficam inativos após o uso
+# Custo (em passos) de atravessar um túnel no grafo de navegação dos fantasmas
+TUNNEL_EDGE_COST = 2
 
 
 #sons
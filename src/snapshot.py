@@ -0,0 +1,227 @@
+#Snapshots: o estado completo da partida em poucos bytes (save, load e rewind).
+
+# src/snapshot.py
+
+import os
+import struct
+from array import array
+from collections import deque
+import pygame
+from settings import *
+
+# Versão do formato: mudar o layout invalida os saves antigos
+FORMAT_VERSION = 3
+MAGIC = b'PSNP'
+
+# Cabeçalho: magic, versão, largura e altura do mapa, tamanho do bitmap de itens,
+# ticks, score, vidas, cooldown do túnel, timer de spawn, célula do campo do jogador (x, y),
+# raiz do campo do jogador (x, y), fantasmas ativos, total de fantasmas e o jogador:
+# grid_pos, pixel_pos, direction (6 doubles), stored_direction (flag + x, y) e invencibilidade.
+HEADER = struct.Struct('<4sHIIIIqiiiiiiiHH6dB2dd')
+
+# Um por fantasma, na ordem de criação (ativos primeiro, depois a fila): grid_pos, pixel_pos,
+# direction, target_node (flag + x, y), raiz do campo seguido (x, y), cooldown da IA, tick do
+# último replanejamento, assustado, alvo da rota própria (x, y) e o tamanho da rota, cujas
+# células (x, y) vêm logo depois.
+GHOST = struct.Struct('<6dB2diiiiBiiI')
+
+NO_CELL = (-1, -1)
+
+
+def _field_root(field):
+    return field.root_pos if field is not None else NO_CELL
+
+
+def _number(value):
+    """ Volta a ser int quando o valor gravado como double é inteiro (os timers contam ticks). """
+    return int(value) if value.is_integer() else value
+
+
+def capture(game):
+    """
+    Grava o estado da simulação da partida (sem nada de desenho).
+
+    Os itens do mapa entram como um bitmap (1 bit por item do mapa original), então o
+    tamanho é de algumas centenas de bytes e o custo é de microssegundos.
+
+    Retorna:
+        bytes: Snapshot para restore (ou para gravar em arquivo).
+    """
+    level = game.level
+    player = game.player
+    ghosts = game.enemies + list(game.ghost_queue)
+    bitmap = level.pellet_bitmap()
+    stored = player.stored_direction
+
+    parts = [HEADER.pack(
+        MAGIC, FORMAT_VERSION, level.width, level.height, len(bitmap),
+        game.ticks, game.score, game.lives, game.tunnel_cooldown, game.ghost_spawn_timer,
+        *(game.player_field_cell or NO_CELL), *_field_root(game.player_field),
+        len(game.enemies), len(ghosts),
+        *player.grid_pos, *player.pixel_pos, *player.direction,
+        stored is not None, *(stored if stored is not None else (0, 0)),
+        player.invincibility_timer)]
+    for ghost in ghosts:
+        target = ghost.target_node
+        parts.append(GHOST.pack(
+            *ghost.grid_pos, *ghost.pixel_pos, *ghost.direction,
+            target is not None, *(target if target is not None else (0, 0)),
+            *_field_root(ghost.field), ghost.pathfinding_cooldown, ghost.last_plan_tick, ghost.scared,
+            *(ghost.path_target or NO_CELL), len(ghost.path)))
+        parts.append(array('i', [value for cell in ghost.path for value in cell]).tobytes())
+    parts.append(bitmap)
+    return b''.join(parts)
+
+
+def check(game, data):
+    """
+    Confere se um snapshot pode ser restaurado neste jogo, sem alterar nada.
+
+    Levanta ValueError se o snapshot estiver incompleto, for de outra versão do
+    formato ou de outro mapa (as mesmas conferências que restore faz antes de mexer no jogo).
+    """
+    _parse(game, data)
+
+
+def _parse(game, data):
+    """
+    Lê e confere o snapshot inteiro antes de qualquer alteração no jogo.
+
+    Retorna:
+        tuple: Valores do cabeçalho, registros dos fantasmas (valores, rota) e a posição do bitmap.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Snapshot incompleto.")
+    header = HEADER.unpack_from(data)
+    magic, version, width, height, bitmap_size = header[:5]
+    total = header[15]
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Snapshot em formato desconhecido.")
+    level = game.level
+    ghosts = game.enemies + list(game.ghost_queue)
+    # Mapas do mesmo tamanho e com os mesmos fantasmas ainda podem ter outros itens
+    if ((width, height) != (level.width, level.height) or total != len(ghosts)
+            or bitmap_size != level.pellet_bitmap_size()):
+        raise ValueError("O snapshot é de outro mapa.")
+    # Os fantasmas têm tamanho variável (a rota própria): confere tudo antes de mexer no jogo
+    records = []
+    offset = HEADER.size
+    for _ in range(total):
+        if len(data) < offset + GHOST.size:
+            raise ValueError("Snapshot incompleto.")
+        values = GHOST.unpack_from(data, offset)
+        offset += GHOST.size
+        records.append((values, data[offset:offset + values[16] * 8]))
+        offset += values[16] * 8
+    if len(data) != offset + bitmap_size:
+        raise ValueError("Snapshot incompleto.")
+    return header, records, offset
+
+
+def restore(game, data):
+    """
+    Volta a partida exatamente para o estado de um snapshot de capture.
+
+    Parametros:
+        data (bytes): Snapshot gerado para o mesmo mapa e o mesmo número de fantasmas.
+    """
+    header, records, offset = _parse(game, data)
+    (_, _, _, _, bitmap_size, ticks, score, lives, tunnel_cooldown,
+     spawn_timer, cell_x, cell_y, root_x, root_y, active, _) = header[:16]
+    player_values = header[16:]
+    level = game.level
+    ghosts = game.enemies + list(game.ghost_queue)
+    navigation = level.navigation
+
+    def field_at(x, y):
+        return navigation.field((x, y)) if (x, y) != NO_CELL else None
+
+    game.ticks = ticks
+    game.score = score
+    game.lives = lives
+    game.tunnel_cooldown = tunnel_cooldown
+    game.ghost_spawn_timer = spawn_timer
+    game.player_field_cell = (cell_x, cell_y) if (cell_x, cell_y) != NO_CELL else None
+    game.player_field = field_at(root_x, root_y)
+
+    player = game.player
+    player.grid_pos = pygame.Vector2(player_values[0:2])
+    player.pixel_pos = pygame.Vector2(player_values[2:4])
+    player.previous_pixel_pos = pygame.Vector2(player.pixel_pos)
+    player.direction = pygame.Vector2(player_values[4:6])
+    player.stored_direction = pygame.Vector2(player_values[7:9]) if player_values[6] else None
+    player.invincibility_timer = _number(player_values[9])
+
+    for ghost, (values, path) in zip(ghosts, records):
+        ghost.grid_pos = pygame.Vector2(values[0:2])
+        ghost.pixel_pos = pygame.Vector2(values[2:4])
+        ghost.previous_pixel_pos = pygame.Vector2(ghost.pixel_pos)
+        ghost.direction = pygame.Vector2(values[4:6])
+        ghost.target_node = pygame.Vector2(values[7:9]) if values[6] else None
+        ghost.field = field_at(values[9], values[10])
+        ghost.pathfinding_cooldown = values[11]
+        ghost.last_plan_tick = values[12]
+        ghost.scared = bool(values[13])
+        ghost.path_target = (values[14], values[15]) if (values[14], values[15]) != NO_CELL else None
+        path = array('i', path)
+        ghost.path = deque(zip(path[0::2], path[1::2]))
+
+    # Fantasmas ativos e fila; o índice espacial é refeito na mesma ordem de entrada
+    game.enemies = ghosts[:active]
+    game.ghost_queue = deque(ghosts[active:])
+    game.spatial.clear()
+    for ghost in game.enemies:
+        game.spatial.insert(ghost)
+    game.ai.restore()
+
+    level.load_pellet_bitmap(data[offset:offset + bitmap_size])
+
+
+def write(path, data):
+    """ Grava um snapshot (ou replay) em disco sem nunca deixar um arquivo pela metade. """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+    os.replace(temp_path, path)
+
+
+def read(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+class RewindBuffer:
+    """
+    Buffer circular com os últimos snapshots da partida, para voltar no tempo.
+
+    Guarda só bytes (algumas centenas por snapshot): REWIND_SNAPSHOTS checkpoints
+    ocupam poucos KB, e o mais antigo é descartado quando o buffer enche.
+    """
+
+    def __init__(self, capacity=REWIND_SNAPSHOTS):
+        self.snapshots = deque(maxlen=capacity)  # (tick, snapshot)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def push(self, ticks, data):
+        self.snapshots.append((ticks, data))
+
+    def pop(self, before):
+        """
+        Tira do buffer o snapshot mais novo anterior ao tick 'before' (os mais novos que ele são descartados).
+
+        Retorna:
+            bytes: Snapshot, ou None se não houver nenhum.
+        """
+        while self.snapshots:
+            ticks, data = self.snapshots.pop()
+            if ticks < before:
+                return data
+        return None
+
+    def clear(self):
+        self.snapshots.clear()
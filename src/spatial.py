@@ -0,0 +1,175 @@
+#Índice espacial em grade uniforme para colisões entre entidades.
+
+# src/spatial.py
+
+import math
+from settings import *
+
+
+class SpatialHash:
+    """
+    Grade uniforme de baldes (um por célula de 'cell_size' pixels) com as entidades de cada balde.
+
+    As entidades precisam ter os atributos 'pixel_x' e 'pixel_y' (o centro em pixels).
+    Cada entidade avisa o índice quando se move (update), e uma consulta de raio
+    só olha os baldes vizinhos, em vez de comparar com todas as entidades.
+
+    Os resultados vêm sempre na ordem de inserção, para que o jogo trate as
+    colisões na mesma ordem da lista de inimigos (resultado determinístico).
+    """
+
+    def __init__(self, cell_size=GRID_SIZE):
+        self.cell_size = cell_size
+        self.buckets = {}  # (bx, by) -> {entidade: ordem de inserção}
+        self.entries = {}  # entidade -> (balde, ordem de inserção)
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, entity):
+        return entity in self.entries
+
+    def bucket_of(self, pos):
+        """ Balde (bx, by) que contém a posição em pixels. """
+        return int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)
+
+    # =========================================================================
+    # ATUALIZAÇÃO
+    # =========================================================================
+
+    def insert(self, entity):
+        """ Coloca uma entidade no índice (ou só atualiza o balde, se ela já estiver nele). """
+        if entity in self.entries:
+            self.update(entity)
+            return
+        bucket = int(entity.pixel_x // self.cell_size), int(entity.pixel_y // self.cell_size)
+        self.entries[entity] = (bucket, self._sequence)
+        self.buckets.setdefault(bucket, {})[entity] = self._sequence
+        self._sequence += 1
+
+    def remove(self, entity):
+        entry = self.entries.pop(entity, None)
+        if entry is None:
+            return
+        bucket = self.buckets[entry[0]]
+        del bucket[entity]
+        if not bucket:
+            del self.buckets[entry[0]]
+
+    def update(self, entity):
+        """
+        Atualiza o balde de uma entidade que se moveu (O(1); entidades fora do índice são ignoradas).
+        """
+        entry = self.entries.get(entity)
+        if entry is None:
+            return
+        old_bucket, sequence = entry
+        bucket = int(entity.pixel_x // self.cell_size), int(entity.pixel_y // self.cell_size)
+        if bucket == old_bucket:
+            return
+        old = self.buckets[old_bucket]
+        del old[entity]
+        if not old:
+            del self.buckets[old_bucket]
+        self.buckets.setdefault(bucket, {})[entity] = sequence
+        self.entries[entity] = (bucket, sequence)
+
+    def clear(self):
+        self.buckets.clear()
+        self.entries.clear()
+        self._sequence = 0
+
+    # =========================================================================
+    # CONSULTAS
+    # =========================================================================
+
+    def query(self, pos, radius, after=-1):
+        """
+        Entidades cujo centro está a menos de 'radius' pixels de 'pos'.
+
+        Parametros:
+            pos (tuple(float, float)): Centro da consulta, em pixels.
+            radius (float): Raio da consulta.
+            after (int): Só considera entidades inseridas depois dessa ordem (ver order_of).
+
+        Retorna:
+            list: Entidades encontradas, na ordem de inserção.
+        """
+        size = self.cell_size
+        x, y = pos[0], pos[1]
+        left, right = int((x - radius) // size), int((x + radius) // size)
+        top, bottom = int((y - radius) // size), int((y + radius) // size)
+        buckets = self.buckets
+        found = []
+        for bx in range(left, right + 1):
+            for by in range(top, bottom + 1):
+                bucket = buckets.get((bx, by))
+                if bucket:
+                    for entity, sequence in bucket.items():
+                        if sequence > after and math.hypot(entity.pixel_x - x, entity.pixel_y - y) < radius:
+                            found.append((sequence, entity))
+        if len(found) < 2:
+            return [entity for _, entity in found]
+        found.sort(key=lambda item: item[0])
+        return [entity for _, entity in found]
+
+    def query_rect(self, rect):
+        """
+        Entidades cujo centro está dentro do retângulo (ex: a área visível da câmera).
+
+        Retorna:
+            list: Entidades encontradas, na ordem de inserção.
+        """
+        left, top = self.bucket_of((rect.left, rect.top))
+        right, bottom = self.bucket_of((rect.right, rect.bottom))
+        buckets = self.buckets
+        found = []
+        for bx in range(left, right + 1):
+            for by in range(top, bottom + 1):
+                bucket = buckets.get((bx, by))
+                if bucket:
+                    for entity, sequence in bucket.items():
+                        if rect.collidepoint(entity.pixel_x, entity.pixel_y):
+                            found.append((sequence, entity))
+        found.sort(key=lambda item: item[0])
+        return [entity for _, entity in found]
+
+    def order_of(self, entity):
+        """ Ordem de inserção da entidade (usada no parâmetro 'after' de query). """
+        return self.entries[entity][1]
+
+    def query_pairs(self, radius):
+        """
+        Todos os pares de entidades a menos de 'radius' pixels um do outro.
+
+        Cada balde só é comparado com ele mesmo e com os vizinhos "para frente",
+        então cada par é visto uma única vez; o custo depende de quantas entidades
+        dividem a vizinhança, não do quadrado do total.
+
+        Retorna:
+            list[tuple]: Pares (a, b), com 'a' inserida antes de 'b'.
+        """
+        span = max(1, -int(-radius // self.cell_size))  # Baldes que o raio alcança (arredondado para cima)
+        # Metade da vizinhança: (0, 0), o resto da própria linha à direita e as linhas de baixo
+        forward = [(dx, dy) for dy in range(0, span + 1) for dx in range(-span, span + 1)
+                   if dy > 0 or dx > 0]
+
+        pairs = []
+        for (bx, by), bucket in self.buckets.items():
+            items = list(bucket.items())
+            # Pares dentro do próprio balde
+            for i, (a, seq_a) in enumerate(items):
+                for b, seq_b in items[i + 1:]:
+                    if math.hypot(a.pixel_x - b.pixel_x, a.pixel_y - b.pixel_y) < radius:
+                        pairs.append((a, b) if seq_a < seq_b else (b, a))
+            # Pares com os baldes vizinhos
+            for dx, dy in forward:
+                other = self.buckets.get((bx + dx, by + dy))
+                if not other:
+                    continue
+                for a, seq_a in items:
+                    for b, seq_b in other.items():
+                        if math.hypot(a.pixel_x - b.pixel_x, a.pixel_y - b.pixel_y) < radius:
+                            pairs.append((a, b) if seq_a < seq_b else (b, a))
+        return pairs
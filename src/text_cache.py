@@ -0,0 +1,62 @@
+#Cache de fontes e de textos já renderizados, usado pelas telas do jogo.
+
+# src/text_cache.py
+
+import pygame
+from collections import OrderedDict
+from settings import *
+
+
+class TextCache:
+    """
+    Guarda as fontes (uma por tamanho) e as superfícies de texto já renderizadas.
+
+    Criar um pygame.font.Font lê o arquivo TTF do disco, e renderizar texto é
+    caro; como as telas desenham quase sempre os mesmos textos, reaproveitamos
+    os resultados. Os textos ficam em um cache LRU (os menos usados saem primeiro).
+    """
+
+    def __init__(self, font_path=MAIN_FONT, max_texts=TEXT_CACHE_SIZE):
+        self.font_path = font_path
+        self.max_texts = max_texts
+        self.fonts = {}
+        self.texts = OrderedDict()
+
+    def get_font(self, size):
+        """
+        Retorna a fonte do jogo no tamanho pedido, carregando-a só na primeira vez.
+
+        Se o arquivo da fonte não existir, usa uma fonte do sistema.
+        """
+        key = (self.font_path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(self.font_path, size)
+            except (FileNotFoundError, OSError):
+                font = pygame.font.SysFont('arial', size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color):
+        """
+        Retorna a superfície com o texto renderizado, reaproveitando a do cache.
+
+        Parametros:
+            text (str): Texto a ser desenhado.
+            size (int): Tamanho da fonte.
+            color (tuple): Cor (R, G, B).
+
+        Retorna:
+            pygame.Surface: Superfície com o texto (não deve ser alterada).
+        """
+        key = (text, self.font_path, size, color)
+        surface = self.texts.get(key)
+        if surface is None:
+            surface = self.get_font(size).render(text, True, color)
+            self.texts[key] = surface
+            if len(self.texts) > self.max_texts:
+                self.texts.popitem(last=False)  # Descarta o texto usado há mais tempo
+        else:
+            self.texts.move_to_end(key)
+        return surface
@@ -0,0 +1,233 @@
+#Torneio de configurações dos fantasmas: muitas partidas headless em todos os núcleos.
+
+# src/tournament.py
+#
+# Exemplo (de dentro da pasta src):
+#   python tournament.py --ghost-speed 1.8 2.1 2.4 --spawn-time 3 5 --games 50 -o torneio.csv
+#   python tournament.py --cooldowns 2,3.1,4,4.5 1,1,1,1 --player guloso -o torneio.json
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+import pygame
+from settings import *
+from game import Game
+
+
+# Direções que o jogador aleatório pode escolher
+DIRECTIONS = [pygame.Vector2(1, 0), pygame.Vector2(-1, 0), pygame.Vector2(0, 1), pygame.Vector2(0, -1)]
+
+# Jogo reaproveitado por cada processo do pool (mapa e tabela de navegação são montados uma vez)
+_worker_game = None
+
+
+# =========================================================================================
+# JOGADORES AUTOMÁTICOS
+# =========================================================================================
+
+def random_player(seed, turn_chance=0.05):
+    """
+    Jogador aleatório: a cada tick, com chance 'turn_chance', pede uma direção sorteada.
+
+    Retorna:
+        callable: Controlador para Game.run_headless.
+    """
+    rng = random.Random(seed)
+
+    def controller(game):
+        if rng.random() < turn_chance:
+            return rng.choice(DIRECTIONS)
+        return None
+    return controller
+
+
+def greedy_player(seed, turn_chance=0.05):
+    """
+    Jogador guloso: sempre anda rumo ao item mais próximo pelo labirinto.
+
+    Retorna:
+        callable: Controlador para Game.run_headless.
+    """
+    def controller(game):
+        player = game.player
+        if not player.is_on_grid_center():
+            return None
+        x, y = int(player.grid_x), int(player.grid_y)
+        target = game.level.nearest_pellet(y, x)
+        if target is None:
+            return None
+        step = game.level.navigation.next_step((x, y), (target[1], target[0]))
+        if step is None:
+            return None
+        dx, dy = step[0] - x, step[1] - y
+        # Próximo passo do outro lado de um túnel: basta seguir em direção à borda
+        if abs(dx) > 1:
+            dx = -1 if dx > 0 else 1
+        if abs(dy) > 1:
+            dy = -1 if dy > 0 else 1
+        return pygame.Vector2(dx, dy)
+    return controller
+
+
+PLAYERS = {
+    'aleatorio': random_player,
+    'guloso': greedy_player,
+}
+
+
+# =========================================================================================
+# PARTIDAS (executadas nos processos do pool)
+# =========================================================================================
+
+def _init_worker():
+    """ Cria o jogo headless do processo e silencia os prints das partidas. """
+    global _worker_game
+    sys.stdout = open(os.devnull, 'w')
+    _worker_game = Game(headless=True)
+
+
+def play_game(task):
+    """
+    Joga uma partida headless com a configuração pedida.
+
+    Parametros:
+        task (tuple): (índice da configuração, configuração, semente, jogador, limite de ticks).
+
+    Retorna:
+        dict: Resultado da partida.
+    """
+    config_index, config, seed, player, max_ticks = task
+    game = _worker_game
+    if game is None:
+        game = Game(headless=True)
+
+    # Os fantasmas leem esses valores quando são recriados no reset_game
+    game.ghost_cooldowns = list(config['cooldowns'])
+    game.ghost_speed = config['ghost_speed']
+    game.ghost_spawn_time = config['spawn_time']
+    game.scared_time = config['scared_time']
+
+    ticks = game.run_headless(max_frames=max_ticks, controller=PLAYERS[player](seed))
+    return {
+        'config': config_index,
+        'ticks': ticks,
+        'score': game.score,
+        'pellets_eaten': game.level.initial_pellet_count - game.level.total_pellets,
+        'deaths': PLAYER_START_LIVES - game.lives,
+        'victory': game.state == 'vitoria_fase',
+    }
+
+
+# =========================================================================================
+# TORNEIO
+# =========================================================================================
+
+def build_configs(cooldowns, ghost_speeds, spawn_times, scared_times):
+    """
+    Monta a grade de configurações (produto cartesiano de todos os valores).
+
+    Retorna:
+        list[dict]: Uma configuração por combinação.
+    """
+    return [{'cooldowns': list(c), 'ghost_speed': speed, 'spawn_time': spawn, 'scared_time': scared}
+            for c, speed, spawn, scared in itertools.product(cooldowns, ghost_speeds, spawn_times, scared_times)]
+
+
+def summarize(configs, results):
+    """ Agrega os resultados das partidas por configuração. """
+    rows = []
+    for index, config in enumerate(configs):
+        games = [r for r in results if r['config'] == index]
+        count = len(games)
+        if count == 0:
+            continue
+        ticks = [g['ticks'] for g in games]
+        rows.append({
+            'cooldowns': ' '.join(str(c) for c in config['cooldowns']),
+            'ghost_speed': config['ghost_speed'],
+            'spawn_time': config['spawn_time'],
+            'scared_time': config['scared_time'],
+            'games': count,
+            'mean_ticks': sum(ticks) / count,
+            'min_ticks': min(ticks),
+            'max_ticks': max(ticks),
+            'mean_pellets': sum(g['pellets_eaten'] for g in games) / count,
+            'mean_deaths': sum(g['deaths'] for g in games) / count,
+            'mean_score': sum(g['score'] for g in games) / count,
+            'victories': sum(g['victory'] for g in games),
+        })
+    return rows
+
+
+def save_results(path, rows):
+    """ Grava a tabela de resultados em CSV ou JSON (pela extensão do arquivo). """
+    if path.endswith('.json'):
+        with open(path, 'w') as file:
+            json.dump(rows, file, indent=2)
+        return
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_tournament(configs, games, player='aleatorio', max_ticks=None, seed=0, workers=None):
+    """
+    Joga 'games' partidas de cada configuração, distribuídas entre os processos.
+
+    As partidas de número i usam a mesma semente em todas as configurações, então
+    cada configuração enfrenta exatamente os mesmos jogadores.
+
+    Retorna:
+        list[dict]: Resultado agregado de cada configuração.
+    """
+    tasks = [(index, config, seed + game, player, max_ticks)
+             for index, config in enumerate(configs) for game in range(games)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # Sem pool: útil para depurar (os prints das partidas aparecem)
+        results = [play_game(task) for task in tasks]
+    else:
+        with Pool(workers, initializer=_init_worker) as pool:
+            results = pool.map(play_game, tasks, chunksize=max(1, len(tasks) // (workers * 8)))
+    return summarize(configs, results)
+
+
+def parse_cooldowns(text):
+    """ Converte "2,3.1,4" em [2.0, 3.1, 4.0] (um cooldown por fantasma). """
+    return [float(value) for value in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara configurações dos fantasmas com partidas headless.")
+    parser.add_argument('--cooldowns', type=parse_cooldowns, nargs='+', default=[GHOST_COOLDOWNS],
+                        help="Listas de cooldowns por fantasma, ex: 2,3.1,4,4.5")
+    parser.add_argument('--ghost-speed', type=float, nargs='+', default=[GHOST_SPEED])
+    parser.add_argument('--spawn-time', type=float, nargs='+', default=[GHOST_SPAWN_TIME])
+    parser.add_argument('--scared-time', type=float, nargs='+', default=[SCARED_TIME])
+    parser.add_argument('--games', type=int, default=20, help="Partidas por configuração")
+    parser.add_argument('--player', choices=sorted(PLAYERS), default='aleatorio')
+    parser.add_argument('--max-ticks', type=int, default=FPS * 60 * 10,
+                        help="Limite de ticks por partida (padrão: 10 minutos de jogo)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None, help="Processos (padrão: todos os núcleos)")
+    parser.add_argument('-o', '--output', default='torneio.csv', help="Arquivo .csv ou .json")
+    args = parser.parse_args()
+
+    configs = build_configs(args.cooldowns, args.ghost_speed, args.spawn_time, args.scared_time)
+    print(f"{len(configs)} configurações x {args.games} partidas")
+    start = time.perf_counter()
+    rows = run_tournament(configs, args.games, args.player, args.max_ticks, args.seed, args.workers)
+    save_results(args.output, rows)
+    print(f"Resultados salvos em {args.output} ({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == '__main__':
+    main()